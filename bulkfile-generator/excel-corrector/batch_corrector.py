@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Excel File Corrector - Headless Batch Runner
+Corrects (or only checks) every master file in a directory or glob and writes a JSON summary
+"""
+
+import argparse
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from change_report import REPORT_FORMATS
+from change_sinks import CounterChangeSink, JsonlChangeSink, MemoryChangeSink, VERBOSITY_QUIET
+from correction_cache import CorrectionCache
+from excel_corrector import ExcelCorrector
+
+EXCEL_EXTENSIONS = ('.xlsx', '.xlsm')
+
+# File extension of each change report format
+REPORT_FILE_EXTENSIONS = {'text': '.txt', 'markdown': '.md', 'html': '.html'}
+
+def collect_input_files(inputs):
+    """Expand directories and glob patterns into a sorted list of workbook paths"""
+    files = []
+    for entry in inputs:
+        if os.path.isdir(entry):
+            candidates = [os.path.join(entry, name) for name in os.listdir(entry)]
+        else:
+            candidates = glob.glob(entry, recursive=True)
+        
+        for path in candidates:
+            name = os.path.basename(path)
+            # Skip Excel lock files (~$file.xlsx) and anything that is not a workbook
+            if os.path.isfile(path) and name.lower().endswith(EXCEL_EXTENSIONS) and not name.startswith('~$'):
+                files.append(os.path.abspath(path))
+    
+    return sorted(set(files))
+
+def output_stem(input_path):
+    """Input file name plus a short hash of its absolute path, so same-named masters from different folders
+    never share an output, change log or report name"""
+    name = os.path.splitext(os.path.basename(input_path))[0]
+    path_hash = hashlib.sha1(os.path.abspath(input_path).encode('utf-8')).hexdigest()[:8]
+    return f"{name}_{path_hash}"
+
+def generate_output_filename(input_path):
+    """Generate output filename with timestamp (the GUI format, with the input path hash after the name)"""
+    ext = os.path.splitext(input_path)[1]
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"{output_stem(input_path)}_corrected_file_{timestamp}{ext}"
+
+def create_change_sink(change_sink, input_path, output_directory, max_records, keep_records=False):
+    """Build the change sink for one file: counters, ring buffer, JSONL file or full memory (keep_records,
+    for a change report, keeps every record in memory where the sink would only count them)"""
+    if change_sink == 'jsonl':
+        return JsonlChangeSink(os.path.join(output_directory, f"{output_stem(input_path)}_changes.jsonl"),
+                               None if keep_records else 0)
+    elif change_sink == 'ring':
+        return MemoryChangeSink(max_records)
+    elif change_sink == 'memory' or keep_records:
+        return MemoryChangeSink()
+    return CounterChangeSink()
+
+def process_master_file(input_path, output_directory, mode='correct', verbosity=VERBOSITY_QUIET,
+                        change_sink='counters', max_records=1000, streaming=False, issues_format='xlsx', cache_dir=None,
+                        report_format=None, profile=False, processing_options=None):
+    """Correct or check one master file and return its summary record"""
+    record = {
+        'file': input_path,
+        'mode': mode,
+        'status': 'ok',
+        'output_file': None,
+        'seconds': 0.0
+    }
+    sink = create_change_sink(change_sink, input_path, output_directory, max_records,
+                              keep_records=bool(report_format) and mode == 'correct')
+    corrector = ExcelCorrector(change_sink=sink, verbosity=verbosity, profile_memory=profile)
+    start_time = time.perf_counter()
+    
+    # Keep the batch output readable unless the corrector's own output was asked for
+    console = contextlib.redirect_stdout(io.StringIO()) if verbosity == VERBOSITY_QUIET else contextlib.nullcontext()
+    try:
+        with console:
+            if mode == 'check' and streaming:
+                error_file, _ = corrector.check_issues_streaming(input_path, output_directory, issues_format,
+                                                                 base_name=output_stem(input_path))
+                record['output_file'] = error_file
+            elif mode == 'check':
+                error_file, _ = corrector.check_issues_only(input_path, output_directory,
+                                                            base_name=output_stem(input_path))
+                record['output_file'] = error_file
+            else:
+                output_file = os.path.join(output_directory, generate_output_filename(input_path))
+                # One cache file per master file path, so a revised master reuses its previous run
+                correction_cache = None
+                if cache_dir:
+                    correction_cache = CorrectionCache(os.path.join(cache_dir,
+                                                                    f"{output_stem(input_path)}.correction_cache.json"))
+                corrector.correct_excel_file(input_path, output_file, processing_options, correction_cache)
+                record['output_file'] = output_file
+                if correction_cache is not None:
+                    record['cache'] = dict(correction_cache.stats)
+                if report_format:
+                    record['report_file'] = corrector.write_change_report(
+                        os.path.join(output_directory,
+                                     f"{output_stem(input_path)}_report{REPORT_FILE_EXTENSIONS[report_format]}"),
+                        report_format=report_format)
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = str(e)
+    finally:
+        sink.close()
+    
+    record['seconds'] = round(time.perf_counter() - start_time, 3)
+    if profile:
+        record['stage_timings'] = corrector.profiler.summary()
+        record['stage_table'] = corrector.profiler.format_table()
+    
+    if mode == 'check':
+        issues_by_sheet = {}
+        for issue in getattr(corrector, 'issues_found', []):
+            issues_by_sheet[issue['sheet']] = issues_by_sheet.get(issue['sheet'], 0) + 1
+        record['issues'] = sum(issues_by_sheet.values())
+        record['issues_by_sheet'] = issues_by_sheet
+    else:
+        record['changes'] = {
+            'hr_red_cell_changes': len(corrector.hr_red_cell_changes),
+            'state_changes': len(corrector.state_changes),
+            'division_corrections': len(corrector.division_corrections),
+            'principle_contact_changes': len(corrector.principle_contact_changes),
+            'detailed_changes': {sheet: len(changes) for sheet, changes in corrector.detailed_changes.items()}
+        }
+        record['total_changes'] = sum(record['changes']['detailed_changes'].values())
+    
+    return record
+
+def run_batch(input_files, output_directory, mode='correct', workers=1, verbosity=VERBOSITY_QUIET,
+              change_sink='counters', max_records=1000, streaming=False, issues_format='xlsx', cache_dir=None,
+              report_format=None, profile=False):
+    """Process all files, in a process pool when workers > 1, and return the records in input order"""
+    os.makedirs(output_directory, exist_ok=True)
+    
+    if workers <= 1 or len(input_files) <= 1:
+        records = []
+        for index, input_path in enumerate(input_files, 1):
+            record = process_master_file(input_path, output_directory, mode, verbosity, change_sink, max_records,
+                                         streaming, issues_format, cache_dir, report_format, profile)
+            print_record(index, len(input_files), record)
+            records.append(record)
+        return records
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(process_master_file, input_path, output_directory, mode, verbosity,
+                                   change_sink, max_records, streaming, issues_format, cache_dir, report_format,
+                                   profile)
+                   for input_path in input_files]
+        records = []
+        for index, future in enumerate(futures, 1):
+            record = future.result()
+            print_record(index, len(input_files), record)
+            records.append(record)
+    return records
+
+def summarize_batch(mode, workers, started_at, records, total_seconds):
+    """The JSON summary of a batch: settings, file counts and every file's record"""
+    return {
+        'mode': mode,
+        'workers': max(workers, 1),
+        'started_at': started_at,
+        'total_files': len(records),
+        'failed_files': sum(1 for record in records if record['status'] != 'ok'),
+        'total_seconds': round(total_seconds, 3),
+        'files': records
+    }
+
+def write_summary(summary, summary_path=None, output_directory="."):
+    """Write the batch summary (default: <output-dir>/batch_summary_<timestamp>.json) and return its path"""
+    summary_path = summary_path or os.path.join(
+        output_directory, f"batch_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    summary_dir = os.path.dirname(summary_path)
+    if summary_dir:
+        os.makedirs(summary_dir, exist_ok=True)
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    return summary_path
+
+def print_record(index, total, record):
+    """Print a one-line progress entry for a processed file"""
+    name = os.path.basename(record['file'])
+    if record['status'] != 'ok':
+        print(f"❌ [{index}/{total}] {name}: {record['error']}")
+    elif record['mode'] == 'check':
+        print(f"🔍 [{index}/{total}] {name}: {record['issues']} issues in {record['seconds']}s")
+    else:
+        print(f"✅ [{index}/{total}] {name}: {record['total_changes']} changes in {record['seconds']}s")
+    
+    # Stage timings of a profiled run
+    if 'stage_table' in record:
+        print(record.pop('stage_table'))
+
+def main(argv=None):
+    """CLI entry point."""
+    p = argparse.ArgumentParser(description="Correct or check every Excel master file in a directory or glob")
+    p.add_argument("inputs", nargs='+', help="Directories, files or glob patterns (e.g. \"givenFile/*.xlsx\")")
+    p.add_argument("--mode", choices=['correct', 'check'], default='correct',
+                   help="'correct' fixes the files, 'check' only highlights issues (default: correct)")
+    p.add_argument("--output-dir", default="Created new one", help="Directory for the output files")
+    p.add_argument("--workers", type=int, default=1, help="Number of files processed in parallel (default: 1)")
+    p.add_argument("--summary", help="Path of the JSON summary (default: <output-dir>/batch_summary_<timestamp>.json)")
+    p.add_argument("--verbosity", type=int, choices=[0, 1, 2], default=VERBOSITY_QUIET,
+                   help="Corrector console output: 0 none, 1 per-file summary, 2 every change (default: 0)")
+    p.add_argument("--change-sink", choices=['counters', 'ring', 'jsonl', 'memory'], default='counters',
+                   help="Where change records go: counters only, a ring buffer, <output-dir>/<file>_changes.jsonl "
+                        "or full memory (default: counters)")
+    p.add_argument("--max-records", type=int, default=1000, help="Records kept per category by the ring buffer")
+    p.add_argument("--streaming", action="store_true",
+                   help="Check mode only: read the files in row batches (read-only) to keep memory bounded")
+    p.add_argument("--issues-format", choices=['xlsx', 'csv', 'json'], default='xlsx',
+                   help="Streaming check output: highlighted workbook (values and red cell fills only) or an issues "
+                        "CSV/JSON (default: xlsx)")
+    p.add_argument("--cache-dir", help="Correct mode only: keep a correction cache per master file here, so a "
+                                       "resubmitted file only re-corrects its new or changed rows")
+    p.add_argument("--report-format", choices=REPORT_FORMATS,
+                   help="Correct mode only: stream each file's change report to <output-dir>/<file>_report.txt|md|html "
+                        "(with --change-sink counters or jsonl the records are also kept in memory for the report)")
+    p.add_argument("--profile", action="store_true",
+                   help="Print each file's per-stage wall time, rows and peak memory (traced, so the run is slower) "
+                        "and add them to the JSON summary")
+    args = p.parse_args(argv)
+    
+    input_files = collect_input_files(args.inputs)
+    if not input_files:
+        print("No Excel files found for: " + ", ".join(args.inputs))
+        return 1
+    
+    print(f"Processing {len(input_files)} file(s) in '{args.mode}' mode with {max(args.workers, 1)} worker(s)...")
+    started_at = datetime.now().isoformat(timespec='seconds')
+    start_time = time.perf_counter()
+    records = run_batch(input_files, args.output_dir, args.mode, args.workers, args.verbosity,
+                        args.change_sink, args.max_records, args.streaming, args.issues_format, args.cache_dir,
+                        args.report_format, args.profile)
+    
+    summary = summarize_batch(args.mode, args.workers, started_at, records, time.perf_counter() - start_time)
+    failed = summary['failed_files']
+    summary_path = write_summary(summary, args.summary, args.output_dir)
+    
+    print(f"Done: {len(records) - failed} succeeded, {failed} failed in {summary['total_seconds']}s")
+    print(f"Summary saved to: {summary_path}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
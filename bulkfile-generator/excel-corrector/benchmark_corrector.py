@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Excel File Corrector - Benchmark Suite
+Generates synthetic five-sheet master files, times correction and issue checking, and compares throughput to a JSON baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import PatternFill
+
+from excel_corrector import ExcelCorrector
+
+DEFAULT_ROW_COUNTS = [1000, 10000, 100000]
+DEFAULT_BASELINE = "benchmark_baseline.json"
+OPERATIONS = ['correct', 'check']
+
+# Throughput drop (fraction of the baseline rows/s) reported as a regression
+DEFAULT_TOLERANCE = 0.25
+
+# HR NIC/Email fills: red marks an existing system record; pink and blue must not count as red
+RED_FILL = PatternFill(start_color="FFFF0000", end_color="FFFF0000", fill_type="solid")
+PINK_FILL = PatternFill(start_color="FFFFC0CB", end_color="FFFFC0CB", fill_type="solid")
+BLUE_FILL = PatternFill(start_color="FF0000FF", end_color="FF0000FF", fill_type="solid")
+
+# Headers (row 3) of the five master sheets
+MASTER_SHEETS = {
+    'Organization Details': ['Organization Name', 'Organization Short Name', 'Operations', 'Status', 'Verticals',
+                             'Address Line 1', 'City', 'State', 'Country',
+                             "Principle Contact's First Name", "Principle Contact's Last Name", 'Activity'],
+    'Divisions': ['Organization Short Name', 'Division Name', 'Purpose',
+                  "Principle Contact's First Name", "Principle Contact's Last Name", 'Activity'],
+    'Human Resources': ['Organization Short Name', 'First Name', 'Last Name', 'NIC', 'Email', 'Gender', 'Role',
+                        'Division', 'Designation', 'Operations', 'Create a User Account', 'Activity'],
+    'Vehicles': ['Organization Name', 'Organization Short Name', 'Vehicle Number', 'Division', 'Vehicle Type',
+                 'Load Type', 'Vehicle Categories', 'Managed By', 'Activity'],
+    'Locations': ['Organization Name', 'Organization Short Name', 'Location Reference ID', 'Location Name',
+                  'Principle Contact NIC', 'Activity']
+}
+
+def maybe(rng, blank_rate, value):
+    """The value, or None (an empty cell) at the given rate"""
+    return None if rng.random() < blank_rate else value
+
+def master_row(sheet_name, rng, row, rows, orgs):
+    """One data row of a master sheet: blanks, bad values, duplicate NICs/emails/IDs and mixed types"""
+    org = rng.choice(orgs)
+    if sheet_name == 'Organization Details':
+        return {
+            'Organization Name': maybe(rng, .1, f"{org} Holdings (Pvt) Ltd"),
+            'Organization Short Name': maybe(rng, .1, rng.choice(orgs)),
+            'Operations': maybe(rng, .2, 'Ops'),
+            'Status': maybe(rng, .1, rng.choice(['NON_BOI', 'BOI', 'boi', 'X'])),
+            'Verticals': maybe(rng, .1, rng.choice(['VERT-TRN', 'vert trn', 'VERT-CUS, VERT-XX', 'BAD',
+                                                    'VERT-YO,vert-spo', 'A, B'])),
+            'Address Line 1': maybe(rng, .2, f"{row} Main St"),
+            'City': maybe(rng, .2, 'Kandy'),
+            'State': maybe(rng, .1, rng.choice(['Western', 'gampaha', 'Kandy District', 'Nowhere',
+                                                'Colombo District', 'Galle ', 'uva'])),
+            'Country': maybe(rng, .1, rng.choice(['Sri Lanka', 'sri lanka', 'LK'])),
+            "Principle Contact's First Name": maybe(rng, .2, 'Ann'),
+            "Principle Contact's Last Name": maybe(rng, .2, 'Lee'),
+            'Activity': maybe(rng, .3, rng.choice(['Create', 'Update', 'x']))
+        }
+    elif sheet_name == 'Divisions':
+        return {
+            'Organization Short Name': maybe(rng, .2, org),
+            'Division Name': maybe(rng, .2, 'Div'),
+            'Purpose': maybe(rng, .2, rng.choice(['PPS-STG', 'PPS-HRM, BAD', 'BAD', 'PPS-FMG,PPS-ADMIN', 'X, Y'])),
+            "Principle Contact's First Name": maybe(rng, .2, 'Bob'),
+            "Principle Contact's Last Name": maybe(rng, .2, 'Ray'),
+            'Activity': maybe(rng, .3, 'Create')
+        }
+    elif sheet_name == 'Human Resources':
+        # NICs and emails drawn from a range the size of the sheet repeat, so duplicates are common
+        return {
+            'Organization Short Name': maybe(rng, .05, org),
+            'First Name': maybe(rng, .1, 'Kamal'),
+            'Last Name': maybe(rng, .1, 'Perera'),
+            'NIC': maybe(rng, .15, rng.choice([f"{rng.randint(1, rows)}V", f"{rng.randint(1, rows * 5)}V", 12345])),
+            'Email': maybe(rng, .15, rng.choice([f"u{rng.randint(1, rows)}@x.com", 'a@noemail.com', 'b@noemal.com',
+                                                 'bad-email', f"v{rng.randint(1, rows * 5)}@y.lk"])),
+            'Gender': maybe(rng, .2, rng.choice(['M', 'female', 'Male', 'x', 'F'])),
+            'Role': maybe(rng, .2, 'Driver'),
+            'Division': maybe(rng, .2, rng.choice(['Admin', 'Ops'])),
+            'Designation': maybe(rng, .2, rng.choice(['Supervisor', 'Manager', 'Driver', 'Senior Manager'])),
+            'Operations': maybe(rng, .2, 'Ops'),
+            'Create a User Account': maybe(rng, .2, rng.choice([True, False, 'TRUE', 'yes', 1, 0])),
+            'Activity': maybe(rng, .3, rng.choice(['Create', 'Update', 'x']))
+        }
+    elif sheet_name == 'Vehicles':
+        return {
+            'Organization Name': maybe(rng, .1, f"{org} Holdings"),
+            'Organization Short Name': maybe(rng, .1, org),
+            'Vehicle Number': f"WP-{row:05d}",
+            'Division': maybe(rng, .2, rng.choice(['Admin', 'Fleet'])),
+            'Vehicle Type': maybe(rng, .2, rng.choice(['TRUCK', 'Lorry'])),
+            'Load Type': maybe(rng, .2, rng.choice(['LOADS', 'Bulk'])),
+            'Vehicle Categories': maybe(rng, .2, rng.choice(['20 FT', '(40 FT)', '20Ft', 'Big', 40])),
+            'Managed By': maybe(rng, .5, '99V'),
+            'Activity': maybe(rng, .3, rng.choice(['Create', 'x']))
+        }
+    return {
+        'Organization Name': maybe(rng, .1, f"{org} Holdings"),
+        'Organization Short Name': maybe(rng, .1, org),
+        'Location Reference ID': maybe(rng, .2, rng.choice([f"L{row}", 'L1', 'DUPLICATE-L'])),
+        'Location Name': maybe(rng, .2, 'Yard'),
+        'Principle Contact NIC': maybe(rng, .5, '77V'),
+        'Activity': maybe(rng, .3, rng.choice(['Create', 'x']))
+    }
+
+def check_fill_colors():
+    """Make sure the corrector reads RED_FILL as red and the pink and blue decoys as not red"""
+    corrector = ExcelCorrector()
+    cell = Workbook().active['A1']
+    for fill, red in [(RED_FILL, True), (PINK_FILL, False), (BLUE_FILL, False)]:
+        cell.fill = fill
+        assert corrector.is_red_cell(cell) == red, f"{fill.start_color.rgb} should {'' if red else 'not '}count as red"
+
+def generate_master_file(path, rows, seed=1, end_marker=True):
+    """Write a five-sheet master file with the given rows per sheet (streamed, so 100k rows stay cheap)"""
+    check_fill_colors()
+    rng = random.Random(seed)
+    orgs = [f"ORG{idx}" for idx in range(max(3, rows // 10))]
+    workbook = Workbook(write_only=True)
+    
+    for sheet_name, headers in MASTER_SHEETS.items():
+        sheet = workbook.create_sheet(sheet_name)
+        sheet.append([f"{sheet_name} template"])
+        sheet.append(["Fill from row 4"])
+        sheet.append(headers)
+        
+        for row in range(rows):
+            values = master_row(sheet_name, rng, row, rows, orgs)
+            if sheet_name != 'Human Resources':
+                sheet.append([values.get(header) for header in headers])
+                continue
+            
+            # Red (existing record), pink and blue NIC/Email cells
+            cells = []
+            for header in headers:
+                cell = WriteOnlyCell(sheet, value=values.get(header))
+                if header in ('NIC', 'Email'):
+                    draw = rng.random()
+                    if draw < .1:
+                        cell.fill = RED_FILL
+                    elif draw < .13:
+                        cell.fill = PINK_FILL
+                    elif draw < .16:
+                        cell.fill = BLUE_FILL
+                cells.append(cell)
+            sheet.append(cells)
+        
+        if end_marker:
+            sheet.append(['END'])
+    
+    workbook.save(path)
+    return path
+
+def benchmark_file(work_dir, rows, seed):
+    """Path of the generated master file for a row count, generating it on first use"""
+    path = os.path.join(work_dir, f"benchmark_master_{rows}_rows_seed{seed}.xlsx")
+    if not os.path.exists(path):
+        print(f"Generating {rows} row master file: {path}")
+        generate_master_file(path, rows, seed)
+    return path
+
+def run_operation(operation, input_path, output_dir):
+    """Run one correction or check quietly and return the corrector (its profiler holds the stage timings)"""
+    corrector = ExcelCorrector()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if operation == 'correct':
+            corrector.correct_excel_file(input_path, os.path.join(output_dir, "benchmark_corrected.xlsx"))
+        else:
+            corrector.check_issues_only(input_path, output_dir)
+    return corrector
+
+def run_benchmarks(row_counts, operations=None, repeat=1, seed=1, work_dir=None):
+    """Time every operation on every generated file size; the fastest of the repeats is kept"""
+    work_dir = work_dir or os.path.join(tempfile.gettempdir(), "excel_corrector_benchmark")
+    os.makedirs(work_dir, exist_ok=True)
+    results = []
+    
+    for rows in row_counts:
+        input_path = benchmark_file(work_dir, rows, seed)
+        for operation in operations or OPERATIONS:
+            output_dir = tempfile.mkdtemp(dir=work_dir)
+            try:
+                best = None
+                for _ in range(max(repeat, 1)):
+                    start_time = time.perf_counter()
+                    corrector = run_operation(operation, input_path, output_dir)
+                    seconds = time.perf_counter() - start_time
+                    if best is None or seconds < best[0]:
+                        best = (seconds, corrector.profiler.summary())
+            finally:
+                shutil.rmtree(output_dir, ignore_errors=True)
+            
+            seconds, stage_timings = best
+            total_rows = rows * len(MASTER_SHEETS)
+            result = {
+                'operation': operation,
+                'rows_per_sheet': rows,
+                'total_rows': total_rows,
+                'seconds': round(seconds, 4),
+                'rows_per_second': round(total_rows / seconds, 1),
+                'stages': [{key: stage[key] for key in ('stage', 'sheet', 'rows', 'seconds', 'detail') if key in stage}
+                           for stage in stage_timings['stages']]
+            }
+            print(f"⏱️ {operation:<8} {rows:>7} rows/sheet: {result['seconds']:>9.3f}s "
+                  f"({result['rows_per_second']:,.0f} rows/s)")
+            results.append(result)
+    
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'repeat': max(repeat, 1),
+        'results': results
+    }
+
+def compare_to_baseline(run, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Print each result's throughput against the baseline and return the regressions"""
+    baseline_results = {(result['operation'], result['rows_per_sheet']): result for result in baseline['results']}
+    regressions = []
+    
+    for result in run['results']:
+        previous = baseline_results.get((result['operation'], result['rows_per_sheet']))
+        if previous is None:
+            print(f"   {result['operation']} {result['rows_per_sheet']} rows/sheet: no baseline entry")
+            continue
+        ratio = result['rows_per_second'] / previous['rows_per_second']
+        regressed = ratio < 1 - tolerance
+        marker = "❌" if regressed else "✅"
+        print(f"{marker} {result['operation']} {result['rows_per_sheet']} rows/sheet: "
+              f"{result['rows_per_second']:,.0f} rows/s vs {previous['rows_per_second']:,.0f} baseline ({ratio:.0%})")
+        if regressed:
+            regressions.append({'operation': result['operation'], 'rows_per_sheet': result['rows_per_sheet'],
+                                'rows_per_second': result['rows_per_second'],
+                                'baseline_rows_per_second': previous['rows_per_second']})
+    
+    return regressions
+
+def main(argv=None):
+    """CLI entry point."""
+    p = argparse.ArgumentParser(description="Benchmark correct_excel_file and check_issues_only on synthetic master files")
+    p.add_argument("--rows", type=int, nargs='+', default=DEFAULT_ROW_COUNTS,
+                   help="Rows per sheet of each generated master file (default: 1000 10000 100000)")
+    p.add_argument("--operations", choices=OPERATIONS, nargs='+', default=OPERATIONS,
+                   help="'correct' times correct_excel_file, 'check' times check_issues_only (default: both)")
+    p.add_argument("--repeat", type=int, default=1, help="Runs per measurement; the fastest is kept (default: 1)")
+    p.add_argument("--seed", type=int, default=1, help="Seed of the generated data (default: 1)")
+    p.add_argument("--work-dir", help="Where generated master files are kept between runs (default: a temp directory)")
+    p.add_argument("--baseline", default=DEFAULT_BASELINE,
+                   help=f"JSON baseline to compare against; written when it does not exist yet (default: {DEFAULT_BASELINE})")
+    p.add_argument("--update-baseline", action="store_true", help="Replace the baseline with this run's results")
+    p.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                   help=f"Throughput drop reported as a regression, as a fraction (default: {DEFAULT_TOLERANCE})")
+    p.add_argument("--output", help="Also write this run's results to this JSON file")
+    args = p.parse_args(argv)
+    
+    run = run_benchmarks(args.rows, args.operations, args.repeat, args.seed, args.work_dir)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2)
+        print(f"Results saved to: {args.output}")
+    
+    regressions = []
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"Comparing with baseline from {baseline['created_at']} (tolerance {args.tolerance:.0%}):")
+        regressions = compare_to_baseline(run, baseline, args.tolerance)
+    else:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2)
+        print(f"Baseline saved to: {args.baseline}")
+    
+    if regressions:
+        print(f"❌ {len(regressions)} throughput regression(s) against the baseline")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
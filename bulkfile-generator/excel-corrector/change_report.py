@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Excel File Corrector - Change Report
+Group ExcelCorrector's change records in one pass and render the reports lazily as text, Markdown or HTML
+"""
+
+import html
+import os
+from operator import itemgetter
+from string import Formatter
+
+from change_sinks import change_type_counts
+
+REPORT_FORMATS = ['text', 'markdown', 'html']
+
+# Entries formatted per yielded chunk (keeps a streamed 100k-change report from building one huge string)
+ENTRY_CHUNK = 1000
+
+# Report file extensions and the format each one gets
+REPORT_EXTENSIONS = {'.md': 'markdown', '.markdown': 'markdown', '.html': 'html', '.htm': 'html'}
+
+# Sheets of the comprehensive report, in report order
+REPORT_SHEETS = {
+    'organization': 'ORGANIZATION DETAILS',
+    'divisions': 'DIVISIONS',
+    'human_resources': 'HUMAN RESOURCES',
+    'vehicles': 'VEHICLES',
+    'locations': 'LOCATIONS'
+}
+
+# Entry templates: lines filled from a change record's fields (the first line heads the entry)
+DETAILED_CHANGE_ENTRY = ["    • {organization} - {row_info}",
+                         "      Field: {field_name}",
+                         "      BEFORE: '{original_value}'",
+                         "      AFTER:  '{new_value}'"]
+DETAILED_CHANGE_CLOSING = "      ──────────────────────────────────────"
+HR_RED_CELL_ENTRY = ["📍 {organization} - Row {row_number}",
+                     "   Change Type: {change_type}",
+                     "   Original: '{original_value}'",
+                     "   New: '{new_value}'"]
+
+# HR red cell change types: (change type, report heading, entry template)
+HR_RED_CELL_SECTIONS = [
+    ('Dummy NIC Generated', 'DUMMY NICs GENERATED',
+     ["  Organization: {organization}", "  Row: {row_number} (Excel row)",
+      "  Original: '{original_value}'", "  Generated: '{new_value}'"]),
+    ('Dummy Email Generated', 'DUMMY EMAILS GENERATED',
+     ["  Organization: {organization}", "  Row: {row_number} (Excel row)",
+      "  Original: '{original_value}'", "  Generated: '{new_value}'"]),
+    ('Both Red - No Change', 'BOTH NIC & EMAIL RED → NO CHANGES MADE',
+     ["  Organization: {organization}", "  Row: {row_number} (Excel row)",
+      "  Action: No changes made", "  Reason: Both NIC and Email cells are red (existing in system)"]),
+    ('NIC Red - Prefix', 'ONLY NIC RED → PREFIX ADDED',
+     ["  Organization: {organization}", "  Row: {row_number} (Excel row)",
+      "  Original NIC: '{original_value}'", "  New NIC: '{new_value}'"]),
+    ('Email Red - Prefix', 'ONLY EMAIL RED → PREFIX ADDED',
+     ["  Organization: {organization}", "  Row: {row_number} (Excel row)",
+      "  Original Email: '{original_value}'", "  New Email: '{new_value}'"])
+]
+
+def template_fields(line):
+    """Names of the record fields a template line reads"""
+    return [field_name for _, field_name, _, _ in Formatter().parse(line) if field_name]
+
+def compile_template(template):
+    """Turn a {field} template into a %-format string and a getter of the record's field values"""
+    parts = []
+    fields = []
+    for literal, field_name, _, _ in Formatter().parse(template):
+        parts.append(literal.replace('%', '%%'))
+        if field_name:
+            parts.append('%s')
+            fields.append(field_name)
+    if len(fields) == 1:
+        return "".join(parts), lambda change: (change[fields[0]],)
+    return "".join(parts), itemgetter(*fields)
+
+class TextRenderer:
+    """Plain text: the layout printed to the console"""
+    
+    def start(self, title):
+        return ""
+    
+    def end(self):
+        return ""
+    
+    def banner(self, title, indent=0):
+        return "=" * 80 + "\n" + " " * indent + title + "\n" + "=" * 80 + "\n"
+    
+    def heading(self, title, rule=0):
+        return f"{title}:\n" + ("-" * rule + "\n" if rule else "")
+    
+    def subheading(self, title):
+        return f"\n{title}:\n" + "    " + "-" * 50 + "\n"
+    
+    def line(self, text):
+        return text + "\n"
+    
+    def blank(self):
+        return "\n"
+    
+    def rule(self):
+        return "=" * 80 + "\n"
+    
+    def list_start(self):
+        return ""
+    
+    def list_end(self):
+        return ""
+    
+    def entry_format(self, lines, closing=None):
+        # closing is a text-only separator line after the entry
+        return "".join(line + "\n" for line in lines) + (closing + "\n" if closing is not None else "")
+    
+    def entries(self, lines, changes, closing=None):
+        """Fill the entry template from every change record, yielding ENTRY_CHUNK entries at a time"""
+        entry_format, fields = compile_template(self.entry_format(lines, closing))
+        chunk = []
+        for change in changes:
+            try:
+                chunk.append(entry_format % fields(change))
+            except KeyError:
+                # Lines whose fields the record lacks are left out
+                present = [line for line in lines if all(name in change for name in template_fields(line))]
+                chunk.append(self.entry_format(present, closing).format_map(change))
+            if len(chunk) == ENTRY_CHUNK:
+                yield "".join(chunk)
+                chunk = []
+        if chunk:
+            yield "".join(chunk)
+
+class MarkdownRenderer(TextRenderer):
+    """Markdown: banners and headings become headers, entries become list items"""
+    
+    def start(self, title):
+        return f"# {title}\n\n"
+    
+    def banner(self, title, indent=0):
+        return f"## {title}\n\n"
+    
+    def heading(self, title, rule=0):
+        return f"### {title}\n\n"
+    
+    def subheading(self, title):
+        return f"#### {title}\n\n"
+    
+    def line(self, text):
+        return text.strip() + "  \n"
+    
+    def rule(self):
+        return "\n---\n"
+    
+    def list_end(self):
+        return "\n"
+    
+    def entry_format(self, lines, closing=None):
+        return f"- **{lines[0].strip()}**\n" + "".join(f"  {line.strip()}  \n" for line in lines[1:])
+
+class HtmlRenderer(TextRenderer):
+    """A standalone HTML page"""
+    
+    def start(self, title):
+        return (f"<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<title>{html.escape(title)}</title>\n"
+                "</head>\n<body>\n")
+    
+    def end(self):
+        return "</body>\n</html>\n"
+    
+    def banner(self, title, indent=0):
+        return f"<h2>{html.escape(title)}</h2>\n"
+    
+    def heading(self, title, rule=0):
+        return f"<h3>{html.escape(title)}</h3>\n"
+    
+    def subheading(self, title):
+        return f"<h4>{html.escape(title)}</h4>\n"
+    
+    def line(self, text):
+        return f"<p>{html.escape(text.strip())}</p>\n"
+    
+    def blank(self):
+        return ""
+    
+    def rule(self):
+        return "<hr>\n"
+    
+    def list_start(self):
+        return "<ul>\n"
+    
+    def list_end(self):
+        return "</ul>\n"
+    
+    def entry_format(self, lines, closing=None):
+        # Escaping leaves the {field} placeholders as they are
+        details = "".join(f"<br>{html.escape(line.strip())}" for line in lines[1:])
+        return f"<li><strong>{html.escape(lines[0].strip())}</strong>{details}</li>\n"
+    
+    def entries(self, lines, changes, closing=None):
+        escaped = ({field: html.escape(str(value)) for field, value in change.items()} for change in changes)
+        return super().entries(lines, escaped, closing)
+
+RENDERERS = {'text': TextRenderer, 'markdown': MarkdownRenderer, 'html': HtmlRenderer}
+
+def report_format_for_path(file_path):
+    """Report format implied by a file name: .md → Markdown, .html → HTML, anything else → text"""
+    return REPORT_EXTENSIONS.get(os.path.splitext(file_path)[1].lower(), 'text')
+
+class ChangeReport:
+    """Change records of one ExcelCorrector run, grouped on first use and rendered chunk by chunk"""
+    
+    def __init__(self, corrector):
+        self.corrector = corrector
+        self.sheet_groups = None
+        self.hr_red_cell_groups = None
+    
+    def group_sheets(self):
+        """Group each sheet's detailed changes by change type in a single pass (first use only)"""
+        if self.sheet_groups is None:
+            self.sheet_groups = {}
+            for sheet_key in REPORT_SHEETS:
+                changes_by_type = {}
+                for change in self.corrector.detailed_changes.get(sheet_key, []):
+                    changes_by_type.setdefault(change['change_type'], []).append(change)
+                self.sheet_groups[sheet_key] = changes_by_type
+        return self.sheet_groups
+    
+    def group_hr_red_cells(self):
+        """Group the HR red cell changes by change type in a single pass (first use only)"""
+        if self.hr_red_cell_groups is None:
+            self.hr_red_cell_groups = {}
+            for change in self.corrector.hr_red_cell_changes:
+                self.hr_red_cell_groups.setdefault(change['change_type'], []).append(change)
+        return self.hr_red_cell_groups
+    
+    def hr_red_cell_counts(self):
+        """{change type: number of changes} for the HR red cell changes, counted by the sink (not only the kept records)"""
+        return change_type_counts(self.corrector.hr_red_cell_changes)
+    
+    def iter_comprehensive(self, report_format='text'):
+        """Yield the comprehensive report (all sheets, HR red cells and the final summary) in chunks"""
+        sheet_groups = self.group_sheets()
+        renderer = RENDERERS[report_format]()
+        corrector = self.corrector
+        total_detailed_changes = sum(len(changes) for changes in corrector.detailed_changes.values())
+        
+        yield renderer.start("Complete File Correction Report")
+        yield renderer.banner("COMPLETE FILE CORRECTION REPORT - VISUAL CHANGES", 9) + renderer.blank()
+        
+        # Processing Summary at the top
+        yield renderer.heading("PROCESSING OVERVIEW", 40)
+        yield renderer.line("✅ File processed successfully")
+        yield renderer.line("✅ 5 sheets processed: Organization, Divisions, Human Resources, Vehicles, Locations")
+        yield renderer.line(f"✅ Total visual changes made: {total_detailed_changes}")
+        yield renderer.line("✅ File ready for bulk upload") + renderer.blank()
+        
+        # Detailed changes of each sheet, grouped by change type
+        for sheet_key, sheet_display_name in REPORT_SHEETS.items():
+            yield renderer.banner(f"SHEET: {sheet_display_name}", 20) + renderer.blank()
+            
+            changes = corrector.detailed_changes.get(sheet_key, [])
+            if not changes:
+                yield renderer.line("NO CUSTOM CHANGES REQUIRED")
+                yield renderer.line("✅ All standard corrections applied automatically") + renderer.blank()
+                continue
+            
+            yield renderer.heading(f"DETAILED CHANGES MADE ({len(changes)} changes)", 60)
+            type_counts = change_type_counts(changes)
+            for change_type, type_changes in sheet_groups[sheet_key].items():
+                yield renderer.subheading(f"📝 {change_type} ({type_counts[change_type]} changes)")
+                yield renderer.list_start()
+                yield from renderer.entries(DETAILED_CHANGE_ENTRY, type_changes, DETAILED_CHANGE_CLOSING)
+                yield renderer.list_end()
+            yield renderer.blank()
+        
+        # HR red cells in the order they were logged
+        if corrector.hr_red_cell_changes:
+            yield renderer.banner("HR RED CELL DETAILED REPORT", 20) + renderer.blank()
+            yield renderer.list_start()
+            yield from renderer.entries(HR_RED_CELL_ENTRY, corrector.hr_red_cell_changes, "")
+            yield renderer.list_end()
+        
+        yield renderer.banner("FINAL PROCESSING SUMMARY", 22)
+        yield renderer.line(f"🎯 TOTAL CHANGES MADE: {total_detailed_changes} detailed corrections")
+        yield renderer.line("📊 SHEETS PROCESSED: All 5 sheets fully corrected")
+        yield renderer.line("✅ RESULT: File ready for bulk upload with all formatting preserved!")
+        yield renderer.rule()
+        yield renderer.end()
+    
+    def iter_hr_red_cell(self, report_format='text'):
+        """Yield the HR red cell report (summary, then one section per change type) in chunks"""
+        renderer = RENDERERS[report_format]()
+        hr_red_cell_changes = self.corrector.hr_red_cell_changes
+        
+        if not hr_red_cell_changes:
+            if report_format == 'text':
+                yield "No HR red cell changes were made."
+            else:
+                yield renderer.start("HR Red Cell Detection Report")
+                yield renderer.line("No HR red cell changes were made.")
+                yield renderer.end()
+            return
+        
+        counts = self.hr_red_cell_counts()
+        yield renderer.start("HR Red Cell Detection Report")
+        yield renderer.blank() + renderer.banner("HR RED CELL DETECTION REPORT", 12) + renderer.blank()
+        
+        # Summary statistics
+        yield renderer.heading("SUMMARY")
+        yield renderer.line(f"  Total HR changes: {len(hr_red_cell_changes)}")
+        yield renderer.line(f"  Dummy NICs generated: {counts.get('Dummy NIC Generated', 0)}")
+        yield renderer.line(f"  Dummy Emails generated: {counts.get('Dummy Email Generated', 0)}")
+        yield renderer.line(f"  Both NIC & Email red → No changes made: {counts.get('Both Red - No Change', 0)}")
+        yield renderer.line(f"  Only NIC red → Prefix added: {counts.get('NIC Red - Prefix', 0)}")
+        yield renderer.line(f"  Only Email red → Prefix added: {counts.get('Email Red - Prefix', 0)}") + renderer.blank()
+        
+        for change_type, heading, entry_lines in HR_RED_CELL_SECTIONS:
+            changes = self.group_hr_red_cells().get(change_type)
+            if not changes:
+                continue
+            
+            yield renderer.heading(heading, 60)
+            yield renderer.list_start()
+            yield from renderer.entries(entry_lines, changes, "")
+            yield renderer.list_end()
+        
+        yield renderer.heading("RECOMMENDATIONS", 40)
+        yield renderer.line("• Review red cell changes for accuracy")
+        yield renderer.line("• Both red cells indicate existing records - no changes needed")
+        yield renderer.line("• Check that prefixed values maintain data integrity")
+        yield renderer.line("• Confirm red cells indicate existing system records") + renderer.blank()
+        yield renderer.rule()
+        yield renderer.end()
+    
+    def iter_report(self, report='comprehensive', report_format='text'):
+        """Chunks of the 'comprehensive' or 'hr_red_cell' report"""
+        if report_format not in RENDERERS:
+            raise ValueError(f"Unknown report format: {report_format} (expected one of {', '.join(REPORT_FORMATS)})")
+        if report == 'hr_red_cell':
+            return self.iter_hr_red_cell(report_format)
+        return self.iter_comprehensive(report_format)
+    
+    def render(self, report='comprehensive', report_format='text'):
+        """The whole report as one string"""
+        return "".join(self.iter_report(report, report_format))
+    
+    def write(self, output, report='comprehensive', report_format=None):
+        """Stream the report to a file path or an open text stream (format from the extension by default)"""
+        if isinstance(output, str):
+            report_format = report_format or report_format_for_path(output)
+            with open(output, 'w', encoding='utf-8') as f:
+                self.write(f, report, report_format)
+            return output
+        
+        for chunk in self.iter_report(report, report_format or 'text'):
+            output.write(chunk)
+        return output
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Excel File Corrector - Change Sinks
+Decide where ExcelCorrector's change records go: memory, a ring buffer, a JSONL file or counters only
+"""
+
+import json
+import os
+from collections import Counter, deque
+
+# Console verbosity for ExcelCorrector: nothing, a per-file summary, or one line per change
+VERBOSITY_QUIET = 0
+VERBOSITY_SUMMARY = 1
+VERBOSITY_CHANGES = 2
+
+class ChangeStore:
+    """List-like store for one change category: counts every record, keeps only the newest max_records"""
+    
+    def __init__(self, category, max_records=None, stream=None):
+        self.category = category
+        self.total = 0
+        self.type_totals = Counter()
+        self.records = deque(maxlen=max_records)
+        self.stream = stream
+    
+    def append(self, change_record):
+        """Count the record (and its change type), keep it if there is room and write it to the stream if there is one"""
+        self.total += 1
+        self.type_totals[change_record.get('change_type')] += 1
+        if self.records.maxlen != 0:
+            self.records.append(change_record)
+        if self.stream is not None:
+            self.stream.write(json.dumps({'category': self.category, **change_record}, default=str) + "\n")
+    
+    def __len__(self):
+        # Reports use len() as "number of changes made", not "number of records kept"
+        return self.total
+    
+    def __bool__(self):
+        return self.total > 0
+    
+    def __iter__(self):
+        return iter(self.records)
+    
+    def __getitem__(self, index):
+        return list(self.records)[index]
+
+def change_type_counts(store):
+    """{change type: number of changes} of one category: the store's own counts when it drops records, else its records"""
+    if isinstance(store, ChangeStore):
+        return dict(store.type_totals)
+    return dict(Counter(change.get('change_type') for change in store))
+
+class ChangeSink:
+    """Base sink: creates one store per change category (plain lists keep every record)"""
+    
+    def new_store(self, category):
+        """Return the list-like store ExcelCorrector appends this category's records to"""
+        return []
+    
+    def begin_run(self):
+        """Mark the start of a run, so discard() drops only what this run wrote out"""
+        pass
+    
+    def flush(self):
+        """Push buffered records out (called after each file)"""
+        pass
+    
+    def close(self):
+        """Release any file handles"""
+        pass
+    
+    def discard(self):
+        """Drop what the run wrote out and release any file handles (called when a run is cancelled)"""
+        self.close()
+
+class MemoryChangeSink(ChangeSink):
+    """Keep records in memory: all of them, or only the newest max_records per category (ring buffer)"""
+    
+    def __init__(self, max_records=None):
+        self.max_records = max_records
+    
+    def new_store(self, category):
+        if self.max_records is None:
+            return []
+        return ChangeStore(category, self.max_records)
+
+class CounterChangeSink(ChangeSink):
+    """Only count records; nothing is kept"""
+    
+    def new_store(self, category):
+        return ChangeStore(category, 0)
+
+class JsonlChangeSink(ChangeSink):
+    """Append every record as one JSON line to a file, keeping only the newest max_records in memory"""
+    
+    def __init__(self, file_path, max_records=0):
+        self.file_path = file_path
+        self.max_records = max_records
+        self.stream = None
+        self.created = False
+        self.start_offset = 0
+    
+    def begin_run(self):
+        """Open the file on first use and remember where this run's records start"""
+        if self.stream is None:
+            self.created = not os.path.exists(self.file_path)
+            self.stream = open(self.file_path, 'a', encoding='utf-8')
+        self.stream.flush()
+        self.start_offset = self.stream.tell()
+        # The file only counts as this run's own while no earlier run has written to it
+        self.created = self.created and self.start_offset == 0
+    
+    def new_store(self, category):
+        if self.stream is None:
+            self.begin_run()
+        return ChangeStore(category, self.max_records, self.stream)
+    
+    def flush(self):
+        if self.stream is not None:
+            self.stream.flush()
+    
+    def close(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+    
+    def discard(self):
+        """Cut the file back to what it held before this run began (removing it if the run created it)"""
+        if self.stream is None:
+            return
+        self.close()
+        if self.created:
+            os.remove(self.file_path)
+        else:
+            with open(self.file_path, 'r+b') as f:
+                f.truncate(self.start_offset)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Excel File Corrector - Column Roles
+Map a sheet's headers to the semantic columns each correction/analysis step needs, once per header layout
+"""
+
+from functools import lru_cache
+from types import MappingProxyType
+
+from validation_rules import OPTION_COLUMN_ALIASES
+
+# Header-matching chains, one per correction/analysis step. Each rule is (role, substrings the
+# lowercased header must contain, substrings it must not contain); rules are tried in order like an
+# if/elif chain and the last matching header wins a role, unless the chain is 'first_match'.
+ROLE_CHAINS = {
+    'organization_label': {
+        'first_match': True,
+        'rules': [
+            ('org', ('organization',), ()),
+            ('org', ('company',), ())
+        ]
+    },
+    'organization_details': {
+        'rules': [
+            ('org_name', ('organization', 'name'), ('short',)),
+            ('org_short_name', ('organization', 'short'), ()),
+            ('operations', ('operation',), ()),
+            ('principle_contact_first_name', ('principle contact', 'first name'), ()),
+            ('principle_contact_last_name', ('principle contact', 'last name'), ()),
+            ('address_line', ('address line',), ()),
+            ('city', ('city',), ())
+        ]
+    },
+    'organization_issues': {
+        'rules': [
+            ('org_name', ('organization', 'name'), ('short',)),
+            ('org_short_name', ('organization', 'short'), ()),
+            ('operations', ('operation',), ()),
+            ('status', ('status',), ()),
+            ('verticals', ('vertical',), ()),
+            ('country', ('country',), ()),
+            ('state', ('state',), ()),
+            ('principle_contact_first_name', ('principle contact', 'first name'), ()),
+            ('principle_contact_last_name', ('principle contact', 'last name'), ()),
+            ('address_line', ('address line',), ()),
+            ('city', ('city',), ())
+        ]
+    },
+    'divisions': {
+        'rules': [
+            ('org_short_name', ('organization', 'short'), ()),
+            ('division_name', ('division', 'name'), ()),
+            ('purpose', ('purpose',), ()),
+            ('first_name', ('first', 'name'), ()),
+            ('last_name', ('last', 'name'), ())
+        ]
+    },
+    'human_resources_contacts': {
+        'rules': [
+            ('nic', ('nic',), ()),
+            ('email', ('email',), ())
+        ]
+    },
+    'human_resources_matching': {
+        'rules': [
+            ('org_short_name', ('organization', 'short'), ()),
+            ('nic', ('nic',), ()),
+            ('first_name', ('first name',), ()),
+            ('last_name', ('last name',), ()),
+            ('designation', ('designation',), ())
+        ]
+    },
+    'human_resources_issues': {
+        'rules': [
+            ('gender', ('gender',), ()),
+            ('division', ('division',), ()),
+            ('nic', ('nic',), ()),
+            ('email', ('email',), ())
+        ]
+    },
+    'vehicles': {
+        'rules': [
+            ('org', ('organization',), ('short',)),
+            ('org_short_name', ('organization', 'short'), ()),
+            ('managed_by', ('managed by',), ())
+        ]
+    },
+    'vehicles_issues': {
+        'rules': [
+            ('division', ('division',), ()),
+            ('vehicle_type', ('vehicle', 'type'), ()),
+            ('load_type', ('load', 'type'), ()),
+            ('managed_by', ('managed by',), ())
+        ]
+    },
+    'locations': {
+        'rules': [
+            ('org', ('organization',), ('short',)),
+            ('org_short_name', ('organization', 'short'), ()),
+            ('principle_contact_nic', ('principle', 'contact', 'nic'), ())
+        ]
+    },
+    'location_ids': {
+        'rules': [
+            ('location_ref_id', ('location reference id',), ()),
+            ('location_name', ('location name',), ())
+        ]
+    },
+    'locations_issues': {
+        'rules': [
+            ('location_ref_id', ('location reference id',), ()),
+            ('location_name', ('location name',), ()),
+            ('principle_contact_nic', ('principle', 'contact', 'nic'), ())
+        ]
+    }
+}
+
+def match_role(chain, col_lower):
+    """Return the role of the first rule in the chain that a lowercased header satisfies, or None"""
+    for role, required, excluded in chain['rules']:
+        if all(part in col_lower for part in required) and not any(part in col_lower for part in excluded):
+            return role
+    return None
+
+@lru_cache(maxsize=256)
+def resolve_column_roles(chain_name, columns):
+    """Return a read-only {role: header or None} for a chain and a tuple of headers (memoized by header
+    signature, so every sheet with those headers shares it)"""
+    chain = ROLE_CHAINS[chain_name]
+    roles = {role: None for role, _, _ in chain['rules']}
+    for col in columns:
+        role = match_role(chain, col.lower())
+        if role is None:
+            continue
+        if chain.get('first_match'):
+            if roles[role] is None:
+                roles[role] = col
+        else:
+            roles[role] = col
+    return MappingProxyType(roles)
+
+@lru_cache(maxsize=256)
+def find_column_containing(columns, column_key):
+    """Return the first header containing column_key (case-insensitive), or None"""
+    for col in columns:
+        if column_key in col.lower():
+            return col
+    return None
+
+@lru_cache(maxsize=1024)
+def find_option_column(columns, option_name, sheet_type):
+    """Return the header holding a processing option: exact alias, then partial alias, then option name"""
+    if sheet_type in OPTION_COLUMN_ALIASES and option_name in OPTION_COLUMN_ALIASES[sheet_type]:
+        # Look for exact matches first
+        for possible_name in OPTION_COLUMN_ALIASES[sheet_type][option_name]:
+            for col in columns:
+                if possible_name.lower() == col.lower():
+                    return col
+        
+        # Look for partial matches if no exact match
+        for possible_name in OPTION_COLUMN_ALIASES[sheet_type][option_name]:
+            for col in columns:
+                if possible_name.lower() in col.lower() or col.lower() in possible_name.lower():
+                    return col
+    
+    # Fallback: try to find by partial name matching
+    for col in columns:
+        if option_name.lower() in col.lower() or col.lower() in option_name.lower():
+            return col
+    
+    return None
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Excel File Corrector - Correction Cache
+Keep each sheet's corrected rows and change records between runs, keyed by a content hash per input row
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Bump whenever a correction rule or the file format changes so older cache files are ignored
+CACHE_VERSION = 2
+
+# Tagged JSON forms of the values JSON has no type for: (tag, type, to text, from text), checked in order
+# (Timestamp before datetime, datetime before date)
+TAGGED_TYPES = [
+    ('timestamp', pd.Timestamp, pd.Timestamp.isoformat, pd.Timestamp),
+    ('datetime', datetime.datetime, datetime.datetime.isoformat, datetime.datetime.fromisoformat),
+    ('date', datetime.date, datetime.date.isoformat, datetime.date.fromisoformat),
+    ('time', datetime.time, datetime.time.isoformat, datetime.time.fromisoformat),
+    ('timedelta', datetime.timedelta, lambda value: value.total_seconds(), lambda seconds: datetime.timedelta(seconds=seconds)),
+    ('dtype', np.dtype, str, np.dtype)
+]
+
+# Sheet types whose corrections only read the row being corrected (plus the HR NIC match, which is part
+# of the row hash) and whose change records all carry 'Row N'. Organization, Human Resources and Locations
+# number their dummy values and duplicates across rows, so one changed row re-corrects the whole sheet.
+ROW_LOCAL_SHEET_TYPES = {'divisions', 'vehicles', 'other'}
+
+def frame_rows(df):
+    """Return the DataFrame's rows as tuples of plain values (dates stay Timestamps)"""
+    columns = [df.iloc[:, position].tolist() for position in range(df.shape[1])]
+    return list(zip(*columns)) if columns else [() for _ in range(len(df))]
+
+def row_hashes(rows, dependency_keys=None):
+    """Hash every row's values (type-aware repr), plus its dependency key when one is given"""
+    hashes = []
+    for position, row in enumerate(rows):
+        digest = hashlib.blake2b(repr(row).encode('utf-8'), digest_size=16)
+        if dependency_keys is not None:
+            digest.update(repr(dependency_keys[position]).encode('utf-8'))
+        hashes.append(digest.hexdigest())
+    return hashes
+
+def sheet_layout(sheet_type, df, processing_options):
+    """What every cached row of a sheet also depends on: sheet type, headers, column dtypes and options"""
+    options = json.dumps(processing_options, sort_keys=True, default=str) if processing_options else ''
+    return (sheet_type, tuple(str(col) for col in df.columns), tuple(str(dtype) for dtype in df.dtypes), options)
+
+def rows_to_frame(columns, dtypes, rows):
+    """Rebuild a DataFrame from row tuples, restoring each column's dtype"""
+    df = pd.DataFrame({position: pd.Series([row[position] for row in rows], dtype=object)
+                       for position in range(len(columns))})
+    for position, dtype in enumerate(dtypes):
+        if dtype != object:
+            df.isetitem(position, df.iloc[:, position].astype(dtype))
+    df.columns = columns
+    return df
+
+def record_row(record):
+    """0-based row of a change record, read from its 'Row N' label"""
+    return int(record['row_info'].split()[1]) - 4
+
+def move_record(record, position):
+    """Copy a record logged for a row of a partial sheet, relabelled for the row's position in the full sheet"""
+    old_label = record['row_info']
+    new_label = f'Row {position + 4}'
+    moved = dict(record, row_info=new_label)
+    # Rows without an organization name are reported by their row label
+    if record.get('organization') == old_label:
+        moved['organization'] = new_label
+    return moved
+
+def record_order(columns):
+    """Sort key giving a row-local sheet's records in the order a full run logs them: column by column,
+    rows in order, with the HR NIC fills last"""
+    positions = {}
+    for position, col in enumerate(columns):
+        positions.setdefault(col, position)
+    return lambda record: (record['change_type'].endswith('NIC Fill'),
+                           positions.get(record['field_name'], len(columns)), record_row(record))
+
+def encode_value(value):
+    """Plain JSON form of a cached value: tuples, NaT, dates, times and dtypes become tagged objects"""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, (list, tuple)):
+        items = [encode_value(item) for item in value]
+        return {'tuple': items} if isinstance(value, tuple) else items
+    if isinstance(value, dict):
+        return {'dict': [[encode_value(key), encode_value(item)] for key, item in value.items()]}
+    if value is pd.NaT:
+        return {'nat': None}
+    for tag, value_type, to_text, _ in TAGGED_TYPES:
+        if isinstance(value, value_type):
+            return {tag: to_text(value)}
+    raise TypeError(f"Cannot cache a value of type {type(value).__name__}")
+
+def decode_value(value):
+    """Inverse of encode_value"""
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    (tag, content), = value.items()
+    if tag == 'tuple':
+        return tuple(decode_value(item) for item in content)
+    if tag == 'dict':
+        return {decode_value(key): decode_value(item) for key, item in content}
+    if tag == 'nat':
+        return pd.NaT
+    for type_tag, _, _, from_text in TAGGED_TYPES:
+        if tag == type_tag:
+            return from_text(content)
+    raise ValueError(f"Unknown cached value tag: {tag}")
+
+class CorrectionCache:
+    """Corrected rows and change records of the last run, per sheet, saved to a JSON file between runs
+    (plain data only, so loading a cache file never runs code)"""
+    
+    def __init__(self, file_path=None):
+        self.file_path = file_path
+        self.sheets = {}
+        self.stats = {'sheets_reused': 0, 'rows_reused': 0, 'rows_corrected': 0}
+        if file_path and os.path.exists(file_path):
+            self.load()
+    
+    def load(self):
+        """Read the cache file; an unreadable file or one from another cache version starts an empty cache"""
+        try:
+            with open(self.file_path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('version') == CACHE_VERSION:
+            self.sheets = decode_value(data['sheets'])
+    
+    def save(self):
+        """Write the cache file (through a uniquely named temporary file, so a failed write keeps the old
+        cache and two runs never share a temporary file)"""
+        if not self.file_path:
+            return
+        cache_dir = os.path.dirname(os.path.abspath(self.file_path))
+        os.makedirs(cache_dir, exist_ok=True)
+        data = {'version': CACHE_VERSION, 'sheets': encode_value(self.sheets)}
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=cache_dir, suffix='.tmp', delete=False) as f:
+            temp_path = f.name
+            try:
+                json.dump(data, f)
+            except BaseException:
+                f.close()
+                os.remove(temp_path)
+                raise
+        os.replace(temp_path, self.file_path)
+    
+    def get(self, key, layout):
+        """Cached entry for a sheet, or None if there is none or it was built for another layout"""
+        entry = self.sheets.get(key)
+        if entry is None or entry['layout'] != layout:
+            return None
+        return entry
+    
+    def put(self, key, entry):
+        """Store a sheet's entry for the next run"""
+        self.sheets[key] = entry
+    
+    def begin_run(self):
+        """Reset the reuse counters for a new file"""
+        self.stats = {'sheets_reused': 0, 'rows_reused': 0, 'rows_corrected': 0}
+    
+    def keep_only(self, keys):
+        """Forget sheets that were not in the last file"""
+        self.sheets = {key: entry for key, entry in self.sheets.items() if key in keys}
@@ -1,64 +1,125 @@
 import pandas as pd
 import openpyxl
-from openpyxl import load_workbook
+from openpyxl import Workbook, load_workbook
+from pandas.errors import EmptyDataError
+from pandas.io.parsers import TextParser
+import numpy as np
 import os
+import sys
+import csv
+import json
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import re
+import time
 from datetime import datetime
+from change_report import ChangeReport
+from change_sinks import MemoryChangeSink, VERBOSITY_SUMMARY, VERBOSITY_CHANGES
+from column_roles import find_column_containing, find_option_column, resolve_column_roles
+from correction_cache import (ROW_LOCAL_SHEET_TYPES, frame_rows, move_record, record_order, record_row,
+                              row_hashes, rows_to_frame, sheet_layout)
+from sheet_streaming import DEFAULT_BATCH_SIZE, SheetLayout, convert_row
+from progress_events import CorrectionCancelled, ProgressReporter
+from stage_profiler import StageProfiler
+from validation_rules import (DEFAULT_DISTRICT, FIELD_RULES, OPTION_ALLOWED_VALUES,
+                              STATE_CORRECTIONS, VALID_PURPOSES, VALID_STATUSES, VALID_VERTICALS, ColumnValues,
+                              DistrictResolver, SheetValidator, is_valid_contact)
+
+# Report-level change stores (the per-sheet detailed stores live in detailed_changes)
+REPORT_CHANGE_STORES = ['hr_red_cell_changes', 'state_changes', 'division_corrections', 'principle_contact_changes']
+
+# Processing option of each Divisions column role, in the order headers are matched to roles
+DIVISION_OPTIONS = [
+    ('org_short_name', 'Organization Short Name'),
+    ('division_name', 'Division Name'),
+    ('purpose', 'Purpose'),
+    ('first_name', 'Principle Contact First Name'),
+    ('last_name', 'Principle Contact Last Name')
+]
+
+# Valid Purpose values as a lookup set
+VALID_PURPOSE_SET = frozenset(VALID_PURPOSES)
+
+# Profiler stage name of each sheet type's correction
+CORRECTION_STAGES = {
+    'organization': 'correct_organization_details',
+    'divisions': 'correct_divisions',
+    'human': 'correct_human_resources',
+    'vehicles': 'correct_vehicles',
+    'locations': 'correct_locations',
+    'other': 'correct_status_columns'
+}
+
+def read_header_index(sheet, header_row=3):
+    """{header text: first column index} of a loaded sheet's header row"""
+    header_index = {}
+    for col in range(1, sheet.max_column + 1):
+        header_cell = sheet.cell(row=header_row, column=col)
+        if header_cell.value and str(header_cell.value).strip():
+            header_index.setdefault(str(header_cell.value).strip(), col)
+    return header_index
+
+def map_header_columns(header_values, columns):
+    """{DataFrame column: Excel column index} of the header cells whose stripped text names a DataFrame column"""
+    col_mapping = {}
+    for excel_col_idx, header_value in enumerate(header_values, 1):
+        if header_value and str(header_value).strip():
+            header_name = str(header_value).strip()
+            if header_name in columns:
+                col_mapping[header_name] = excel_col_idx
+    return col_mapping
+
+def export_cell_value(value, is_user_account):
+    """Value written back for a DataFrame value: None when missing, "Create a User Account" values as text"""
+    if not pd.notna(value):
+        return None
+    if not is_user_account:
+        return value
+    
+    # Force the value to be written as text to prevent Excel from converting to boolean
+    cell_value = str(value).strip()
+    if cell_value in ['1', 'True', 'true', '1.0']:
+        return "TRUE"
+    elif cell_value in ['0', 'False', 'false', '0.0']:
+        return "FALSE"
+    return cell_value
 
 class ExcelCorrector:
-    def __init__(self):
+    def __init__(self, change_sink=None, verbosity=VERBOSITY_SUMMARY, profile_memory=False, progress=None):
+        # Where change records go (default: every record kept in memory) and how much is printed
+        self.change_sink = change_sink or MemoryChangeSink()
+        self.verbosity = verbosity
+        
+        # Progress events and cancellation checkpoints for the GUI (default: none)
+        self.progress = progress or ProgressReporter()
+        
+        # Per-stage timings of the last run (peak Python heap per stage too when profile_memory is set);
+        # every stage start is a progress checkpoint
+        self.profiler = StageProfiler(track_memory=profile_memory, listener=self.progress.stage_event)
+        
         # Initialize tracking for all changes with detailed before/after
-        self.hr_red_cell_changes = []
-        self.state_changes = []
-        self.division_corrections = []
-        self.principle_contact_changes = []
+        self.reset_change_tracking()
         
-        # New: Detailed change tracking for visual reporting
-        self.detailed_changes = {
-            'organization': [],
-            'divisions': [],
-            'human_resources': [],
-            'vehicles': [],
-            'locations': []
-        }
+        # Precomputed END-row masks, keyed by id() of the DataFrame they were built for
+        self.end_row_masks = {}
         
-        # State name mapping for corrections - updated to use district format
-        self.state_corrections = {
-            'western': 'Colombo District',
-            'central': 'Kandy District',
-            'southern': 'Galle District',
-            'northern': 'Jaffna District',
-            'eastern': 'Batticaloa District',
-            'north western': 'Kurunegala District',
-            'north central': 'Anuradhapura District',
-            'uva': 'Badulla District',
-            'sabaragamuwa': 'Ratnapura District',
-            'colombo': 'Colombo District',
-            'gampaha': 'Gampaha District',
-            'kalutara': 'Kalutara District',
-            'kandy': 'Kandy District',
-            'matale': 'Matale District',
-            'nuwara eliya': 'Nuwara Eliya District',
-            'galle': 'Galle District',
-            'matara': 'Matara District',
-            'hambantota': 'Hambantota District',
-            'jaffna': 'Jaffna District',
-            'kilinochchi': 'Kilinochchi District',
-            'mannar': 'Mannar District',
-            'vavuniya': 'Vavuniya District',
-            'mullaitivu': 'Mullaitivu District',
-            'batticaloa': 'Batticaloa District',
-            'ampara': 'Ampara District',
-            'trincomalee': 'Trincomalee District',
-            'kurunegala': 'Kurunegala District',
-            'puttalam': 'Puttalam District',
-            'anuradhapura': 'Anuradhapura District',
-            'polonnaruwa': 'Polonnaruwa District',
-            'badulla': 'Badulla District',
-            'moneragala': 'Monaragala District',
-            'ratnapura': 'Ratnapura District',
-            'kegalle': 'Kegalle District'
-        }
+        # Compiled validation rules per sheet, keyed by id() of the DataFrame they were built for
+        self.sheet_validators = {}
+        
+        # Red NIC/Email cells of HR sheets, keyed by id() of the sheet they were scanned from
+        self.red_cell_bitmaps = {}
+        
+        # Data-row formula cells {(row, column): (formula, cached value)}, keyed by id() of their sheet
+        self.sheet_formulas = {}
+        
+        # Check-issues mode: {header text: column} per sheet name and the {(row, column): comment}
+        # issue cells per sheet name waiting to be highlighted before the error file is saved
+        self.header_indexes = {}
+        self.pending_issue_cells = {}
+        
+        # State name mapping for corrections (district format), resolved once per distinct spelling
+        self.state_corrections = STATE_CORRECTIONS
+        self.district_resolver = DistrictResolver(self.state_corrections)
     
     def correct_state_name(self, state_value, org_name=None):
         """Convert state name to correct Sri Lankan district format"""
@@ -66,13 +127,7 @@ class ExcelCorrector:
             return 'Gampaha District'  # Default
         
         original_state = str(state_value).strip()
-        state_lower = original_state.lower().strip()
-        
-        # Check if it already ends with "district"
-        if state_lower.endswith('district'):
-            corrected_state = original_state
-        else:
-            corrected_state = self.state_corrections.get(state_lower, f"{state_value} District")
+        corrected_state = self.district_resolver.normalize(str(state_value))
         
         # Log the change if there was a correction
         if original_state != corrected_state:
@@ -82,10 +137,7 @@ class ExcelCorrector:
     
     def is_valid_email(self, email):
         """Check if email format is valid"""
-        if pd.isna(email) or email == '':
-            return False
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(email_pattern, str(email)) is not None
+        return is_valid_contact(email, 'email')
     
     def generate_org_short_name(self, org_name):
         """Generate short name from organization name"""
@@ -112,7 +164,6 @@ class ExcelCorrector:
         category_str = str(category_value).strip()
         
         # Extract number from various formats like "20 FT", "(20 FT)", "20FT", etc.
-        import re
         number_match = re.search(r'(\d+)', category_str)
         if number_match:
             number = number_match.group(1)
@@ -121,6 +172,11 @@ class ExcelCorrector:
             # If no number found, return as is
             return category_value
     
+    def format_vehicle_categories(self, text):
+        """Column-wise format_vehicle_category over str() values: first number + 'Ft', else the text unchanged"""
+        numbers = text.str.strip().str.extract(r'(\d+)', expand=False)
+        return (numbers + 'Ft').where(numbers.notna(), text)
+    
     def is_red_cell(self, cell):
         """Check if a cell has red background color"""
         try:
@@ -146,31 +202,183 @@ class ExcelCorrector:
         
         return False
     
+    def get_red_cell_bitmap(self, sheet, header_row=3, data_start_row=4):
+        """Scan an HR sheet's NIC/Email cells once: {'nic_col_idx', 'email_col_idx', 'nic_red', 'email_red'}"""
+        cached = self.red_cell_bitmaps.get(id(sheet))
+        if cached is not None and cached[0] is sheet:
+            return cached[1]
+        
+        # Find NIC and Email columns in the sheet
+        nic_col_idx = None
+        email_col_idx = None
+        for col_idx in range(1, sheet.max_column + 1):
+            header_cell = sheet.cell(row=header_row, column=col_idx)
+            if header_cell.value:
+                header_value = str(header_cell.value).lower()
+                if 'nic' in header_value:
+                    nic_col_idx = col_idx
+                elif 'email' in header_value:
+                    email_col_idx = col_idx
+        
+        # A workbook has only a handful of distinct fills, so the color check runs once per fill
+        fill_verdicts = {}
+        row_count = max(sheet.max_row - data_start_row + 1, 0)
+        bitmap = {'nic_col_idx': nic_col_idx, 'email_col_idx': email_col_idx}
+        for key, col_idx in [('nic_red', nic_col_idx), ('email_red', email_col_idx)]:
+            red = np.zeros(row_count, dtype=bool)
+            if col_idx:
+                for offset in range(row_count):
+                    cell = sheet.cell(row=data_start_row + offset, column=col_idx)
+                    # Cells without a style array use the workbook's default fill (id 0)
+                    fill_id = cell._style.fillId if cell._style is not None else 0
+                    if fill_id not in fill_verdicts:
+                        fill_verdicts[fill_id] = self.is_red_cell(cell)
+                    red[offset] = fill_verdicts[fill_id]
+            bitmap[key] = red
+        
+        self.red_cell_bitmaps[id(sheet)] = (sheet, bitmap)
+        return bitmap
+    
     def reset_change_tracking(self):
         """Reset all change tracking for a new file"""
-        self.hr_red_cell_changes = []
-        self.state_changes = []
-        self.division_corrections = []
-        self.principle_contact_changes = []
+        self.change_sink.begin_run()
+        self.hr_red_cell_changes = self.change_sink.new_store('hr_red_cell_changes')
+        self.state_changes = self.change_sink.new_store('state_changes')
+        self.division_corrections = self.change_sink.new_store('division_corrections')
+        self.principle_contact_changes = self.change_sink.new_store('principle_contact_changes')
         
         # Reset detailed changes tracking
         self.detailed_changes = {
-            'organization': [],
-            'divisions': [],
-            'human_resources': [],
-            'vehicles': [],
-            'locations': []
+            sheet_key: self.change_sink.new_store(sheet_key)
+            for sheet_key in ['organization', 'divisions', 'human_resources', 'vehicles', 'locations']
         }
     
+    def log_change_line(self, message):
+        """Print a per-change console line, only at VERBOSITY_CHANGES"""
+        if self.verbosity >= VERBOSITY_CHANGES:
+            print(message)
+    
+    def generate_change_summary(self):
+        """Generate a short per-category count of the changes made"""
+        summary = "📊 CHANGE SUMMARY\n"
+        for sheet_key, changes in self.detailed_changes.items():
+            summary += f"  {sheet_key.replace('_', ' ').title()}: {len(changes)} changes\n"
+        summary += f"  HR red cell changes: {len(self.hr_red_cell_changes)}\n"
+        summary += f"  State name corrections (distinct spellings): {len(self.state_changes)}\n"
+        summary += f"  Division corrections: {len(self.division_corrections)}\n"
+        summary += f"  Principle contact changes: {len(self.principle_contact_changes)}"
+        return summary
+    
+    def load_workbook_with_dataframes(self, input_file_path, header_row=3, keep_vba=False):
+        """Load the workbook once and build each sheet's DataFrame from the loaded cells (keep_vba keeps the
+        macros of .xlsm files for the save)"""
+        # pd.read_excel used to re-parse the whole file for every sheet. The workbook keeps its formulas
+        # (data_only=False) for the save; sheets with formulas take their DataFrame from the cached values
+        # of a second, read-only parse, as pd.read_excel did, so formulas are never corrected as text
+        workbook = load_workbook(input_file_path, data_only=False, keep_vba=keep_vba)
+        formula_cells = {sheet_name: [coordinate for coordinate, cell in workbook[sheet_name]._cells.items()
+                                      if cell.data_type == 'f']
+                         for sheet_name in workbook.sheetnames}
+        values_workbook = None
+        if any(formula_cells.values()):
+            values_workbook = load_workbook(input_file_path, read_only=True, data_only=True)
+        
+        dataframes = {}
+        self.end_row_masks = {}
+        self.sheet_validators = {}
+        self.red_cell_bitmaps = {}
+        self.sheet_formulas = {}
+        try:
+            for sheet_name in workbook.sheetnames:
+                sheet = workbook[sheet_name]
+                if not formula_cells[sheet_name]:
+                    dataframes[sheet_name] = self.sheet_to_dataframe(sheet, header_row)
+                else:
+                    df = dataframes[sheet_name] = self.sheet_to_dataframe(values_workbook[sheet_name], header_row)
+                    # Data-row formulas remember their cached value, so the write-back can keep them
+                    formulas = {}
+                    for row, col in formula_cells[sheet_name]:
+                        row_idx = row - header_row - 1
+                        if row_idx >= 0:
+                            in_frame = row_idx < len(df) and col <= len(df.columns)
+                            cached_value = df.iat[row_idx, col - 1] if in_frame else None
+                            formulas[(row, col)] = (sheet.cell(row=row, column=col).value, cached_value)
+                    self.sheet_formulas[id(sheet)] = (sheet, formulas)
+                # Build the END-row mask up front so every later pass shares it
+                self.get_end_row_mask(dataframes[sheet_name])
+        finally:
+            if values_workbook is not None:
+                values_workbook.close()
+        
+        return workbook, dataframes
+    
+    def sheet_to_dataframe(self, sheet, header_row=3):
+        """Build a DataFrame from a loaded sheet, matching pd.read_excel(header=header_row - 1)"""
+        data = []
+        last_row_with_data = -1
+        
+        for row_number, row in enumerate(sheet.iter_rows()):
+            # Converted values with trailing empty cells trimmed
+            converted_row = convert_row(row)
+            if converted_row:
+                last_row_with_data = row_number
+            data.append(converted_row)
+        
+        # Trim trailing empty rows and pad the rest to the same width
+        data = data[:last_row_with_data + 1]
+        if not data:
+            return pd.DataFrame()
+        
+        max_width = max(len(data_row) for data_row in data)
+        data = [data_row + [''] * (max_width - len(data_row)) for data_row in data]
+        
+        try:
+            return TextParser(data, header=header_row - 1, skip_blank_lines=False).read()
+        except EmptyDataError:
+            return pd.DataFrame()
+    
+    def build_end_row_mask(self, df):
+        """Build a boolean array marking rows where any cell reads 'END' (vectorized over columns)"""
+        mask = np.zeros(len(df), dtype=bool)
+        
+        for col_idx in range(len(df.columns)):
+            column = df.iloc[:, col_idx]
+            # Only text columns can hold an END marker; numeric/bool/date columns never do
+            if not (pd.api.types.is_object_dtype(column) or pd.api.types.is_string_dtype(column)):
+                continue
+            mask |= column.astype(str).str.upper().str.strip().eq('END').to_numpy(dtype=bool)
+        
+        return mask
+    
+    def get_end_row_mask(self, df):
+        """Return the END-row mask for a DataFrame, building it only on first use"""
+        cached = self.end_row_masks.get(id(df))
+        if cached is not None and cached[0] is df and len(cached[1]) == len(df):
+            return cached[1]
+        
+        mask = self.build_end_row_mask(df)
+        self.end_row_masks[id(df)] = (df, mask)
+        return mask
+    
+    def get_sheet_validator(self, df):
+        """Return the SheetValidator for a DataFrame, building it only on first use"""
+        cached = self.sheet_validators.get(id(df))
+        if cached is not None and cached[0] is df and len(cached[1].end_rows) == len(df):
+            return cached[1]
+        
+        validator = SheetValidator(df, self.get_end_row_mask(df))
+        self.sheet_validators[id(df)] = (df, validator)
+        return validator
+    
+    def get_column_roles(self, df, chain_name):
+        """Return {role: column} for a DataFrame's headers (see column_roles.ROLE_CHAINS)"""
+        return resolve_column_roles(chain_name, tuple(df.columns))
+    
     def is_end_row(self, df, idx):
         """Check if a row is an END row that should be skipped"""
         try:
-            for col in df.columns:
-                cell_value = str(df.loc[idx, col]).upper().strip()
-                if cell_value == 'END':
-                    return True
-            return False
-        except:
+            return bool(self.get_end_row_mask(df)[idx])
+        except Exception:
             return False
     
     def log_hr_red_cell_change(self, change_type, row_idx, org_name=None, original_value=None, new_value=None):
@@ -183,14 +391,15 @@ class ExcelCorrector:
             'new_value': new_value
         })
     
-    def log_state_change(self, original, corrected, org_name=None):
-        """Log state name changes for reporting"""
+    def log_state_change(self, original, corrected, org_name=None, rows=1):
+        """Log state name changes for reporting, one record per distinct spelling with its row count"""
         if original != corrected:
             self.state_changes.append({
                 'organization': org_name if org_name else 'Unknown',
                 'original_state': original,
                 'corrected_state': corrected,
-                'changed': True
+                'changed': True,
+                'rows': rows
             })
     
     def log_division_correction(self, correction_type, org_name=None, original_value=None, new_value=None):
@@ -213,190 +422,21 @@ class ExcelCorrector:
             'sheet': sheet_type
         })
     
-    def generate_hr_red_cell_report(self):
-        """Generate a report of HR red cell changes"""
-        if not self.hr_red_cell_changes:
-            return "No HR red cell changes were made."
-        
-        report = "\n" + "="*80 + "\n"
-        report += "            HR RED CELL DETECTION REPORT\n"
-        report += "="*80 + "\n\n"
-        
-        # Summary statistics
-        total_changes = len(self.hr_red_cell_changes)
-        both_red_no_change = sum(1 for change in self.hr_red_cell_changes if change['change_type'] == 'Both Red - No Change')
-        nic_prefix_changes = sum(1 for change in self.hr_red_cell_changes if change['change_type'] == 'NIC Red - Prefix')
-        email_prefix_changes = sum(1 for change in self.hr_red_cell_changes if change['change_type'] == 'Email Red - Prefix')
-        dummy_nics = sum(1 for change in self.hr_red_cell_changes if change['change_type'] == 'Dummy NIC Generated')
-        dummy_emails = sum(1 for change in self.hr_red_cell_changes if change['change_type'] == 'Dummy Email Generated')
-        
-        report += f"SUMMARY:\n"
-        report += f"  Total HR changes: {total_changes}\n"
-        report += f"  Dummy NICs generated: {dummy_nics}\n"
-        report += f"  Dummy Emails generated: {dummy_emails}\n"
-        report += f"  Both NIC & Email red → No changes made: {both_red_no_change}\n"
-        report += f"  Only NIC red → Prefix added: {nic_prefix_changes}\n"
-        report += f"  Only Email red → Prefix added: {email_prefix_changes}\n\n"
-        
-        # Group by change type
-        dummy_nic_changes = [c for c in self.hr_red_cell_changes if c['change_type'] == 'Dummy NIC Generated']
-        dummy_email_changes = [c for c in self.hr_red_cell_changes if c['change_type'] == 'Dummy Email Generated']
-        both_red_changes = [c for c in self.hr_red_cell_changes if c['change_type'] == 'Both Red - No Change']
-        nic_prefix_changes_list = [c for c in self.hr_red_cell_changes if c['change_type'] == 'NIC Red - Prefix']
-        email_prefix_changes_list = [c for c in self.hr_red_cell_changes if c['change_type'] == 'Email Red - Prefix']
-        
-        # Dummy NIC generation
-        if dummy_nic_changes:
-            report += "DUMMY NICs GENERATED:\n"
-            report += "-" * 60 + "\n"
-            for change in dummy_nic_changes:
-                report += f"  Organization: {change['organization']}\n"
-                report += f"  Row: {change['row_number']} (Excel row)\n"
-                report += f"  Original: '{change['original_value']}'\n"
-                report += f"  Generated: '{change['new_value']}'\n\n"
-        
-        # Dummy Email generation
-        if dummy_email_changes:
-            report += "DUMMY EMAILS GENERATED:\n"
-            report += "-" * 60 + "\n"
-            for change in dummy_email_changes:
-                report += f"  Organization: {change['organization']}\n"
-                report += f"  Row: {change['row_number']} (Excel row)\n"
-                report += f"  Original: '{change['original_value']}'\n"
-                report += f"  Generated: '{change['new_value']}'\n\n"
-        
-        # Both red changes (No changes made)
-        if both_red_changes:
-            report += "BOTH NIC & EMAIL RED → NO CHANGES MADE:\n"
-            report += "-" * 60 + "\n"
-            for change in both_red_changes:
-                report += f"  Organization: {change['organization']}\n"
-                report += f"  Row: {change['row_number']} (Excel row)\n"
-                report += f"  Action: No changes made\n"
-                report += f"  Reason: Both NIC and Email cells are red (existing in system)\n\n"
-        
-        # NIC prefix changes
-        if nic_prefix_changes_list:
-            report += "ONLY NIC RED → PREFIX ADDED:\n"
-            report += "-" * 60 + "\n"
-            for change in nic_prefix_changes_list:
-                report += f"  Organization: {change['organization']}\n"
-                report += f"  Row: {change['row_number']} (Excel row)\n"
-                report += f"  Original NIC: '{change['original_value']}'\n"
-                report += f"  New NIC: '{change['new_value']}'\n\n"
-        
-        # Email prefix changes  
-        if email_prefix_changes_list:
-            report += "ONLY EMAIL RED → PREFIX ADDED:\n"
-            report += "-" * 60 + "\n"
-            for change in email_prefix_changes_list:
-                report += f"  Organization: {change['organization']}\n"
-                report += f"  Row: {change['row_number']} (Excel row)\n"
-                report += f"  Original Email: '{change['original_value']}'\n"
-                report += f"  New Email: '{change['new_value']}'\n\n"
-        
-        report += "RECOMMENDATIONS:\n"
-        report += "-" * 40 + "\n"
-        report += "• Review red cell changes for accuracy\n"
-        report += "• Both red cells indicate existing records - no changes needed\n"
-        report += "• Check that prefixed values maintain data integrity\n"
-        report += "• Confirm red cells indicate existing system records\n\n"
-        
-        report += "="*80 + "\n"
-        return report
+    def change_report(self):
+        """Report model over this run's change records; nothing is grouped or rendered until asked for"""
+        return ChangeReport(self)
+    
+    def generate_hr_red_cell_report(self, report_format='text'):
+        """Generate a report of HR red cell changes (text, markdown or html)"""
+        return self.change_report().render('hr_red_cell', report_format)
     
-    def generate_comprehensive_report(self):
+    def generate_comprehensive_report(self, report_format='text'):
         """Generate comprehensive report including all corrections and changes organized by sheet"""
-        comprehensive_report = ""
-        
-        # Header
-        comprehensive_report += "="*80 + "\n"
-        comprehensive_report += "         COMPLETE FILE CORRECTION REPORT - VISUAL CHANGES\n"
-        comprehensive_report += "="*80 + "\n\n"
-        
-        # Processing Summary at the top
-        total_tracked_changes = (len(self.hr_red_cell_changes) + len(self.state_changes) + 
-                               len(self.division_corrections) + len(self.principle_contact_changes))
-        
-        # Calculate total detailed changes
-        total_detailed_changes = sum(len(changes) for changes in self.detailed_changes.values())
-        
-        comprehensive_report += "PROCESSING OVERVIEW:\n"
-        comprehensive_report += "-" * 40 + "\n"
-        comprehensive_report += f"✅ File processed successfully\n"
-        comprehensive_report += f"✅ 5 sheets processed: Organization, Divisions, Human Resources, Vehicles, Locations\n"
-        comprehensive_report += f"✅ Total visual changes made: {total_detailed_changes}\n"
-        comprehensive_report += f"✅ File ready for bulk upload\n\n"
-        
-        # Generate detailed changes report for each sheet
-        sheet_names = {
-            'organization': 'ORGANIZATION DETAILS',
-            'divisions': 'DIVISIONS', 
-            'human_resources': 'HUMAN RESOURCES',
-            'vehicles': 'VEHICLES',
-            'locations': 'LOCATIONS'
-        }
-        
-        for sheet_key, sheet_display_name in sheet_names.items():
-            comprehensive_report += "="*80 + "\n"
-            comprehensive_report += f"                    SHEET: {sheet_display_name}\n"
-            comprehensive_report += "="*80 + "\n\n"
-            
-            changes = self.detailed_changes.get(sheet_key, [])
-            
-            if changes:
-                comprehensive_report += f"DETAILED CHANGES MADE ({len(changes)} changes):\n"
-                comprehensive_report += "-" * 60 + "\n"
-                
-                # Group changes by type
-                changes_by_type = {}
-                for change in changes:
-                    change_type = change['change_type']
-                    if change_type not in changes_by_type:
-                        changes_by_type[change_type] = []
-                    changes_by_type[change_type].append(change)
-                
-                # Display each change type
-                for change_type, type_changes in changes_by_type.items():
-                    comprehensive_report += f"\n📝 {change_type} ({len(type_changes)} changes):\n"
-                    comprehensive_report += "    " + "-" * 50 + "\n"
-                    
-                    for change in type_changes:
-                        comprehensive_report += f"    • {change['organization']} - {change['row_info']}\n"
-                        comprehensive_report += f"      Field: {change['field_name']}\n"
-                        comprehensive_report += f"      BEFORE: '{change['original_value']}'\n"
-                        comprehensive_report += f"      AFTER:  '{change['new_value']}'\n"
-                        comprehensive_report += f"      ──────────────────────────────────────\n"
-                
-                comprehensive_report += "\n"
-            else:
-                comprehensive_report += "NO CUSTOM CHANGES REQUIRED\n"
-                comprehensive_report += "✅ All standard corrections applied automatically\n\n"
-        
-        # Add legacy reporting for HR red cells if present
-        if self.hr_red_cell_changes:
-            comprehensive_report += "="*80 + "\n"
-            comprehensive_report += "                    HR RED CELL DETAILED REPORT\n"
-            comprehensive_report += "="*80 + "\n\n"
-            
-            for change in self.hr_red_cell_changes:
-                comprehensive_report += f"📍 {change['organization']} - Row {change['row_number']}\n"
-                comprehensive_report += f"   Change Type: {change['change_type']}\n"
-                if 'original_value' in change:
-                    comprehensive_report += f"   Original: '{change['original_value']}'\n"
-                if 'new_value' in change:
-                    comprehensive_report += f"   New: '{change['new_value']}'\n"
-                comprehensive_report += "\n"
-        
-        comprehensive_report += "="*80 + "\n"
-        comprehensive_report += "                      FINAL PROCESSING SUMMARY\n"
-        comprehensive_report += "="*80 + "\n"
-        comprehensive_report += f"🎯 TOTAL CHANGES MADE: {total_detailed_changes} detailed corrections\n"
-        comprehensive_report += f"📊 SHEETS PROCESSED: All 5 sheets fully corrected\n"
-        comprehensive_report += f"✅ RESULT: File ready for bulk upload with all formatting preserved!\n"
-        comprehensive_report += "="*80 + "\n"
-        
-        return comprehensive_report
+        return self.change_report().render('comprehensive', report_format)
+    
+    def write_change_report(self, output, report='comprehensive', report_format=None):
+        """Stream a report to a file path (.txt, .md or .html picks the format) or an open text stream"""
+        return self.change_report().write(output, report, report_format)
     
     def get_processing_stats(self):
         """Return basic processing statistics for reports"""
@@ -417,6 +457,7 @@ class ExcelCorrector:
         """Return detailed statistics for comprehensive reporting"""
         total_custom_corrections = (len(self.hr_red_cell_changes) + len(self.state_changes) + 
                                   len(self.division_corrections) + len(self.principle_contact_changes))
+        hr_red_cell_counts = self.change_report().hr_red_cell_counts()
         
         return {
             'corrections_by_category': {
@@ -449,13 +490,14 @@ class ExcelCorrector:
             },
             'processing_details': {
                 'total_custom_corrections': total_custom_corrections,
-                'dummy_nics_generated': len([c for c in self.hr_red_cell_changes if c['change_type'] == 'Dummy NIC Generated']),
-                'dummy_emails_generated': len([c for c in self.hr_red_cell_changes if c['change_type'] == 'Dummy Email Generated']),
-                'both_red_detected': len([c for c in self.hr_red_cell_changes if c['change_type'] == 'Both Red - No Change']),
-                'nic_prefixes_added': len([c for c in self.hr_red_cell_changes if c['change_type'] == 'NIC Red - Prefix']),
-                'email_prefixes_added': len([c for c in self.hr_red_cell_changes if c['change_type'] == 'Email Red - Prefix']),
+                'dummy_nics_generated': hr_red_cell_counts.get('Dummy NIC Generated', 0),
+                'dummy_emails_generated': hr_red_cell_counts.get('Dummy Email Generated', 0),
+                'both_red_detected': hr_red_cell_counts.get('Both Red - No Change', 0),
+                'nic_prefixes_added': hr_red_cell_counts.get('NIC Red - Prefix', 0),
+                'email_prefixes_added': hr_red_cell_counts.get('Email Red - Prefix', 0),
                 'standard_corrections_applied': 16  # Count of standard corrections
-            }
+            },
+            'stage_timings': self.profiler.summary()
         }
     
     def handle_duplicates_and_empty(self, df, column_name, prefix, org_short_names, is_email=False):
@@ -463,12 +505,81 @@ class ExcelCorrector:
         # Convert column to object type to handle mixed data types
         df[column_name] = df[column_name].astype('object')
         
+        values = df[column_name]
+        active_rows = ~self.get_end_row_mask(df)
+        
+        # Work on whole columns: str() of every cell, exactly as the row loop did
+        value_text = values.astype(str)
+        value_stripped = value_text.str.strip()
+        
+        is_na = values.isna().to_numpy()
+        empty_mask = is_na | (value_stripped == '').to_numpy()
+        if is_email:
+            placeholder = (value_text.str.contains('noemail.com', regex=False) |
+                           value_text.str.contains('noemal.com', regex=False))
+            empty_mask |= placeholder.to_numpy()
+        empty_mask &= active_rows
+        filled_mask = active_rows & ~empty_mask
+        
+        # Number the DUMMY values in row order
+        empty_positions = np.flatnonzero(empty_mask).tolist()
+        if is_email:
+            dummy_values = [f"DUMMY{counter:03d}@{org_short_names[pos]}.com"
+                            for counter, pos in enumerate(empty_positions, 1)]
+        else:
+            dummy_values = [f"DUMMY{counter:03d}{org_short_names[pos]}"
+                            for counter, pos in enumerate(empty_positions, 1)]
+        
+        filled_values = value_stripped[filled_mask]
+        
+        # A real value equal to a generated dummy changes the duplicate numbering,
+        # so that rare case goes through the sequential row-by-row path instead
+        if dummy_values and filled_values.isin(dummy_values).any():
+            return self.handle_duplicates_and_empty_sequential(df, column_name, org_short_names, is_email)
+        
+        # nth occurrence of a value gets _DUPLICATE_n (the first one is kept as is)
+        occurrence = filled_values.groupby(filled_values, sort=False).cumcount().to_numpy() + 1
+        filled_positions = np.flatnonzero(filled_mask)
+        duplicate_flags = occurrence > 1
+        duplicate_positions = filled_positions[duplicate_flags].tolist()
+        duplicate_values = [f"{value}_DUPLICATE_{count}" for value, count in
+                            zip(filled_values.to_numpy()[duplicate_flags], occurrence[duplicate_flags].tolist())]
+        
+        # Write both kinds of changes back in one assignment each
+        if len(empty_positions):
+            df.loc[df.index[empty_positions], column_name] = dummy_values
+        if len(duplicate_positions):
+            df.loc[df.index[duplicate_positions], column_name] = duplicate_values
+        
+        # Emit change records in row order so reports match the sequential version
+        changes = sorted(
+            [(pos, True, new_value) for pos, new_value in zip(empty_positions, dummy_values)] +
+            [(pos, False, new_value) for pos, new_value in zip(duplicate_positions, duplicate_values)]
+        )
+        for pos, is_dummy, new_value in changes:
+            org_name = org_short_names[pos] if pos < len(org_short_names) else 'Unknown'
+            original_value = 'Empty' if is_na[pos] else value_text.iat[pos]
+            if is_dummy:
+                change_type = 'Dummy Email Generated' if is_email else 'Dummy NIC Generated'
+                self.log_detailed_change('Human Resources', change_type, f'Row {pos + 4}',
+                                       column_name, original_value, new_value, org_name)
+                self.log_hr_red_cell_change(change_type, pos, org_name, original_value, new_value)
+            else:
+                self.log_detailed_change('Human Resources', f'Duplicate {column_name} Handled', f'Row {pos + 4}',
+                                       column_name, original_value, new_value, org_name)
+        
+        print(f"{column_name}: {len(empty_positions)} dummy values generated, {len(duplicate_positions)} duplicates handled")
+        return df
+    
+    def handle_duplicates_and_empty_sequential(self, df, column_name, org_short_names, is_email=False):
+        """Row-by-row version of handle_duplicates_and_empty, used when real values collide with dummy values"""
         seen_values = {}
         dummy_counter = 1
+        end_rows = self.get_end_row_mask(df)
         
         for idx in range(len(df)):
             # Skip END rows
-            if self.is_end_row(df, idx):
+            if end_rows[idx]:
                 continue
                 
             current_value = df.loc[idx, column_name]
@@ -486,14 +597,12 @@ class ExcelCorrector:
                     self.log_detailed_change('Human Resources', 'Dummy Email Generated', f'Row {idx + 4}', 
                                            column_name, original_value, new_value, org_name)
                     self.log_hr_red_cell_change('Dummy Email Generated', idx, org_name, original_value, new_value)
-                    print(f"Generated dummy Email for row {idx + 4}: {new_value}")
                 else:
                     # Generate dummy NIC: DUMMY + sequential number + OrgShortName
                     new_value = f"DUMMY{dummy_counter:03d}{org_short_names[idx]}"
                     self.log_detailed_change('Human Resources', 'Dummy NIC Generated', f'Row {idx + 4}', 
                                            column_name, original_value, new_value, org_name)
                     self.log_hr_red_cell_change('Dummy NIC Generated', idx, org_name, original_value, new_value)
-                    print(f"Generated dummy NIC for row {idx + 4}: {new_value}")
                 
                 df.loc[idx, column_name] = new_value
                 seen_values[new_value] = 1
@@ -510,65 +619,114 @@ class ExcelCorrector:
                     self.log_detailed_change('Human Resources', f'Duplicate {column_name} Handled', f'Row {idx + 4}', 
                                            column_name, original_value, new_value, org_name)
                     df.loc[idx, column_name] = new_value
-                    print(f"Handled duplicate {column_name} for row {idx + 4}: {value_str} → {new_value}")
                 else:
                     seen_values[value_str] = 1
         
         return df
     
+    def organization_labels(self, df, org_col):
+        """Organization name of every row for change records, 'Row n' where it is empty or there is no such column"""
+        if not org_col:
+            return [f'Row {pos + 4}' for pos in range(len(df))]
+        return [f'Row {pos + 4}' if missing else value
+                for pos, (value, missing) in enumerate(zip(df[org_col].tolist(), df[org_col].isna().tolist()))]
+    
+    def write_column_values(self, df, column, new_values):
+        """Write {row position: value} changes into one column with a single assignment"""
+        if not new_values:
+            return
+        df[column] = df[column].astype('object')
+        df.loc[df.index[list(new_values)], column] = list(new_values.values())
+    
+    def plan_organization_fills(self, df, roles, org_col, end_rows, apply_corrections, apply_dummy_data):
+        """Plan the Organization Details fills and short-name duplicate fixes from whole-column empty masks"""
+        active_rows = ~np.asarray(end_rows, dtype=bool)
+        
+        def empty_mask(column):
+            # str(value).strip() once per distinct value instead of once per cell
+            codes, uniques = pd.factorize(df[column])
+            empty_uniques = np.array([str(value).strip() == '' for value in uniques.tolist()] + [True], dtype=bool)
+            return active_rows & empty_uniques[codes]
+        
+        # (role, enabled, change type, dummy value); a value of None is numbered from the shared counter
+        fills = [
+            ('org_name', apply_dummy_data, 'Organization Name Fill', None),
+            ('org_short_name', apply_corrections, 'Organization Short Name Fill', None),
+            ('operations', apply_dummy_data, 'Operations Fill', "Default"),
+            ('principle_contact_first_name', apply_dummy_data, 'Principle Contact First Name Fill',
+             "Principle Contact's First Name"),
+            ('principle_contact_last_name', apply_dummy_data, 'Principle Contact Last Name Fill',
+             "Principle Contact's Last Name"),
+            ('address_line', apply_dummy_data, 'Address Line Fill', None),
+            ('city', apply_dummy_data, 'City Fill', "Colombo")
+        ]
+        masks = {role: empty_mask(roles[role]) if roles[role] and enabled else np.zeros(len(df), dtype=bool)
+                 for role, enabled, change_type, value in fills}
+        
+        # Every filled Organization Name and Short Name takes the next counter value, in row order;
+        # the Address Line of a row gets the counter as it stands after that row's name fills
+        org_name_steps = masks['org_name'].astype(np.int64)
+        counter_after = 1 + np.cumsum(org_name_steps + masks['org_short_name'].astype(np.int64))
+        counter_before = counter_after - org_name_steps - masks['org_short_name'].astype(np.int64)
+        numbered_values = {
+            'org_name': lambda pos: f"Organization_{counter_before[pos]}",
+            'org_short_name': lambda pos: f"ORG{counter_before[pos] + org_name_steps[pos]:03d}",
+            'address_line': lambda pos: f"Address Line {counter_after[pos]}"
+        }
+        
+        # Rows are reported against the Organization column as it was before any fill
+        org_names = self.organization_labels(df, org_col)
+        
+        writes = []
+        records = []
+        for order, (role, enabled, change_type, value) in enumerate(fills):
+            positions = np.flatnonzero(masks[role]).tolist()
+            new_values = [numbered_values[role](pos) for pos in positions] if value is None else [value] * len(positions)
+            duplicates = []
+            
+            # A short name already seen (including generated ones) gets _DUPLICATE_<distinct names so far + 1>
+            if role == 'org_short_name' and roles[role] and enabled:
+                generated = dict(zip(positions, new_values))
+                short_names = df[roles[role]].astype(str).str.strip().tolist()
+                seen_short_names = set()
+                for pos in np.flatnonzero(active_rows).tolist():
+                    short_name = generated.get(pos, short_names[pos])
+                    if pos not in generated and short_name in seen_short_names:
+                        new_short_name = f"{short_name}_DUPLICATE_{len(seen_short_names) + 1}"
+                        duplicates.append((pos, short_name, new_short_name))
+                        short_name = new_short_name
+                    seen_short_names.add(short_name)
+            
+            records += [(pos, order, change_type, roles[role], 'Empty', new_value)
+                        for pos, new_value in zip(positions, new_values)]
+            records += [(pos, order, 'Organization Short Name Duplicate Fix', roles[role], short_name, new_value)
+                        for pos, short_name, new_value in duplicates]
+            positions += [pos for pos, short_name, new_value in duplicates]
+            new_values += [new_value for pos, short_name, new_value in duplicates]
+            if positions:
+                writes.append((roles[role], dict(zip(positions, new_values))))
+        
+        # Change records in the order the row loop logged them: row by row, then column by column
+        records.sort(key=lambda record: record[:2])
+        return {
+            'writes': writes,
+            'records': [(pos, change_type, column, original_value, new_value, org_names[pos])
+                        for pos, order, change_type, column, original_value, new_value in records]
+        }
+    
     def correct_organization_details(self, df, processing_options=None):
         """Correct Organization Details sheet with enhanced validation and corrections"""
         print("Correcting Organization Details...")
         
         # Get organization names for reporting
-        org_col = None
-        for col in df.columns:
-            if 'organization' in col.lower() or 'company' in col.lower():
-                org_col = col
-                break
+        org_col = self.get_column_roles(df, 'organization_label')['org']
         
         # Find additional columns for enhanced validation
-        org_name_col = None
-        org_short_name_col = None
-        operations_col = None
-        principle_contact_first_name_col = None
-        principle_contact_last_name_col = None
-        address_line_col = None
-        city_col = None
-        
-        for col in df.columns:
-            col_lower = col.lower()
-            if 'organization' in col_lower and 'name' in col_lower and 'short' not in col_lower:
-                org_name_col = col
-            elif 'organization' in col_lower and 'short' in col_lower:
-                org_short_name_col = col
-            elif 'operation' in col_lower:
-                operations_col = col
-            elif 'principle contact' in col_lower and 'first name' in col_lower:
-                principle_contact_first_name_col = col
-            elif 'principle contact' in col_lower and 'last name' in col_lower:
-                principle_contact_last_name_col = col
-            elif 'address line' in col_lower:
-                address_line_col = col
-            elif 'city' in col_lower:
-                city_col = col
-        
-        # Track organization short names for duplicate handling
-        seen_org_short_names = set()
-        short_name_counter = 1
+        roles = self.get_column_roles(df, 'organization_details')
         
         # Valid values for validation
-        valid_statuses = ['NON_BOI', 'BOI']
-        valid_verticals = ['VERT-CUS', 'VERT-SPO', 'VERT-YO', 'VERT-IM-EX', 'VERT-SHIPPING-LINE', 'VERT-TRN']
-        valid_districts = [
-            'Colombo District', 'Gampaha District', 'Kalutara District', 'Kandy District', 
-            'Matale District', 'Nuwara Eliya District', 'Galle District', 'Matara District', 
-            'Hambantota District', 'Jaffna District', 'Kilinochchi District', 'Mannar District', 
-            'Vavuniya District', 'Mullaitivu District', 'Batticaloa District', 'Ampara District', 
-            'Trincomalee District', 'Kurunegala District', 'Anuradhapura District', 
-            'Polonnaruwa District', 'Badulla District', 'Monaragala District', 'Ratnapura District', 
-            'Kegalle District'
-        ]
+        valid_statuses = VALID_STATUSES
+        valid_verticals = VALID_VERTICALS
         
         # Check processing options to determine what corrections to apply
         apply_corrections = True
@@ -581,121 +739,51 @@ class ExcelCorrector:
                 apply_corrections = org_options['Organization Name']['correct']
                 apply_dummy_data = org_options['Organization Name']['dummy_data']
         
-        # Process each row for enhanced corrections
-        for idx in range(len(df)):
-            if self.is_end_row(df, idx):
-                continue
-                
-            org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
-            
-            # 1. Fill empty Organization Name if needed
-            if org_name_col and apply_dummy_data:
-                org_name_value = df.loc[idx, org_name_col]
-                if pd.isna(org_name_value) or str(org_name_value).strip() == '':
-                    new_org_name = f"Organization_{short_name_counter}"
-                    self.log_detailed_change('Organization', 'Organization Name Fill', f'Row {idx + 4}', 
-                                           org_name_col, 'Empty', new_org_name, org_name)
-                    df.loc[idx, org_name_col] = new_org_name
-                    short_name_counter += 1
-            
-            # 2. Handle Organization Short Name duplicates and empty values
-            if org_short_name_col and apply_corrections:
-                org_short_name_value = df.loc[idx, org_short_name_col]
-                if pd.isna(org_short_name_value) or str(org_short_name_value).strip() == '':
-                    # Generate unique short name
-                    new_short_name = f"ORG{short_name_counter:03d}"
-                    self.log_detailed_change('Organization', 'Organization Short Name Fill', f'Row {idx + 4}', 
-                                           org_short_name_col, 'Empty', new_short_name, org_name)
-                    df.loc[idx, org_short_name_col] = new_short_name
-                    seen_org_short_names.add(new_short_name)
-                    short_name_counter += 1
-                else:
-                    short_name_str = str(org_short_name_value).strip()
-                    if short_name_str in seen_org_short_names:
-                        # Handle duplicate by adding suffix
-                        new_short_name = f"{short_name_str}_DUPLICATE_{len(seen_org_short_names) + 1}"
-                        self.log_detailed_change('Organization', 'Organization Short Name Duplicate Fix', f'Row {idx + 4}', 
-                                               org_short_name_col, short_name_str, new_short_name, org_name)
-                        df.loc[idx, org_short_name_col] = new_short_name
-                        seen_org_short_names.add(new_short_name)
-                    else:
-                        seen_org_short_names.add(short_name_str)
-            
-            # 3. Fill empty Operations column
-            if operations_col and apply_dummy_data:
-                operations_value = df.loc[idx, operations_col]
-                if pd.isna(operations_value) or str(operations_value).strip() == '':
-                    new_operations = "Default"
-                    self.log_detailed_change('Organization', 'Operations Fill', f'Row {idx + 4}', 
-                                           operations_col, 'Empty', new_operations, org_name)
-                    df.loc[idx, operations_col] = new_operations
-            
-            # 4. Fill empty Principle Contact names
-            if principle_contact_first_name_col and apply_dummy_data:
-                first_name_value = df.loc[idx, principle_contact_first_name_col]
-                if pd.isna(first_name_value) or str(first_name_value).strip() == '':
-                    new_first_name = "Principle Contact's First Name"
-                    self.log_detailed_change('Organization', 'Principle Contact First Name Fill', f'Row {idx + 4}', 
-                                           principle_contact_first_name_col, 'Empty', new_first_name, org_name)
-                    df.loc[idx, principle_contact_first_name_col] = new_first_name
-            
-            if principle_contact_last_name_col and apply_dummy_data:
-                last_name_value = df.loc[idx, principle_contact_last_name_col]
-                if pd.isna(last_name_value) or str(last_name_value).strip() == '':
-                    new_last_name = "Principle Contact's Last Name"
-                    self.log_detailed_change('Organization', 'Principle Contact Last Name Fill', f'Row {idx + 4}', 
-                                           principle_contact_last_name_col, 'Empty', new_last_name, org_name)
-                    df.loc[idx, principle_contact_last_name_col] = new_last_name
-            
-            # 5. Fill empty Address Line
-            if address_line_col and apply_dummy_data:
-                address_value = df.loc[idx, address_line_col]
-                if pd.isna(address_value) or str(address_value).strip() == '':
-                    new_address = f"Address Line {short_name_counter}"
-                    self.log_detailed_change('Organization', 'Address Line Fill', f'Row {idx + 4}', 
-                                           address_line_col, 'Empty', new_address, org_name)
-                    df.loc[idx, address_line_col] = new_address
-            
-            # 6. Fill empty City
-            if city_col and apply_dummy_data:
-                city_value = df.loc[idx, city_col]
-                if pd.isna(city_value) or str(city_value).strip() == '':
-                    new_city = "Colombo"
-                    self.log_detailed_change('Organization', 'City Fill', f'Row {idx + 4}', 
-                                           city_col, 'Empty', new_city, org_name)
-                    df.loc[idx, city_col] = new_city
-        
-        # Standard corrections with detailed tracking
+        end_rows = self.get_end_row_mask(df)
+        
+        # Fill empty cells and fix duplicate short names from whole-column masks
+        changes = self.plan_organization_fills(df, roles, org_col, end_rows, apply_corrections, apply_dummy_data)
+        for column, new_values in changes['writes']:
+            self.write_column_values(df, column, new_values)
+        for pos, change_type, column, original_value, new_value, org_name in changes['records']:
+            self.log_detailed_change('Organization', change_type, f'Row {pos + 4}',
+                                   column, original_value, new_value, org_name)
+        
+        # Standard corrections with detailed tracking; each column is read once and written back once
+        org_names = self.organization_labels(df, org_col)
         for col in df.columns:
+            values = df[col].tolist()
+            new_values = {}
+            
             # Status corrections - now supports both NON_BOI and BOI
             if 'status' in col.lower() and apply_corrections:
                 for idx in range(len(df)):
-                    if self.is_end_row(df, idx):
+                    if end_rows[idx]:
                         continue
-                    original_value = df.loc[idx, col]
+                    original_value = values[idx]
                     if pd.notna(original_value):
                         status_str = str(original_value).strip()
                         if status_str not in valid_statuses:
                             # Default to NON_BOI if invalid status
                             new_status = 'NON_BOI'
-                            org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
+                            org_name = org_names[idx]
                             self.log_detailed_change('Organization', 'Status Correction', f'Row {idx + 4}', 
                                                    col, original_value, new_status, org_name)
-                            df.loc[idx, col] = new_status
+                            new_values[idx] = new_status
                     else:
                         # Fill empty status with NON_BOI
                         new_status = 'NON_BOI'
-                        org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
+                        org_name = org_names[idx]
                         self.log_detailed_change('Organization', 'Status Fill', f'Row {idx + 4}', 
                                                col, 'Empty', new_status, org_name)
-                        df.loc[idx, col] = new_status
+                        new_values[idx] = new_status
             
             # Verticals corrections - now supports multiple valid values and preserves valid ones
             elif 'vertical' in col.lower():
                 for idx in range(len(df)):
-                    if self.is_end_row(df, idx):
+                    if end_rows[idx]:
                         continue
-                    original_value = df.loc[idx, col]
+                    original_value = values[idx]
                     if pd.notna(original_value):
                         verticals_str = str(original_value).strip()
                         
@@ -727,17 +815,17 @@ class ExcelCorrector:
                                 new_verticals = ', '.join(valid_verticals_found)
                                 if invalid_verticals_found:
                                     # Log correction for invalid ones
-                                    org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
+                                    org_name = org_names[idx]
                                     self.log_detailed_change('Organization', 'Verticals Correction', f'Row {idx + 4}', 
                                                            col, original_value, new_verticals, org_name)
-                                df.loc[idx, col] = new_verticals
+                                new_values[idx] = new_verticals
                             else:
                                 # No valid verticals found, use default
                                 new_verticals = 'VERT-TRN'
-                                org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
+                                org_name = org_names[idx]
                                 self.log_detailed_change('Organization', 'Verticals Correction', f'Row {idx + 4}', 
                                                        col, original_value, new_verticals, org_name)
-                                df.loc[idx, col] = new_verticals
+                                new_values[idx] = new_verticals
                         else:
                             # Single vertical value
                             is_valid = False
@@ -755,265 +843,154 @@ class ExcelCorrector:
                             if not is_valid:
                                 # Default to VERT-TRN if invalid vertical
                                 new_vertical = 'VERT-TRN'
-                                org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
+                                org_name = org_names[idx]
                                 self.log_detailed_change('Organization', 'Verticals Correction', f'Row {idx + 4}', 
                                                        col, original_value, new_vertical, org_name)
-                                df.loc[idx, col] = new_vertical
+                                new_values[idx] = new_vertical
                     else:
                         # Fill empty vertical with VERT-TRN
                         new_vertical = 'VERT-TRN'
-                        org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
+                        org_name = org_names[idx]
                         self.log_detailed_change('Organization', 'Verticals Fill', f'Row {idx + 4}', 
                                                col, 'Empty', new_vertical, org_name)
-                        df.loc[idx, col] = new_vertical
+                        new_values[idx] = new_vertical
             
             # Country corrections
             elif 'country' in col.lower():
                 for idx in range(len(df)):
-                    if self.is_end_row(df, idx):
+                    if end_rows[idx]:
                         continue
-                    original_value = df.loc[idx, col]
+                    original_value = values[idx]
                     if pd.notna(original_value) and str(original_value).strip() != 'Sri Lanka':
-                        org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
+                        org_name = org_names[idx]
                         self.log_detailed_change('Organization', 'Country Correction', f'Row {idx + 4}', 
                                                col, original_value, 'Sri Lanka', org_name)
-                        df.loc[idx, col] = 'Sri Lanka'
+                        new_values[idx] = 'Sri Lanka'
                     elif pd.isna(original_value):
                         # Fill empty country
-                        org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
+                        org_name = org_names[idx]
                         self.log_detailed_change('Organization', 'Country Fill', f'Row {idx + 4}', 
                                                col, 'Empty', 'Sri Lanka', org_name)
-                        df.loc[idx, col] = 'Sri Lanka'
+                        new_values[idx] = 'Sri Lanka'
             
-            # State corrections - now validates against valid district list
+            # State corrections - each distinct spelling is resolved to a valid district once
             elif 'state' in col.lower() or 'province' in col.lower():
-                for idx in range(len(df)):
-                    if self.is_end_row(df, idx):
-                        continue
-                    original_value = df.loc[idx, col]
-                    if pd.notna(original_value):
-                        state_str = str(original_value).strip()
-                        if state_str not in valid_districts:
-                            # Try to correct the state name
-                            corrected_state = self.correct_state_name(str(original_value), org_name)
-                            if corrected_state not in valid_districts:
-                                # If still not valid, default to Gampaha District
-                                corrected_state = 'Gampaha District'
-                            if str(original_value).strip() != corrected_state:
-                                org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
-                                self.log_detailed_change('Organization', 'State/Province Correction', f'Row {idx + 4}', 
-                                                       col, original_value, corrected_state, org_name)
-                                df.loc[idx, col] = corrected_state
-                    else:
+                states = ColumnValues(df[col])
+                districts = self.district_resolver.resolve(states)
+                active_rows = ~np.asarray(end_rows, dtype=bool)
+                filled = active_rows & states.missing
+                corrected = active_rows & ~states.missing & ~districts.valid
+                
+                # One state change per distinct (original -> corrected) spelling, with its row count
+                for pos, original_state, corrected_state, rows in districts.spelling_changes(corrected):
+                    self.log_state_change(original_state, corrected_state, org_names[pos], rows)
+                
+                for idx in np.flatnonzero(filled | corrected).tolist():
+                    org_name = org_names[idx]
+                    if filled[idx]:
                         # Fill empty state with default
-                        corrected_state = 'Gampaha District'
-                        org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
                         self.log_detailed_change('Organization', 'State/Province Fill', f'Row {idx + 4}', 
-                                               col, 'Empty', corrected_state, org_name)
-                        df.loc[idx, col] = corrected_state
+                                               col, 'Empty', DEFAULT_DISTRICT, org_name)
+                        new_values[idx] = DEFAULT_DISTRICT
+                    else:
+                        self.log_detailed_change('Organization', 'State/Province Correction', f'Row {idx + 4}', 
+                                               col, values[idx], districts.district[idx], org_name)
+                        new_values[idx] = districts.district[idx]
+            
+            self.write_column_values(df, col, new_values)
+            if col == org_col and new_values:
+                org_names = self.organization_labels(df, org_col)
         
         return df
     
+    def plan_division_options(self, roles, processing_options):
+        """Resolve the Divisions processing options once: {column: role} for the columns whose fix is enabled"""
+        div_options = (processing_options or {}).get('divisions', {})
+        column_roles = {}
+        for role, option_name in DIVISION_OPTIONS:
+            # A header matched by an earlier role stays with that role, enabled or not
+            if roles[role] and roles[role] not in column_roles:
+                option = div_options.get(option_name, {})
+                column_roles[roles[role]] = role if option.get('correct') or option.get('dummy_data') else None
+        return {column: role for column, role in column_roles.items() if role}
+    
+    def purpose_correction(self, purpose_str):
+        """Corrected value for one (stripped, non-empty) Purpose, or None if it is valid as it is"""
+        if ',' in purpose_str:
+            # Multiple purposes - keep the valid ones
+            valid_purposes_found = [p for p in (p.strip() for p in purpose_str.split(',')) if p in VALID_PURPOSE_SET]
+            new_value = ', '.join(valid_purposes_found) if valid_purposes_found else 'PPS-STG'
+        else:
+            new_value = purpose_str if purpose_str in VALID_PURPOSE_SET else 'PPS-STG'
+        return new_value if new_value != purpose_str else None
+    
     def correct_divisions(self, df, processing_options=None):
         """Correct Divisions sheet with detailed change tracking"""
         print("Correcting Divisions...")
         
         # Get organization names for reporting
-        org_col = None
-        for col in df.columns:
-            if 'organization' in col.lower() or 'company' in col.lower():
-                org_col = col
-                break
+        org_col = self.get_column_roles(df, 'organization_label')['org']
         
-        # Find relevant columns
-        org_short_name_col = None
-        division_name_col = None
-        purpose_col = None
-        first_name_col = None
-        last_name_col = None
+        # Find relevant columns and which of them the processing options enable (all default to off)
+        roles = self.get_column_roles(df, 'divisions')
+        org_short_name_col = roles['org_short_name']
+        column_plan = self.plan_division_options(roles, processing_options)
         
+        # Each enabled column is fixed with whole-column masks, in header order, and written back once
+        org_names = self.organization_labels(df, org_col)
         for col in df.columns:
-            col_lower = col.lower()
-            if 'organization' in col_lower and ('short' in col_lower or 'short name' in col_lower):
-                org_short_name_col = col
-            elif 'division' in col_lower and 'name' in col_lower:
-                division_name_col = col
-            elif 'purpose' in col_lower:
-                purpose_col = col
-            elif 'first' in col_lower and 'name' in col_lower:
-                first_name_col = col
-            elif 'last' in col_lower and 'name' in col_lower:
-                last_name_col = col
-        
-        # Valid purpose values
-        valid_purposes = [
-            'PPS-STG', 'PPS-EX-PR', 'PPS-SPO-CSPOS', 'PPS-IM-PR', 'PPS-ADMIN',
-            'PPS-STPOVR', 'PPS-IM-EX', 'PPS-YO-CC', 'PPS-YO-ECS', 'PPS-HRM', 'PPS-FMG'
-        ]
-        
-        # Process each column based on processing options
-        for col in df.columns:
-            col_lower = col.lower()
-            
-            # Organization Short Name corrections
-            if org_short_name_col and col == org_short_name_col:
-                # Check if corrections are enabled - default to False
-                apply_corrections = False
-                apply_dummy_data = False
-                
-                if processing_options and 'divisions' in processing_options:
-                    div_options = processing_options['divisions']
-                    if 'Organization Short Name' in div_options:
-                        apply_corrections = div_options['Organization Short Name']['correct']
-                        apply_dummy_data = div_options['Organization Short Name']['dummy_data']
-                
-                if apply_corrections or apply_dummy_data:
-                    for idx in range(len(df)):
-                        original_value = df.loc[idx, col]
-                        if pd.isna(original_value) or str(original_value).strip() == '':
-                            new_value = 'EmptyDummy'
-                            org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
-                            self.log_detailed_change('Divisions', 'Organization Short Name Correction', f'Row {idx + 4}', 
-                                                   col, original_value, new_value, org_name)
-                            df.loc[idx, col] = new_value
+            role = column_plan.get(col)
+            if role is None:
+                continue
             
-            # Division Name corrections
-            elif division_name_col and col == division_name_col:
-                # Check if corrections are enabled - default to False
-                apply_corrections = False
-                apply_dummy_data = False
-                
-                if processing_options and 'divisions' in processing_options:
-                    div_options = processing_options['divisions']
-                    if 'Division Name' in div_options:
-                        apply_corrections = div_options['Division Name']['correct']
-                        apply_dummy_data = div_options['Division Name']['dummy_data']
-                
-                if apply_corrections or apply_dummy_data:
-                    for idx in range(len(df)):
-                        original_value = df.loc[idx, col]
-                        if pd.isna(original_value) or str(original_value).strip() == '':
-                            new_value = 'Admin'
-                            org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
-                            self.log_detailed_change('Divisions', 'Division Name Correction', f'Row {idx + 4}', 
-                                                   col, original_value, new_value, org_name)
-                            df.loc[idx, col] = new_value
+            step_start = time.perf_counter()
+            original_values = df[col].tolist()
+            values = ColumnValues(df[col])
+            changes = {}
+            
+            if role == 'org_short_name':
+                for idx in np.flatnonzero(values.blank).tolist():
+                    changes[idx] = ('Organization Short Name Correction', original_values[idx], 'EmptyDummy')
+            
+            elif role == 'division_name':
+                for idx in np.flatnonzero(values.blank).tolist():
+                    changes[idx] = ('Division Name Correction', original_values[idx], 'Admin')
+            
+            elif role == 'purpose':
+                # Invalid purposes are looked up once per distinct value
+                corrected = values.check_distinct(self.purpose_correction)
+                for idx in np.flatnonzero(values.blank | pd.notna(corrected)).tolist():
+                    if values.blank[idx]:
+                        changes[idx] = ('Purpose Correction', original_values[idx], 'PPS-STG')
+                    else:
+                        changes[idx] = ('Purpose Validation Correction', values.stripped.iat[idx], corrected[idx])
             
-            # Purpose corrections  
-            elif purpose_col and col == purpose_col:
-                # Check if corrections are enabled - default to False
-                apply_corrections = False
-                apply_dummy_data = False
-                
-                if processing_options and 'divisions' in processing_options:
-                    div_options = processing_options['divisions']
-                    if 'Purpose' in div_options:
-                        apply_corrections = div_options['Purpose']['correct']
-                        apply_dummy_data = div_options['Purpose']['dummy_data']
-                
-                if apply_corrections or apply_dummy_data:
-                    for idx in range(len(df)):
-                        original_value = df.loc[idx, col]
-                        if pd.isna(original_value) or str(original_value).strip() == '':
-                            new_value = 'PPS-STG'
-                            org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
-                            self.log_detailed_change('Divisions', 'Purpose Correction', f'Row {idx + 4}', 
-                                                   col, original_value, new_value, org_name)
-                            df.loc[idx, col] = new_value
-                        elif pd.notna(original_value):
-                            # Validate and correct invalid purpose values
-                            purpose_str = str(original_value).strip()
-                            if ',' in purpose_str:
-                                # Multiple purposes - validate each one
-                                purposes = [p.strip() for p in purpose_str.split(',')]
-                                valid_purposes_found = [p for p in purposes if p in valid_purposes]
-                                if valid_purposes_found:
-                                    new_value = ', '.join(valid_purposes_found)
-                                else:
-                                    new_value = 'PPS-STG'
-                                
-                                if new_value != purpose_str:
-                                    org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
-                                    self.log_detailed_change('Divisions', 'Purpose Validation Correction', f'Row {idx + 4}', 
-                                                           col, purpose_str, new_value, org_name)
-                                    df.loc[idx, col] = new_value
-                            else:
-                                # Single purpose
-                                if purpose_str not in valid_purposes:
-                                    new_value = 'PPS-STG'
-                                    org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
-                                    self.log_detailed_change('Divisions', 'Purpose Validation Correction', f'Row {idx + 4}', 
-                                                           col, purpose_str, new_value, org_name)
-                                    df.loc[idx, col] = new_value
-            
-            # Principle Contact's First Name corrections
-            elif first_name_col and col == first_name_col:
-                # Check if corrections are enabled - default to False
-                apply_corrections = False
-                apply_dummy_data = False
-                
-                if processing_options and 'divisions' in processing_options:
-                    div_options = processing_options['divisions']
-                    if 'Principle Contact First Name' in div_options:
-                        apply_corrections = div_options['Principle Contact First Name']['correct']
-                        apply_dummy_data = div_options['Principle Contact First Name']['dummy_data']
-                
-                if apply_corrections or apply_dummy_data:
-                    for idx in range(len(df)):
-                        original_value = df.loc[idx, col]
-                        if pd.isna(original_value) or str(original_value).strip() == '':
-                            # Fill empty values with 'Admin'
-                            new_value = 'Admin'
-                            org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
-                            self.log_detailed_change('Divisions', 'Principle Contact First Name Correction', f'Row {idx + 4}', 
-                                                   col, original_value, new_value, org_name)
-                            df.loc[idx, col] = new_value
-                        else:
-                            # Apply concatenation rule: First Name + Organization Short Name
-                            if org_short_name_col and not pd.isna(df.loc[idx, org_short_name_col]):
-                                org_short_name = str(df.loc[idx, org_short_name_col]).strip()
-                                if org_short_name and org_short_name != '':
-                                    new_value = f"{str(original_value).strip()} {org_short_name}"
-                                    if new_value != str(original_value).strip():
-                                        org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
-                                        self.log_detailed_change('Divisions', 'Principle Contact First Name Concatenation', f'Row {idx + 4}', 
-                                                               col, original_value, new_value, org_name)
-                                        df.loc[idx, col] = new_value
-            
-            # Principle Contact's Last Name corrections
-            elif last_name_col and col == last_name_col:
-                # Check if corrections are enabled - default to False
-                apply_corrections = False
-                apply_dummy_data = False
-                
-                if processing_options and 'divisions' in processing_options:
-                    div_options = processing_options['divisions']
-                    if 'Principle Contact Last Name' in div_options:
-                        apply_corrections = div_options['Principle Contact Last Name']['correct']
-                        apply_dummy_data = div_options['Principle Contact Last Name']['dummy_data']
-                
-                if apply_corrections or apply_dummy_data:
-                    for idx in range(len(df)):
-                        original_value = df.loc[idx, col]
-                        if pd.isna(original_value) or str(original_value).strip() == '':
-                            # Fill empty values with 'Admin'
-                            new_value = 'Admin'
-                            org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
-                            self.log_detailed_change('Divisions', 'Principle Contact Last Name Correction', f'Row {idx + 4}', 
-                                                   col, original_value, new_value, org_name)
-                            df.loc[idx, col] = new_value
-                        else:
-                            # Apply concatenation rule: Last Name + Organization Short Name
-                            if org_short_name_col and not pd.isna(df.loc[idx, org_short_name_col]):
-                                org_short_name = str(df.loc[idx, org_short_name_col]).strip()
-                                if org_short_name and org_short_name != '':
-                                    new_value = f"{str(original_value).strip()} {org_short_name}"
-                                    if new_value != str(original_value).strip():
-                                        org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
-                                        self.log_detailed_change('Divisions', 'Principle Contact Last Name Concatenation', f'Row {idx + 4}', 
-                                                               col, original_value, new_value, org_name)
-                                        df.loc[idx, col] = new_value
-        
+            else:
+                # Principle Contact names: fill empty ones with 'Admin', append the Organization Short Name to the rest
+                field_label = 'First Name' if role == 'first_name' else 'Last Name'
+                if org_short_name_col:
+                    short_names = ColumnValues(df[org_short_name_col])
+                    concatenate = ~values.blank & ~short_names.blank
+                else:
+                    concatenate = np.zeros(len(df), dtype=bool)
+                for idx in np.flatnonzero(values.blank | concatenate).tolist():
+                    if values.blank[idx]:
+                        changes[idx] = (f'Principle Contact {field_label} Correction', original_values[idx], 'Admin')
+                    else:
+                        new_value = f"{values.stripped.iat[idx]} {short_names.stripped.iat[idx]}"
+                        changes[idx] = (f'Principle Contact {field_label} Concatenation', original_values[idx], new_value)
+            
+            for idx, (change_type, original_value, new_value) in changes.items():
+                self.log_detailed_change('Divisions', change_type, f'Row {idx + 4}',
+                                       col, original_value, new_value, org_names[idx])
+            self.write_column_values(df, col, {idx: change[2] for idx, change in changes.items()})
+            if col == org_col and changes:
+                org_names = self.organization_labels(df, org_col)
+            self.profiler.detail(**{f'{role}_seconds': time.perf_counter() - step_start})
+        
+        if org_short_name_col:
+            # How the sheet scales against the organization size
+            self.profiler.detail(organizations=int(df[org_short_name_col].nunique()))
         return df
     
     def correct_human_resources(self, df, workbook=None, sheet_name=None, processing_options=None):
@@ -1025,63 +1002,33 @@ class ExcelCorrector:
         
         # If workbook is provided, analyze red cells in the original sheet
         if workbook and sheet_name:
-            original_sheet = workbook[sheet_name]
-            
-            # Find NIC and Email columns in the original sheet
-            header_row = 3  # Headers are in row 3
-            nic_col_idx = None
-            email_col_idx = None
-            
-            for col_idx in range(1, original_sheet.max_column + 1):
-                header_cell = original_sheet.cell(row=header_row, column=col_idx)
-                if header_cell.value:
-                    header_value = str(header_cell.value).lower()
-                    if 'nic' in header_value:
-                        nic_col_idx = col_idx
-                    elif 'email' in header_value:
-                        email_col_idx = col_idx
-            
-            # Analyze red cells and store their positions
-            if nic_col_idx or email_col_idx:
+            red_cells = self.get_red_cell_bitmap(workbook[sheet_name])
+            
+            # Store red cell information for the rows the DataFrame covers
+            if red_cells['nic_col_idx'] or red_cells['email_col_idx']:
                 data_start_row = 4  # Data starts from row 4
                 
-                for row_idx in range(data_start_row, original_sheet.max_row + 1):
-                    df_row_idx = row_idx - data_start_row  # Convert to DataFrame index
-                    
-                    if df_row_idx >= len(df):
-                        break
-                    
-                    nic_is_red = False
-                    email_is_red = False
-                    
-                    if nic_col_idx:
-                        nic_cell = original_sheet.cell(row=row_idx, column=nic_col_idx)
-                        nic_is_red = self.is_red_cell(nic_cell)
-                    
-                    if email_col_idx:
-                        email_cell = original_sheet.cell(row=row_idx, column=email_col_idx)
-                        email_is_red = self.is_red_cell(email_cell)
-                    
-                    # Store red cell information
+                for df_row_idx in range(min(len(red_cells['nic_red']), len(df))):
                     red_cell_info[df_row_idx] = {
-                        'nic_red': nic_is_red,
-                        'email_red': email_is_red,
-                        'excel_row': row_idx
+                        'nic_red': bool(red_cells['nic_red'][df_row_idx]),
+                        'email_red': bool(red_cells['email_red'][df_row_idx]),
+                        'excel_row': df_row_idx + data_start_row
                     }
         
         # Generate organization short names for dummy data
         org_short_names = []
-        org_col = None
-        for col in df.columns:
-            if 'organization' in col.lower() or 'company' in col.lower():
-                org_col = col
-                break
+        org_col = self.get_column_roles(df, 'organization_label')['org']
         
         if org_col:
             org_short_names = [self.generate_org_short_name(org) for org in df[org_col]]
         else:
             org_short_names = ['ORG'] * len(df)
         
+        # NIC and Email columns in the DataFrame
+        roles = self.get_column_roles(df, 'human_resources_contacts')
+        nic_col = roles['nic']
+        email_col = roles['email']
+        
         # Process each row with red cell awareness
         for idx in range(len(df)):
             if idx in red_cell_info:
@@ -1092,15 +1039,6 @@ class ExcelCorrector:
                 
                 org_name = org_short_names[idx] if idx < len(org_short_names) else 'Unknown'
                 
-                # Find NIC and Email columns in DataFrame
-                nic_col = None
-                email_col = None
-                for col in df.columns:
-                    if 'nic' in col.lower():
-                        nic_col = col
-                    elif 'email' in col.lower():
-                        email_col = col
-                
                 # Apply red cell logic
                 if nic_red and email_red:
                     # Both are red - set Activity to Update but don't change NIC/Email values
@@ -1126,16 +1064,14 @@ class ExcelCorrector:
                         df.loc[idx, email_col] = new_email
                         self.log_hr_red_cell_change('Email Red - Prefix', excel_row, org_name, original_email, new_email)
         
-        # Handle duplicates and empty fields for NIC and Email (keeping current logic)
-        if 'NIC' in df.columns or any('nic' in col.lower() for col in df.columns):
-            nic_col = next((col for col in df.columns if 'nic' in col.lower()), None)
-            if nic_col:
-                df = self.handle_duplicates_and_empty(df, nic_col, "DUMMY", org_short_names, is_email=False)
+        # Handle duplicates and empty fields for NIC and Email (first matching column of each)
+        nic_col = find_column_containing(tuple(df.columns), 'nic')
+        if nic_col:
+            df = self.handle_duplicates_and_empty(df, nic_col, "DUMMY", org_short_names, is_email=False)
         
-        if 'Email' in df.columns or any('email' in col.lower() for col in df.columns):
-            email_col = next((col for col in df.columns if 'email' in col.lower()), None)
-            if email_col:
-                df = self.handle_duplicates_and_empty(df, email_col, "DUMMY", org_short_names, is_email=True)
+        email_col = find_column_containing(tuple(df.columns), 'email')
+        if email_col:
+            df = self.handle_duplicates_and_empty(df, email_col, "DUMMY", org_short_names, is_email=True)
         
         # NEW VALIDATION LOGIC - Apply only if processing options allow
         if processing_options and 'human_resources' in processing_options:
@@ -1241,7 +1177,7 @@ class ExcelCorrector:
                     if pd.notna(original_value):
                         # Convert any existing boolean values back to text format
                         value_str = str(original_value).strip()
-                        print(f"  Row {idx + 4}: Original value '{original_value}' (type: {type(original_value)}) -> String: '{value_str}'")
+                        self.log_change_line(f"  Row {idx + 4}: Original value '{original_value}' (type: {type(original_value)}) -> String: '{value_str}'")
                         
                         # Handle both string and numeric boolean representations (including floats like 1.0, 0.0)
                         if (value_str in ['1', 'True', 'true', 'TRUE'] or 
@@ -1254,9 +1190,9 @@ class ExcelCorrector:
                                 self.log_detailed_change('Human Resources', 'Create User Account Text Conversion', f'Row {idx + 4}', 
                                                        col, original_value, new_value, org_name)
                                 df.loc[idx, col] = new_value
-                                print(f"    Converted '{original_value}' → '{new_value}'")
+                                self.log_change_line(f"    Converted '{original_value}' → '{new_value}'")
                             else:
-                                print(f"    Value '{original_value}' is already TRUE")
+                                self.log_change_line(f"    Value '{original_value}' is already TRUE")
                         elif (value_str in ['0', 'False', 'false', 'FALSE'] or 
                               original_value == 0 or original_value == 0.0 or 
                               value_str == '0.0'):
@@ -1267,20 +1203,21 @@ class ExcelCorrector:
                                 self.log_detailed_change('Human Resources', 'Create User Account Text Conversion', f'Row {idx + 4}', 
                                                        col, original_value, new_value, org_name)
                                 df.loc[idx, col] = new_value
-                                print(f"    Converted '{original_value}' → '{new_value}'")
+                                self.log_change_line(f"    Converted '{original_value}' → '{new_value}'")
                             else:
-                                print(f"    Value '{original_value}' is already FALSE")
+                                self.log_change_line(f"    Value '{original_value}' is already FALSE")
                         else:
-                            print(f"    Value '{value_str}' is already in correct format")
+                            self.log_change_line(f"    Value '{value_str}' is already in correct format")
                 
                 # Force the entire column to be string type to prevent pandas from converting back to boolean
                 print(f"🔧 Converting column '{col}' to string type to prevent boolean conversion")
                 df[col] = df[col].astype(str)
                 
                 # Double-check that all values are now strings
-                for idx in range(len(df)):
-                    final_value = df.loc[idx, col]
-                    print(f"  Row {idx + 4}: Final value '{final_value}' (type: {type(final_value)})")
+                if self.verbosity >= VERBOSITY_CHANGES:
+                    for idx in range(len(df)):
+                        final_value = df.loc[idx, col]
+                        self.log_change_line(f"  Row {idx + 4}: Final value '{final_value}' (type: {type(final_value)})")
         
         # Gender standardization - NEW: Fill empty Gender fields with "Male"
         for col in df.columns:
@@ -1352,106 +1289,70 @@ class ExcelCorrector:
         print("Correcting Vehicles...")
         
         # Get organization names for reporting
-        org_col = None
-        org_short_name_col = None
-        managed_by_col = None
+        roles = self.get_column_roles(df, 'vehicles')
+        org_col = roles['org']
+        org_short_name_col = roles['org_short_name']
+        managed_by_col = roles['managed_by']
         
-        for col in df.columns:
-            col_lower = col.lower()
-            if 'organization' in col_lower and 'short' not in col_lower:
-                org_col = col
-            elif 'organization' in col_lower and 'short' in col_lower:
-                org_short_name_col = col
-            elif 'managed by' in col_lower:
-                managed_by_col = col
-        
-        # Standard corrections with detailed tracking
+        # Standard corrections with detailed tracking: each rewrite is computed for the whole column
+        # and only the rows that differ from the new value are logged
         for col in df.columns:
             # Division corrections
             if 'division' in col.lower():
-                for idx in range(len(df)):
-                    original_value = df.loc[idx, col]
-                    if pd.notna(original_value) and str(original_value).strip() != 'Admin':
-                        org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
-                        self.log_detailed_change('Vehicles', 'Division Correction', f'Row {idx + 4}', 
-                                               col, original_value, 'Admin', org_name)
-                df[col] = 'Admin'
+                self.rewrite_vehicle_column(df, col, 'Admin', 'Division Correction', org_col)
             
             # Vehicle Type corrections
             elif 'vehicle' in col.lower() and 'type' in col.lower():
-                for idx in range(len(df)):
-                    original_value = df.loc[idx, col]
-                    if pd.notna(original_value) and str(original_value).strip() != 'TRUCK':
-                        org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
-                        self.log_detailed_change('Vehicles', 'Vehicle Type Correction', f'Row {idx + 4}', 
-                                               col, original_value, 'TRUCK', org_name)
-                df[col] = 'TRUCK'
+                self.rewrite_vehicle_column(df, col, 'TRUCK', 'Vehicle Type Correction', org_col)
             
             # Load Type corrections
             elif 'load' in col.lower() and 'type' in col.lower():
-                for idx in range(len(df)):
-                    original_value = df.loc[idx, col]
-                    if pd.notna(original_value) and str(original_value).strip() != 'LOADS':
-                        org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
-                        self.log_detailed_change('Vehicles', 'Load Type Correction', f'Row {idx + 4}', 
-                                               col, original_value, 'LOADS', org_name)
-                df[col] = 'LOADS'
+                self.rewrite_vehicle_column(df, col, 'LOADS', 'Load Type Correction', org_col)
             
             # Categories formatting (e.g., 20Ft, 40Ft)
             elif 'categor' in col.lower():
-                for idx in range(len(df)):
-                    original_value = df.loc[idx, col]
-                    if pd.notna(original_value):
-                        formatted_value = self.format_vehicle_category(str(original_value))
-                        if str(original_value).strip() != formatted_value:
-                            org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
-                            self.log_detailed_change('Vehicles', 'Category Formatting', f'Row {idx + 4}', 
-                                                   col, original_value, formatted_value, org_name)
-                            df.loc[idx, col] = formatted_value
+                text = df[col].map(str).astype(object)
+                formatted = self.format_vehicle_categories(text)
+                changed = df[col].notna().to_numpy(dtype=bool) & text.str.strip().ne(formatted).to_numpy(dtype=bool)
+                self.log_vehicle_changes(df, col, changed, formatted.tolist(), 'Category Formatting', org_col)
+                
+                if changed.any():
+                    values = df[col].astype(object).tolist()
+                    for idx, formatted_value in zip(np.flatnonzero(changed).tolist(), formatted[changed].tolist()):
+                        values[idx] = formatted_value
+                    df[col] = pd.Series(values, index=df.index, dtype=object)
             
             # Status corrections
             elif 'status' in col.lower() or col == 'Activity':
-                for idx in range(len(df)):
-                    original_value = df.loc[idx, col]
-                    if pd.notna(original_value) and str(original_value).strip() != 'Create':
-                        org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
-                        self.log_detailed_change('Vehicles', 'Status Correction', f'Row {idx + 4}', 
-                                               col, original_value, 'Create', org_name)
-                df[col] = 'Create'
+                self.rewrite_vehicle_column(df, col, 'Create', 'Status Correction', org_col)
         
         # Fill empty "Managed By" fields with NICs from HR data
         if managed_by_col and org_short_name_col and hr_data:
             print("Analyzing empty 'Managed By' fields for NIC matching...")
-            
-            for idx in range(len(df)):
-                # Skip END rows
-                if self.is_end_row(df, idx):
-                    continue
-                
-                original_managed_by = df.loc[idx, managed_by_col]
-                
-                # Check if Managed By is empty
-                if pd.isna(original_managed_by) or str(original_managed_by).strip() == '':
-                    target_org_short_name = df.loc[idx, org_short_name_col]
-                    
-                    if pd.notna(target_org_short_name) and str(target_org_short_name).strip():
-                        # Find matching NIC from HR data
-                        match_result = self.find_matching_nic_from_hr(str(target_org_short_name).strip(), hr_data)
-                        
-                        if match_result:
-                            org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
-                            
-                            # Update the Managed By field with the matched NIC
-                            df.loc[idx, managed_by_col] = match_result['nic']
-                            
-                            # Log the detailed change
-                            self.log_detailed_change('Vehicles', 'Managed By NIC Fill', f'Row {idx + 4}', 
-                                                   managed_by_col, 'Empty', match_result['nic'], org_name)
-                            
-                            print(f"Filled Managed By for row {idx + 4}: {match_result['nic']} ({match_result['name']}) - {match_result['reason']}")
+            df = self.fill_nics_from_hr(df, managed_by_col, org_short_name_col, org_col, hr_data,
+                                        'Vehicles', 'Managed By NIC Fill', 'Managed By')
         
         return df
     
+    def rewrite_vehicle_column(self, df, col, new_value, change_type, org_col):
+        """Set a whole Vehicles column to new_value, logging the non-empty cells that held something else"""
+        column = df[col]
+        changed = column.notna().to_numpy(dtype=bool) & column.map(str).astype(object).str.strip().ne(new_value).to_numpy(dtype=bool)
+        self.log_vehicle_changes(df, col, changed, None, change_type, org_col, new_value)
+        df[col] = new_value
+    
+    def log_vehicle_changes(self, df, col, changed, new_values, change_type, org_col, new_value=None):
+        """Log one Vehicles change record per changed row (new_values per row, or one new_value for all)"""
+        if not changed.any():
+            return
+        
+        original_values = df[col].tolist()
+        org_names = df[org_col].tolist() if org_col else None
+        for idx in np.flatnonzero(changed).tolist():
+            org_name = org_names[idx] if org_names is not None and not pd.isna(org_names[idx]) else f'Row {idx + 4}'
+            self.log_detailed_change('Vehicles', change_type, f'Row {idx + 4}', col, original_values[idx],
+                                     new_values[idx] if new_values is not None else new_value, org_name)
+    
     def handle_location_reference_id(self, df, column_name, org_short_names):
         """Handle empty and duplicate Location Reference IDs"""
         # Convert column to object type to handle mixed data types
@@ -1495,28 +1396,15 @@ class ExcelCorrector:
         print("Correcting Locations...")
         
         # Get organization names for reporting
-        org_col = None
-        org_short_name_col = None
-        principle_contact_nic_col = None
-        
-        for col in df.columns:
-            col_lower = col.lower()
-            if 'organization' in col_lower and 'short' not in col_lower:
-                org_col = col
-            elif 'organization' in col_lower and 'short' in col_lower:
-                org_short_name_col = col
-            elif 'principle' in col_lower and 'contact' in col_lower and 'nic' in col_lower:
-                principle_contact_nic_col = col
+        roles = self.get_column_roles(df, 'locations')
+        org_col = roles['org']
+        org_short_name_col = roles['org_short_name']
+        principle_contact_nic_col = roles['principle_contact_nic']
         
         # Handle Location Reference IDs
-        location_ref_id_col = None
-        location_name_col = None
-        
-        for col in df.columns:
-            if 'location reference id' in col.lower():
-                location_ref_id_col = col
-            elif 'location name' in col.lower():
-                location_name_col = col
+        roles = self.get_column_roles(df, 'location_ids')
+        location_ref_id_col = roles['location_ref_id']
+        location_name_col = roles['location_name']
         
         location_counter = 1
         duplicate_counter = 1
@@ -1578,33 +1466,50 @@ class ExcelCorrector:
         # Fill empty "Principle Contact NIC" fields with NICs from HR data
         if principle_contact_nic_col and org_short_name_col and hr_data:
             print("Analyzing empty 'Principle Contact NIC' fields for NIC matching...")
+            df = self.fill_nics_from_hr(df, principle_contact_nic_col, org_short_name_col, org_col, hr_data,
+                                        'Locations', 'Principle Contact NIC Fill', 'Principle Contact NIC')
+        
+        return df
+    
+    def fill_nics_from_hr(self, df, target_col, org_short_name_col, org_col, hr_nic_index, sheet_type, change_type, field_label):
+        """Fill empty cells of target_col with the HR NIC resolved for each row's organization short name"""
+        end_rows = self.get_end_row_mask(df)
+        targets = df[target_col].tolist()
+        org_short_names = df[org_short_name_col].tolist()
+        org_names = df[org_col].tolist() if org_col else None
+        
+        filled = {}
+        for idx in range(len(df)):
+            # Skip END rows
+            if end_rows[idx]:
+                continue
             
-            for idx in range(len(df)):
-                # Skip END rows
-                if self.is_end_row(df, idx):
-                    continue
-                
-                original_principle_contact_nic = df.loc[idx, principle_contact_nic_col]
+            # Only empty cells are filled
+            original_value = targets[idx]
+            if not (pd.isna(original_value) or str(original_value).strip() == ''):
+                continue
+            
+            target_org_short_name = org_short_names[idx]
+            if pd.notna(target_org_short_name) and str(target_org_short_name).strip():
+                # Constant-time lookup of the organization's resolved NIC
+                match_result = hr_nic_index.get(str(target_org_short_name).strip())
                 
-                # Check if Principle Contact NIC is empty
-                if pd.isna(original_principle_contact_nic) or str(original_principle_contact_nic).strip() == '':
-                    target_org_short_name = df.loc[idx, org_short_name_col]
+                if match_result:
+                    org_name = org_names[idx] if org_names is not None and not pd.isna(org_names[idx]) else f'Row {idx + 4}'
+                    filled[idx] = match_result['nic']
                     
-                    if pd.notna(target_org_short_name) and str(target_org_short_name).strip():
-                        # Find matching NIC from HR data
-                        match_result = self.find_matching_nic_from_hr(str(target_org_short_name).strip(), hr_data)
-                        
-                        if match_result:
-                            org_name = df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else f'Row {idx + 4}'
-                            
-                            # Update the Principle Contact NIC field with the matched NIC
-                            df.loc[idx, principle_contact_nic_col] = match_result['nic']
-                            
-                            # Log the detailed change
-                            self.log_detailed_change('Locations', 'Principle Contact NIC Fill', f'Row {idx + 4}', 
-                                                   principle_contact_nic_col, 'Empty', match_result['nic'], org_name)
-                            
-                            print(f"Filled Principle Contact NIC for row {idx + 4}: {match_result['nic']} ({match_result['name']}) - {match_result['reason']}")
+                    # Log the detailed change
+                    self.log_detailed_change(sheet_type, change_type, f'Row {idx + 4}', 
+                                           target_col, 'Empty', match_result['nic'], org_name)
+                    
+                    self.log_change_line(f"Filled {field_label} for row {idx + 4}: {match_result['nic']} ({match_result['name']}) - {match_result['reason']}")
+        
+        # Write the filled NICs back in one column assignment
+        if filled:
+            values = df[target_col].astype(object).tolist()
+            for idx, nic in filled.items():
+                values[idx] = nic
+            df[target_col] = pd.Series(values, index=df.index, dtype=object)
         
         return df
     
@@ -1626,16 +1531,156 @@ class ExcelCorrector:
         
         return df
     
-    def correct_excel_file(self, input_file_path, output_file_path, processing_options=None):
+    def correct_sheet(self, sheet_type, df, workbook, sheet_name, processing_options=None, hr_data=None):
+        """Apply one sheet type's corrections ('other' sheets only get their status columns set to Create)"""
+        if sheet_type == 'organization':
+            return self.correct_organization_details(df, processing_options)
+        elif sheet_type == 'divisions':
+            return self.correct_divisions(df, processing_options)
+        elif sheet_type == 'human':
+            return self.correct_human_resources(df, workbook, sheet_name, processing_options)
+        elif sheet_type == 'vehicles':
+            return self.correct_vehicles(df, hr_data, processing_options)
+        elif sheet_type == 'locations':
+            return self.correct_locations(df, hr_data, processing_options)
+        
+        # For other sheets, just change status to Create
+        for col in df.columns:
+            if 'status' in col.lower() or col == 'Activity':
+                df[col] = 'Create'
+        return df
+    
+    def correct_sheet_cached(self, correction_cache, sheet_type, df, workbook, sheet_name, processing_options=None, hr_data=None):
+        """correct_sheet, reusing the cached corrections of rows whose content (and dependencies) did not change"""
+        if not len(df.columns):
+            return self.correct_sheet(sheet_type, df, workbook, sheet_name, processing_options, hr_data)
+        
+        key = f"{sheet_type}:{sheet_name}"
+        layout = sheet_layout(sheet_type, df, processing_options)
+        hashes = row_hashes(frame_rows(df), self.row_dependency_keys(sheet_type, df, workbook, sheet_name, hr_data))
+        entry = correction_cache.get(key, layout)
+        
+        # Rows are compared by position: row labels in the change records depend on it
+        if entry is not None:
+            cached_hashes = entry['row_hashes']
+            stale = [position for position, row_hash in enumerate(hashes)
+                     if position >= len(cached_hashes) or cached_hashes[position] != row_hash]
+        else:
+            stale = list(range(len(hashes)))
+        
+        if entry is not None and not stale and len(hashes) == len(entry['row_hashes']):
+            # Nothing changed: the cached sheet is the result
+            df = rows_to_frame(list(df.columns), entry['dtypes'], entry['rows'])
+            records = entry['records']
+            correction_cache.stats['sheets_reused'] += 1
+            correction_cache.stats['rows_reused'] += len(hashes)
+        
+        elif entry is not None and sheet_type in ROW_LOCAL_SHEET_TYPES and len(stale) < len(hashes):
+            # Correct only the new and changed rows, then splice them into the cached rows
+            partial = df.iloc[stale].reset_index(drop=True)
+            partial, partial_records = self.collect_change_records(
+                lambda: self.correct_sheet(sheet_type, partial, workbook, sheet_name, processing_options, hr_data))
+            
+            stale_set = set(stale)
+            corrected_rows = dict(zip(stale, frame_rows(partial)))
+            merged_rows = [corrected_rows[position] if position in stale_set else entry['rows'][position]
+                           for position in range(len(hashes))]
+            
+            # A column keeps its dtype when the cached and re-corrected rows agree on it
+            dtypes = [cached if cached == corrected else np.dtype(object)
+                      for cached, corrected in zip(entry['dtypes'], partial.dtypes)]
+            df = rows_to_frame(list(df.columns), dtypes, merged_rows)
+            
+            order = record_order(list(df.columns))
+            records = {}
+            for store_name in set(entry['records']) | set(partial_records):
+                kept = [record for record in entry['records'].get(store_name, [])
+                        if record_row(record) < len(hashes) and record_row(record) not in stale_set]
+                moved = [move_record(record, stale[record_row(record)]) for record in partial_records.get(store_name, [])]
+                records[store_name] = sorted(kept + moved, key=order)
+            
+            correction_cache.stats['rows_reused'] += len(hashes) - len(stale)
+            correction_cache.stats['rows_corrected'] += len(stale)
+        
+        else:
+            df, records = self.collect_change_records(
+                lambda: self.correct_sheet(sheet_type, df, workbook, sheet_name, processing_options, hr_data))
+            correction_cache.stats['rows_corrected'] += len(hashes)
+        
+        self.replay_change_records(records)
+        correction_cache.put(key, {
+            'layout': layout,
+            'row_hashes': hashes,
+            'dtypes': list(df.dtypes),
+            'rows': frame_rows(df),
+            'records': records
+        })
+        return df
+    
+    def row_dependency_keys(self, sheet_type, df, workbook, sheet_name, hr_data=None):
+        """What a row's correction reads from outside the row: its red NIC/Email fills on the HR sheet,
+        its organization's HR NIC match on Vehicles and Locations (None when nothing is read)"""
+        if sheet_type == 'human' and workbook is not None and sheet_name:
+            red_cells = self.get_red_cell_bitmap(workbook[sheet_name])
+            flags = list(zip(red_cells['nic_red'].tolist(), red_cells['email_red'].tolist()))
+            return flags[:len(df)] + [None] * (len(df) - len(flags))
+        
+        if sheet_type in ('vehicles', 'locations') and hr_data:
+            org_short_name_col = self.get_column_roles(df, sheet_type)['org_short_name']
+            if org_short_name_col:
+                return [hr_data.get(str(value).strip()) if pd.notna(value) else None for value in df[org_short_name_col]]
+        return None
+    
+    def change_stores(self):
+        """Every change store by name: the four report stores and the detailed store of each sheet type"""
+        stores = {name: getattr(self, name) for name in REPORT_CHANGE_STORES}
+        stores.update(self.detailed_changes)
+        return stores
+    
+    def collect_change_records(self, correct):
+        """Run correct() with every change store swapped for a plain list; return (result, {store: records})"""
+        saved_stores = self.change_stores()
+        for name in REPORT_CHANGE_STORES:
+            setattr(self, name, [])
+        self.detailed_changes = {sheet_key: [] for sheet_key in self.detailed_changes}
+        
+        try:
+            result = correct()
+            records = {name: store for name, store in self.change_stores().items() if store}
+        finally:
+            for name in REPORT_CHANGE_STORES:
+                setattr(self, name, saved_stores[name])
+            self.detailed_changes = {sheet_key: saved_stores[sheet_key] for sheet_key in self.detailed_changes}
+        
+        return result, records
+    
+    def replay_change_records(self, records):
+        """Append collected or cached change records to the live change stores"""
+        stores = self.change_stores()
+        for name, store_records in records.items():
+            for change_record in store_records:
+                stores[name].append(change_record)
+    
+    def correct_excel_file(self, input_file_path, output_file_path, processing_options=None, correction_cache=None):
         """Main method to correct the Excel file while preserving formatting"""
         print(f"Starting correction of: {input_file_path}")
         
+        # Macro-enabled files keep their macros in the saved copy
+        keep_vba = input_file_path.lower().endswith('.xlsm')
+        
         # Reset change tracking for this file
         self.reset_change_tracking()
+        self.profiler.begin_run()
+        self.progress.begin_run()
+        if correction_cache is not None:
+            correction_cache.begin_run()
         
         try:
-            # Load the original workbook with formatting preserved
-            workbook = load_workbook(input_file_path, data_only=False)
+            # Load the original workbook with formatting preserved (single parse for sheets and DataFrames)
+            with self.profiler.stage('load_workbook_with_dataframes') as stage:
+                workbook, dataframes = self.load_workbook_with_dataframes(input_file_path, keep_vba=keep_vba)
+                total_rows = stage['rows'] = sum(len(df) for df in dataframes.values())
+            self.progress.begin_run(len(workbook.sheetnames))
             
             # Track HR data for NIC matching
             hr_data = None
@@ -1646,15 +1691,16 @@ class ExcelCorrector:
             # First pass: Read all sheets and store data
             for sheet_index, sheet_name in enumerate(workbook.sheetnames, 1):
                 sheet = workbook[sheet_name]
-                df = pd.read_excel(input_file_path, sheet_name=sheet_name, header=2)
+                df = dataframes[sheet_name]
                 sheets_data[sheet_name] = {
                     'sheet': sheet,
                     'df': df,
                     'index': sheet_index
                 }
             
-            # Process sheets in specific order: Organization → Divisions → Human Resources → Vehicles → Locations
-            processing_order = ['organization', 'divisions', 'human', 'vehicles', 'locations']
+            # Process sheets in specific order: Organization → Divisions → Human Resources → Vehicles → Locations,
+            # then any remaining sheets that don't match our main types
+            processing_order = ['organization', 'divisions', 'human', 'vehicles', 'locations', 'other']
             
             for sheet_type in processing_order:
                 for sheet_name, sheet_data in sheets_data.items():
@@ -1676,56 +1722,51 @@ class ExcelCorrector:
                         should_process = True
                     elif sheet_type == 'locations' and 'location' in name_lower:
                         should_process = True
+                    elif sheet_type == 'other' and not any(key in name_lower for key in ['organization', 'org', 'division', 'human', 'hr', 'resource', 'vehicle', 'location']):
+                        should_process = True
                     
                     if should_process:
                         print(f"Processing sheet: {sheet_index} - {sheet_name}")
                         
                         # Apply corrections based on sheet type and processing options
-                        if sheet_type == 'organization':
-                            df = self.correct_organization_details(df, processing_options)
-                        elif sheet_type == 'divisions':
-                            df = self.correct_divisions(df, processing_options)
-                        elif sheet_type == 'human':
-                            df = self.correct_human_resources(df, workbook, sheet_name, processing_options)
-                            # Extract HR data for NIC matching after processing
-                            hr_data = self.extract_hr_data_for_matching(df)
-                        elif sheet_type == 'vehicles':
-                            df = self.correct_vehicles(df, hr_data, processing_options)
-                        elif sheet_type == 'locations':
-                            df = self.correct_locations(df, hr_data, processing_options)
-                        
-                        # Add END marker if needed
-                        df = self.add_end_marker(df)
+                        with self.profiler.stage(CORRECTION_STAGES[sheet_type], sheet_name, len(df)):
+                            if correction_cache is not None:
+                                df = self.correct_sheet_cached(correction_cache, sheet_type, df, workbook, sheet_name,
+                                                               processing_options, hr_data)
+                            else:
+                                df = self.correct_sheet(sheet_type, df, workbook, sheet_name, processing_options, hr_data)
+                            
+                            if sheet_type == 'human':
+                                # Extract HR data for NIC matching after processing
+                                hr_data = self.extract_hr_data_for_matching(df)
+                            
+                            # Add END marker if needed
+                            df = self.add_end_marker(df)
+                            sheet_data['df'] = df
                         
                         # Update the sheet with corrected data while preserving formatting
-                        self.update_sheet_with_preserved_formatting(sheet, df)
-            
-            # Process any remaining sheets that don't match our main types
-            for sheet_name, sheet_data in sheets_data.items():
-                name_lower = sheet_name.lower()
-                if not any(sheet_type in name_lower for sheet_type in ['organization', 'org', 'division', 'human', 'hr', 'resource', 'vehicle', 'location']):
-                    sheet = sheet_data['sheet']
-                    df = sheet_data['df']
-                    sheet_index = sheet_data['index']
-                    
-                    print(f"Processing sheet: {sheet_index} - {sheet_name}")
-                    
-                    # For other sheets, just change status to Create
-                    for col in df.columns:
-                        if 'status' in col.lower() or col == 'Activity':
-                            df[col] = 'Create'
-                    
-                    # Add END marker if needed
-                    df = self.add_end_marker(df)
-                    
-                    # Update the sheet with corrected data while preserving formatting
-                    self.update_sheet_with_preserved_formatting(sheet, df)
-            
-            # Highlight errors for fields that weren't processed (if processing options provided)
+                        with self.profiler.stage('update_sheet_with_preserved_formatting', sheet_name, len(df)):
+                            self.update_sheet_with_preserved_formatting(sheet, df)
+                        self.progress.sheet_done()
+            
+            if correction_cache is not None:
+                correction_cache.keep_only({f"{sheet_type}:{sheet_name}" for sheet_type in processing_order
+                                            for sheet_name in sheets_data})
+                with self.profiler.stage('correction_cache.save', rows=total_rows):
+                    correction_cache.save()
+                stats = correction_cache.stats
+                print(f"♻️ Correction cache: {stats['rows_reused']} rows reused ({stats['sheets_reused']} whole sheets), "
+                      f"{stats['rows_corrected']} rows corrected")
+            
+            # Highlight errors for fields that weren't processed (if processing options provided);
+            # the sheets were corrected in place, so validate them afresh
             if processing_options:
-                self.highlight_unprocessed_errors(workbook, sheets_data, processing_options)
+                self.sheet_validators = {}
+                with self.profiler.stage('highlight_unprocessed_errors', rows=total_rows):
+                    self.highlight_unprocessed_errors(workbook, sheets_data, processing_options)
                 # Apply cell coloring for processed cells
-                self.apply_processed_cell_coloring(workbook, sheets_data, processing_options)
+                with self.profiler.stage('apply_processed_cell_coloring', rows=total_rows):
+                    self.apply_processed_cell_coloring(workbook, sheets_data, processing_options)
             
             # Ensure output directory exists
             output_dir = os.path.dirname(output_file_path)
@@ -1733,16 +1774,29 @@ class ExcelCorrector:
                 os.makedirs(output_dir, exist_ok=True)
             
             # Save the workbook with preserved formatting
-            workbook.save(output_file_path)
+            with self.profiler.stage('workbook.save', rows=total_rows):
+                workbook.save(output_file_path)
             print(f"Corrected file saved to: {output_file_path}")
             
-            # Generate and display comprehensive report
-            comprehensive_report = self.generate_comprehensive_report()
-            print(comprehensive_report)
+            self.change_sink.flush()
+            
+            # Display the full report only at per-change verbosity, otherwise a short summary
+            if self.verbosity >= VERBOSITY_CHANGES:
+                self.write_change_report(sys.stdout)
+                print()
+            elif self.verbosity >= VERBOSITY_SUMMARY:
+                print(self.generate_change_summary())
             
+        except CorrectionCancelled:
+            # A cancelled run leaves no partial change log behind
+            print("Processing cancelled")
+            self.change_sink.discard()
+            raise
         except Exception as e:
             print(f"Error processing file: {str(e)}")
             raise
+        finally:
+            self.profiler.end_run()
     
     def update_sheet_with_preserved_formatting(self, sheet, df):
         """Update sheet data while preserving all original formatting"""
@@ -1751,78 +1805,39 @@ class ExcelCorrector:
         
         # Get column mapping between DataFrame and Excel sheet
         header_row = 3  # Row 3 contains the actual column headers
-        col_mapping = {}
-        
-        # Map DataFrame columns to Excel columns
-        for excel_col_idx in range(1, sheet.max_column + 1):
-            header_cell = sheet.cell(row=header_row, column=excel_col_idx)
-            if header_cell.value and str(header_cell.value).strip():
-                header_name = str(header_cell.value).strip()
-                if header_name in df.columns:
-                    col_mapping[header_name] = excel_col_idx
-        
-        # Store original red cell formatting for HR sheets (simplified approach)
-        red_cells_positions = set()
-        is_hr_sheet = 'human' in sheet.title.lower() or 'resource' in sheet.title.lower()
-        
-        if is_hr_sheet:
-            # Just track which cells are red, don't store complex formatting objects
-            nic_col_idx = None
-            email_col_idx = None
-            
-            for col_name, excel_col_idx in col_mapping.items():
-                if 'nic' in col_name.lower():
-                    nic_col_idx = excel_col_idx
-                elif 'email' in col_name.lower():
-                    email_col_idx = excel_col_idx
-            
-            # Store positions of red cells only
-            for row_idx in range(data_start_row, sheet.max_row + 1):
-                if nic_col_idx:
-                    nic_cell = sheet.cell(row=row_idx, column=nic_col_idx)
-                    if self.is_red_cell(nic_cell):
-                        red_cells_positions.add((row_idx, nic_col_idx))
-                
-                if email_col_idx:
-                    email_cell = sheet.cell(row=row_idx, column=email_col_idx)
-                    if self.is_red_cell(email_cell):
-                        red_cells_positions.add((row_idx, email_col_idx))
-        
-        # Update existing data rows
-        for row_idx, (df_idx, row_data) in enumerate(df.iterrows()):
-            excel_row = data_start_row + row_idx
-            
-            # Make sure we don't exceed the existing data range unnecessarily
-            if excel_row > sheet.max_row + 50:  # Allow some buffer for new data
-                break
-                
-            for col_name, value in row_data.items():
-                if col_name in col_mapping:
-                    excel_col = col_mapping[col_name]
-                    cell = sheet.cell(row=excel_row, column=excel_col)
-                    
-                    # Special handling for Create a User Account column to ensure text values
-                    if 'create' in col_name.lower() and 'user' in col_name.lower() and 'account' in col_name.lower():
-                        if pd.notna(value):
-                            # Force the value to be written as text to prevent Excel from converting to boolean
-                            cell_value = str(value).strip()
-                            if cell_value in ['1', 'True', 'true', '1.0']:
-                                cell_value = "TRUE"
-                            elif cell_value in ['0', 'False', 'false', '0.0']:
-                                cell_value = "FALSE"
-                            cell.value = cell_value
-                            print(f"🔧 Excel cell {sheet.title} Row {excel_row} Col {excel_col}: Written as text '{cell_value}'")
-                        else:
-                            cell.value = None
-                    else:
-                        # Update cell value only (let Excel preserve its own formatting)
-                        if pd.notna(value):
-                            cell.value = value
-                        else:
-                            cell.value = None
-                    
-                    # For red cells in HR sheets, we keep the original formatting intact
-                    # since we're not recreating the workbook, the red formatting should remain
+        header_values = [sheet.cell(row=header_row, column=excel_col_idx).value
+                         for excel_col_idx in range(1, sheet.max_column + 1)]
+        col_mapping = map_header_columns(header_values, df.columns)
+        
+        # Red HR cells keep their fill because only values are written below; the red cells
+        # themselves are read once per sheet by get_red_cell_bitmap (correct_human_resources)
+        column_plan, rows = self.plan_sheet_writes(df, col_mapping)
+        
+        # Update existing data rows one column block at a time. Writing a cell extends sheet.max_row,
+        # so every DataFrame row is written whenever at least one column is mapped.
+        text_cells_written = 0
+        for column_number, (df_col_idx, excel_col, is_user_account) in enumerate(column_plan):
+            # Each column block is a cancellation checkpoint; rows done counts the share of blocks written
+            self.progress.update('update_sheet_with_preserved_formatting', sheet.title,
+                                 len(rows) * column_number // len(column_plan), len(rows))
+            for row_idx, row_values in enumerate(rows):
+                # Update cell value only (let Excel preserve its own formatting)
+                cell_value = export_cell_value(row_values[df_col_idx], is_user_account)
+                sheet.cell(row=data_start_row + row_idx, column=excel_col).value = cell_value
+                if is_user_account and cell_value is not None:
+                    text_cells_written += 1
+        
+        if text_cells_written:
+            print(f"🔧 {sheet.title}: {text_cells_written} 'Create a User Account' cells written as text")
+        
+        # Formula cells that were written their own cached value get the formula back
+        formulas = self.sheet_formulas.get(id(sheet))
+        if formulas is not None and formulas[0] is sheet:
+            user_account_columns = {excel_col for _, excel_col, is_user_account in column_plan if is_user_account}
+            for (row, col), (formula, cached_value) in formulas[1].items():
+                cell = sheet.cell(row=row, column=col)
+                if cell.value == export_cell_value(cached_value, col in user_account_columns):
+                    cell.value = formula
         
         # Handle new END column if it was added
         if 'END' in df.columns and 'END' not in col_mapping:
@@ -1855,6 +1870,22 @@ class ExcelCorrector:
         
         print(f"✅ Updated {sheet.title} with corrected data while preserving formatting")
 
+    def plan_sheet_writes(self, df, col_mapping):
+        """Resolve the write plan once: [(DataFrame position, Excel column, is "Create a User Account")] and the
+        DataFrame as plain row lists (the same values iterrows would yield)"""
+        column_plan = []
+        for df_col_idx, col_name in enumerate(df.columns):
+            if col_name in col_mapping:
+                is_user_account = 'create' in col_name.lower() and 'user' in col_name.lower() and 'account' in col_name.lower()
+                column_plan.append((df_col_idx, col_mapping[col_name], is_user_account))
+        
+        values = df.values
+        if values.dtype.kind in 'mM':
+            rows = [list(row_data) for _, row_data in df.iterrows()]
+        else:
+            rows = values.tolist()
+        return column_plan, rows
+    
     def log_detailed_change(self, sheet_type, change_type, row_info, field_name, original_value, new_value, organization=None):
         """Log detailed changes for visual reporting"""
         change_record = {
@@ -1870,7 +1901,7 @@ class ExcelCorrector:
         if sheet_key in self.detailed_changes:
             self.detailed_changes[sheet_key].append(change_record)
         
-        print(f"📝 {sheet_type} - {change_type}: {field_name} | '{original_value}' → '{new_value}'")
+        self.log_change_line(f"📝 {sheet_type} - {change_type}: {field_name} | '{original_value}' → '{new_value}'")
 
     def find_matching_nic_from_hr(self, target_org_short_name, hr_data):
         """Find matching NIC from HR data based on organization and designation priority"""
@@ -1882,6 +1913,10 @@ class ExcelCorrector:
             if hr_org_short_name == target_org_short_name:
                 matching_records.append(hr_record)
         
+        return self.select_nic_match(target_org_short_name, matching_records)
+    
+    def select_nic_match(self, target_org_short_name, matching_records):
+        """Pick the NIC for one organization's HR records: Supervisor, then Manager, then first available"""
         if not matching_records:
             return None
         
@@ -1915,616 +1950,615 @@ class ExcelCorrector:
         return None
     
     def extract_hr_data_for_matching(self, df):
-        """Extract HR data for NIC matching purposes"""
+        """Extract HR data for NIC matching: {org short name: resolved NIC match} (see build_hr_nic_index)"""
         hr_data = []
         
         # Find relevant columns
-        org_col = None
-        nic_col = None
-        first_name_col = None
-        last_name_col = None
-        designation_col = None
+        roles = self.get_column_roles(df, 'human_resources_matching')
+        org_col = roles['org_short_name']
+        nic_col = roles['nic']
+        first_name_col = roles['first_name']
+        last_name_col = roles['last_name']
+        designation_col = roles['designation']
         
-        for col in df.columns:
-            col_lower = col.lower()
-            if 'organization' in col_lower and 'short' in col_lower:
-                org_col = col
-            elif 'nic' in col_lower:
-                nic_col = col
-            elif 'first name' in col_lower:
-                first_name_col = col
-            elif 'last name' in col_lower:
-                last_name_col = col
-            elif 'designation' in col_lower:
-                designation_col = col
+        end_rows = self.get_end_row_mask(df)
+        
+        # Read each column once; missing columns and empty cells become ''
+        fields = {'org_short_name': org_col, 'nic': nic_col, 'first_name': first_name_col,
+                  'last_name': last_name_col, 'designation': designation_col}
+        columns = {field: ['' if pd.isna(value) else value for value in df[col].tolist()] if col else None
+                   for field, col in fields.items()}
         
         # Extract data
         for idx in range(len(df)):
             # Skip END rows
-            if self.is_end_row(df, idx):
+            if end_rows[idx]:
                 continue
                 
-            record = {
-                'org_short_name': df.loc[idx, org_col] if org_col and not pd.isna(df.loc[idx, org_col]) else '',
-                'nic': df.loc[idx, nic_col] if nic_col and not pd.isna(df.loc[idx, nic_col]) else '',
-                'first_name': df.loc[idx, first_name_col] if first_name_col and not pd.isna(df.loc[idx, first_name_col]) else '',
-                'last_name': df.loc[idx, last_name_col] if last_name_col and not pd.isna(df.loc[idx, last_name_col]) else '',
-                'designation': df.loc[idx, designation_col] if designation_col and not pd.isna(df.loc[idx, designation_col]) else ''
-            }
+            record = {field: values[idx] if values is not None else '' for field, values in columns.items()}
             
             # Only add records with valid org short name
             if record['org_short_name']:
                 hr_data.append(record)
         
-        return hr_data
+        return self.build_hr_nic_index(hr_data)
+    
+    def build_hr_nic_index(self, hr_data):
+        """Group HR records by org short name and resolve each organization's NIC match once"""
+        records_by_org = {}
+        for record in hr_data:
+            records_by_org.setdefault(record['org_short_name'], []).append(record)
+        
+        hr_nic_index = {}
+        for org_short_name, records in records_by_org.items():
+            match_result = self.select_nic_match(org_short_name, records)
+            if match_result:
+                hr_nic_index[org_short_name] = match_result
+        return hr_nic_index
 
-    def check_issues_only(self, input_file_path, output_directory):
-        """Check for issues in the file without fixing them, highlight issues, and generate report"""
+    def check_issues_only(self, input_file_path, output_directory, parallel=False, max_workers=None, base_name=None):
+        """Check for issues in the file without fixing them, highlight issues, and generate report
+        (base_name overrides the input file name at the start of the output file name)"""
         print(f"Starting issue analysis of: {input_file_path}")
         
         # Reset issue tracking
         self.issues_found = []
+        self.header_indexes = {}
+        self.pending_issue_cells = {}
+        self.change_sink.begin_run()
+        self.profiler.begin_run()
+        self.progress.begin_run()
         
         try:
             # Create error file directory
             error_dir = os.path.join(output_directory, "Error file")
             os.makedirs(error_dir, exist_ok=True)
             
-            # Load the workbook
-            workbook = load_workbook(input_file_path, data_only=False)
+            # Load the workbook and its sheet DataFrames in a single parse
+            with self.profiler.stage('load_workbook_with_dataframes') as stage:
+                workbook, dataframes = self.load_workbook_with_dataframes(input_file_path)
+                total_rows = stage['rows'] = sum(len(df) for df in dataframes.values())
             
             # Generate output filename
-            base_name = os.path.splitext(os.path.basename(input_file_path))[0]
+            base_name = base_name or os.path.splitext(os.path.basename(input_file_path))[0]
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             error_file_name = f"{base_name}_issues_highlighted_{timestamp}.xlsx"
             error_file_path = os.path.join(error_dir, error_file_name)
             
-            # Process each sheet and identify issues
+            # Pick the analyzer for each sheet
+            sheet_jobs = []
             for sheet_index, sheet_name in enumerate(workbook.sheetnames, 1):
                 print(f"Analyzing sheet: {sheet_index} - {sheet_name}")
-                
-                sheet = workbook[sheet_name]
-                df = pd.read_excel(input_file_path, sheet_name=sheet_name, header=2)
-                
-                # Analyze issues based on sheet type
-                if 'organization' in sheet_name.lower() or 'org' in sheet_name.lower():
-                    self.analyze_organization_issues(df, sheet, 'Organization Details')
-                elif 'division' in sheet_name.lower():
-                    self.analyze_divisions_issues(df, sheet, 'Divisions')
-                elif 'human' in sheet_name.lower() or 'hr' in sheet_name.lower() or 'resource' in sheet_name.lower():
-                    self.analyze_human_resources_issues(df, sheet, 'Human Resources')
-                elif 'vehicle' in sheet_name.lower():
-                    self.analyze_vehicles_issues(df, sheet, 'Vehicles')
-                elif 'location' in sheet_name.lower():
-                    self.analyze_locations_issues(df, sheet, 'Locations')
-            
-            # Save the workbook with highlighted issues
-            workbook.save(error_file_path)
+                analyzer = self.get_issue_analyzer(sheet_name)
+                if analyzer:
+                    sheet_jobs.append((sheet_name,) + analyzer)
+            
+            # Identify issues, one process per sheet when running in parallel
+            self.progress.begin_run(len(sheet_jobs))
+            if parallel and len(sheet_jobs) > 1:
+                self.analyze_sheets_in_parallel(workbook, dataframes, sheet_jobs, max_workers)
+            else:
+                self.analyze_sheets(workbook, dataframes, sheet_jobs)
+            
+            # Highlight all issue cells in one pass, then save the workbook
+            with self.profiler.stage('apply_issue_highlights', rows=total_rows):
+                highlighted_cells = self.apply_issue_highlights(workbook)
+            print(f"Highlighted {highlighted_cells} cells with issues")
+            with self.profiler.stage('workbook.save', rows=total_rows):
+                workbook.save(error_file_path)
             print(f"Issues file saved to: {error_file_path}")
             
             # Generate detailed issues report
-            issues_report = self.generate_issues_report()
+            with self.profiler.stage('generate_issues_report', rows=total_rows):
+                issues_report = self.generate_issues_report()
             
             return error_file_path, issues_report
             
+        except CorrectionCancelled:
+            print("Issue analysis cancelled")
+            self.change_sink.discard()
+            raise
         except Exception as e:
             print(f"Error during issue analysis: {str(e)}")
             raise
+        finally:
+            self.profiler.end_run()
     
-    def analyze_organization_issues(self, df, sheet, sheet_type):
-        """Analyze Organization Details sheet for issues with enhanced validation"""
-        data_start_row = 4  # Data starts from row 4 (1-indexed)
+    def check_issues_streaming(self, input_file_path, output_directory, output_format='xlsx', batch_size=DEFAULT_BATCH_SIZE,
+                               base_name=None):
+        """Check for issues reading the file in row batches, so memory is bounded by one batch, not the workbook
+        (base_name overrides the input file name at the start of the output file name)"""
+        print(f"Starting streaming issue analysis of: {input_file_path}")
         
-        # Find relevant columns
-        org_name_col = None
-        org_short_name_col = None
-        operations_col = None
-        status_col = None
-        verticals_col = None
-        country_col = None
-        state_col = None
-        principle_contact_first_name_col = None
-        principle_contact_last_name_col = None
-        address_line_col = None
-        city_col = None
+        # Reset issue tracking
+        self.issues_found = []
+        self.header_indexes = {}
+        self.pending_issue_cells = {}
+        self.end_row_masks = {}
+        self.sheet_validators = {}
+        self.change_sink.begin_run()
+        self.profiler.begin_run()
+        self.progress.begin_run()
         
-        for col in df.columns:
-            col_lower = col.lower()
-            if 'organization' in col_lower and 'name' in col_lower and 'short' not in col_lower:
-                org_name_col = col
-            elif 'organization' in col_lower and 'short' in col_lower:
-                org_short_name_col = col
-            elif 'operation' in col_lower:
-                operations_col = col
-            elif 'status' in col_lower:
-                status_col = col
-            elif 'vertical' in col_lower:
-                verticals_col = col
-            elif 'country' in col_lower:
-                country_col = col
-            elif 'state' in col_lower:
-                state_col = col
-            elif 'principle contact' in col_lower and 'first name' in col_lower:
-                principle_contact_first_name_col = col
-            elif 'principle contact' in col_lower and 'last name' in col_lower:
-                principle_contact_last_name_col = col
-            elif 'address line' in col_lower:
-                address_line_col = col
-            elif 'city' in col_lower:
-                city_col = col
-        
-        # Track organization short names for duplicate checking
-        seen_org_short_names = set()
+        try:
+            # Create error file directory
+            error_dir = os.path.join(output_directory, "Error file")
+            os.makedirs(error_dir, exist_ok=True)
+            
+            # 'xlsx' copies the values with issue cells highlighted (through a write-only workbook, so of the
+            # original formatting only red cell fills are kept); 'csv' and 'json' write only the issues list
+            base_name = base_name or os.path.splitext(os.path.basename(input_file_path))[0]
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            if output_format == 'xlsx':
+                output_file_name = f"{base_name}_issues_highlighted_{timestamp}.xlsx"
+                output_workbook = Workbook(write_only=True)
+            else:
+                output_file_name = f"{base_name}_issues_{timestamp}.{output_format}"
+                output_workbook = None
+            output_file_path = os.path.join(error_dir, output_file_name)
+            
+            workbook = load_workbook(input_file_path, read_only=True, data_only=True)
+            self.progress.begin_run(len(workbook.sheetnames))
+            try:
+                for sheet_index, sheet_name in enumerate(workbook.sheetnames, 1):
+                    print(f"Analyzing sheet: {sheet_index} - {sheet_name}")
+                    # Rows are only known once the sheet has been read, so the stage reports none
+                    with self.profiler.stage('stream_sheet_issues', sheet_name):
+                        self.stream_sheet_issues(workbook[sheet_name], sheet_name, output_workbook, batch_size)
+                    self.progress.sheet_done()
+            finally:
+                workbook.close()
+            
+            with self.profiler.stage('save_' + output_format):
+                if output_workbook is not None:
+                    output_workbook.save(output_file_path)
+                else:
+                    self.save_issues_sidecar(output_file_path, output_format)
+            print(f"Issues file saved to: {output_file_path}")
+            
+            # Generate detailed issues report
+            with self.profiler.stage('generate_issues_report'):
+                issues_report = self.generate_issues_report()
+            
+            return output_file_path, issues_report
         
-        # Valid values for validation
-        valid_statuses = ['NON_BOI', 'BOI']
-        valid_verticals = ['VERT-CUS', 'VERT-SPO', 'VERT-YO', 'VERT-IM-EX', 'VERT-SHIPPING-LINE', 'VERT-TRN']
-        valid_districts = [
-            'Colombo District', 'Gampaha District', 'Kalutara District', 'Kandy District', 
-            'Matale District', 'Nuwara Eliya District', 'Galle District', 'Matara District', 
-            'Hambantota District', 'Jaffna District', 'Kilinochchi District', 'Mannar District', 
-            'Vavuniya District', 'Mullaitivu District', 'Batticaloa District', 'Ampara District', 
-            'Trincomalee District', 'Kurunegala District', 'Anuradhapura District', 
-            'Polonnaruwa District', 'Badulla District', 'Monaragala District', 'Ratnapura District', 
-            'Kegalle District'
-        ]
+        except CorrectionCancelled:
+            print("Issue analysis cancelled")
+            self.change_sink.discard()
+            raise
+        except Exception as e:
+            print(f"Error during issue analysis: {str(e)}")
+            raise
+        finally:
+            self.profiler.end_run()
+    
+    def stream_sheet_issues(self, sheet, sheet_name, output_workbook, batch_size=DEFAULT_BATCH_SIZE, header_row=3):
+        """Analyze one read-only sheet batch by batch, appending its rows to the output workbook if there is one"""
+        analyzer = self.get_issue_analyzer(sheet_name)
+        output_sheet = output_workbook.create_sheet(sheet_name) if output_workbook is not None else None
+        
+        # Red-fill verdicts per cell style, shared by every row of the sheet
+        red_styles = {}
+        
+        if analyzer is None:
+            # Not analyzed: copy the values (and red fills) as they are
+            if output_sheet is not None:
+                self.append_highlighted_rows(output_sheet, sheet.iter_rows(), 1, {}, red_styles)
+            return
         
-        # Check each row for issues
-        for idx in range(len(df)):
-            if self.is_end_row(df, idx):
-                continue
-                
-            excel_row = data_start_row + idx
-            org_name = df.loc[idx, df.columns[0]] if not pd.isna(df.loc[idx, df.columns[0]]) else f'Row {excel_row}'
-            
-            # 1. Organization Name cannot be empty
-            if org_name_col:
-                org_name_value = df.loc[idx, org_name_col]
-                if pd.isna(org_name_value) or str(org_name_value).strip() == '':
-                    self.add_issue_and_highlight(sheet, excel_row, org_name_col,
-                                               "Organization Name cannot be empty",
-                                               sheet_type, org_name)
-            
-            # 2. Organization Short Name cannot be duplicated and cannot be empty
-            if org_short_name_col:
-                org_short_name_value = df.loc[idx, org_short_name_col]
-                if pd.isna(org_short_name_value) or str(org_short_name_value).strip() == '':
-                    self.add_issue_and_highlight(sheet, excel_row, org_short_name_col,
-                                               "Organization Short Name cannot be empty",
-                                               sheet_type, org_name)
-                else:
-                    short_name_str = str(org_short_name_value).strip()
-                    if short_name_str in seen_org_short_names:
-                        self.add_issue_and_highlight(sheet, excel_row, org_short_name_col,
-                                                   f"Duplicate Organization Short Name: '{short_name_str}'",
-                                                   sheet_type, org_name)
-                    else:
-                        seen_org_short_names.add(short_name_str)
-            
-            # 3. Operations column cannot be empty
-            if operations_col:
-                operations_value = df.loc[idx, operations_col]
-                if pd.isna(operations_value) or str(operations_value).strip() == '':
-                    self.add_issue_and_highlight(sheet, excel_row, operations_col,
-                                               "Operations column cannot be empty",
-                                               sheet_type, org_name)
-            
-            # 4. Status only can be "NON_BOI" and "BOI"
-            if status_col:
-                status_value = df.loc[idx, status_col]
-                if pd.notna(status_value):
-                    status_str = str(status_value).strip()
-                    if status_str not in valid_statuses:
-                        self.add_issue_and_highlight(sheet, excel_row, status_col, 
-                                                   f"Status must be one of {valid_statuses}, found: '{status_str}'",
-                                                   sheet_type, org_name)
-                else:
-                    self.add_issue_and_highlight(sheet, excel_row, status_col,
-                                               "Status cannot be empty",
-                                               sheet_type, org_name)
-            
-            # 5. Verticals are only from specific list and cannot be empty
-            if verticals_col:
-                verticals_value = df.loc[idx, verticals_col]
-                if pd.notna(verticals_value):
-                    verticals_str = str(verticals_value).strip()
-                    
-                    # Handle multiple verticals separated by commas
-                    if ',' in verticals_str:
-                        vertical_list = [v.strip() for v in verticals_str.split(',')]
-                        invalid_verticals_found = []
-                        
-                        for vertical in vertical_list:
-                            vertical = vertical.strip()
-                            if vertical not in valid_verticals:
-                                # Check for case-insensitive matches
-                                normalized_input = vertical.upper().replace(' ', '').replace('-', '')
-                                is_valid = False
-                                for valid_vertical in valid_verticals:
-                                    normalized_valid = valid_vertical.upper().replace(' ', '').replace('-', '')
-                                    if normalized_input == normalized_valid:
-                                        is_valid = True
-                                        break
-                                if not is_valid:
-                                    invalid_verticals_found.append(vertical)
-                        
-                        if invalid_verticals_found:
-                            self.add_issue_and_highlight(sheet, excel_row, verticals_col,
-                                                       f"Invalid verticals found: {invalid_verticals_found}. Valid options: {valid_verticals}",
-                                                       sheet_type, org_name)
-                    else:
-                        # Single vertical value
-                        is_valid = False
-                        if verticals_str in valid_verticals:
-                            is_valid = True
-                        else:
-                            # Check for case-insensitive matches
-                            normalized_input = verticals_str.upper().replace(' ', '').replace('-', '')
-                            for valid_vertical in valid_verticals:
-                                normalized_valid = valid_vertical.upper().replace(' ', '').replace('-', '')
-                                if normalized_input == normalized_valid:
-                                    is_valid = True
-                                    break
-                        
-                        if not is_valid:
-                            self.add_issue_and_highlight(sheet, excel_row, verticals_col,
-                                                       f"Verticals must be one of {valid_verticals}, found: '{verticals_str}'",
-                                                       sheet_type, org_name)
-                else:
-                    self.add_issue_and_highlight(sheet, excel_row, verticals_col,
-                                               "Verticals cannot be empty",
-                                               sheet_type, org_name)
-            
-            # 6. Country must be "Sri Lanka" with proper capitalization
-            if country_col:
-                country_value = df.loc[idx, country_col]
-                if pd.notna(country_value):
-                    country_str = str(country_value).strip()
-                    if country_str != 'Sri Lanka':
-                        self.add_issue_and_highlight(sheet, excel_row, country_col,
-                                                   f"Country must be 'Sri Lanka', found: '{country_str}'",
-                                                   sheet_type, org_name)
-                else:
-                    self.add_issue_and_highlight(sheet, excel_row, country_col,
-                                               "Country cannot be empty",
-                                               sheet_type, org_name)
-            
-            # 7. State must be from valid district list
-            if state_col:
-                state_value = df.loc[idx, state_col]
-                if pd.notna(state_value):
-                    state_str = str(state_value).strip()
-                    if state_str not in valid_districts:
-                        self.add_issue_and_highlight(sheet, excel_row, state_col,
-                                                   f"State must be one of the valid districts, found: '{state_str}'",
-                                                   sheet_type, org_name)
-                else:
-                    self.add_issue_and_highlight(sheet, excel_row, state_col,
-                                               "State cannot be empty",
-                                               sheet_type, org_name)
-            
-            # 8. Principle Contact's First Name cannot be empty
-            if principle_contact_first_name_col:
-                first_name_value = df.loc[idx, principle_contact_first_name_col]
-                if pd.isna(first_name_value) or str(first_name_value).strip() == '':
-                    self.add_issue_and_highlight(sheet, excel_row, principle_contact_first_name_col,
-                                               "Principle Contact's First Name cannot be empty",
-                                               sheet_type, org_name)
-            
-            # 9. Principle Contact's Last Name cannot be empty
-            if principle_contact_last_name_col:
-                last_name_value = df.loc[idx, principle_contact_last_name_col]
-                if pd.isna(last_name_value) or str(last_name_value).strip() == '':
-                    self.add_issue_and_highlight(sheet, excel_row, principle_contact_last_name_col,
-                                               "Principle Contact's Last Name cannot be empty",
-                                               sheet_type, org_name)
-            
-            # 10. Address Line cannot be empty
-            if address_line_col:
-                address_value = df.loc[idx, address_line_col]
-                if pd.isna(address_value) or str(address_value).strip() == '':
-                    self.add_issue_and_highlight(sheet, excel_row, address_line_col,
-                                               "Address Line cannot be empty",
-                                               sheet_type, org_name)
-            
-            # 11. City cannot be empty
-            if city_col:
-                city_value = df.loc[idx, city_col]
-                if pd.isna(city_value) or str(city_value).strip() == '':
-                    self.add_issue_and_highlight(sheet, excel_row, city_col,
-                                               "City cannot be empty",
-                                               sheet_type, org_name)
-    
-    def analyze_divisions_issues(self, df, sheet, sheet_type):
-        """Analyze Divisions sheet for issues"""
-        data_start_row = 4
+        if output_sheet is not None:
+            self.append_highlighted_rows(output_sheet, sheet.iter_rows(max_row=header_row), 1, {}, red_styles)
         
-        # Find relevant columns
-        org_short_name_col = None
-        division_name_col = None
-        purpose_col = None
-        first_name_col = None
-        last_name_col = None
+        # First pass: column widths and dtypes of the whole sheet; second pass: analyze each batch
+        layout = SheetLayout(sheet, header_row, batch_size)
+        analyzer_name, sheet_type = analyzer
         
-        for col in df.columns:
-            col_lower = col.lower()
-            if 'organization' in col_lower and ('short' in col_lower or 'short name' in col_lower):
-                org_short_name_col = col
-            elif 'division' in col_lower and 'name' in col_lower:
-                division_name_col = col
-            elif 'purpose' in col_lower:
-                purpose_col = col
-            elif 'first' in col_lower and 'name' in col_lower:
-                first_name_col = col
-            elif 'last' in col_lower and 'name' in col_lower:
-                last_name_col = col
-        
-        # Valid purpose values
-        valid_purposes = [
-            'PPS-STG', 'PPS-EX-PR', 'PPS-SPO-CSPOS', 'PPS-IM-PR', 'PPS-ADMIN',
-            'PPS-STPOVR', 'PPS-IM-EX', 'PPS-YO-CC', 'PPS-YO-ECS', 'PPS-HRM', 'PPS-FMG'
-        ]
+        self.header_indexes[sheet_name] = layout.header_index()
+        seen_values = {}
+        highlighted_cells = 0
         
-        # Check each row for issues
-        for idx in range(len(df)):
-            if self.is_end_row(df, idx):
-                continue
-                
-            excel_row = data_start_row + idx
-            org_name = df.loc[idx, df.columns[0]] if not pd.isna(df.loc[idx, df.columns[0]]) else f'Row {excel_row}'
+        for cell_rows, df in layout.iter_frames(sheet):
+            # Each batch is a cancellation checkpoint
+            self.progress.update('stream_sheet_issues', sheet_name, int(df.index[0]), layout.row_count)
             
-            # Check Organization Short Name - cannot be empty
-            if org_short_name_col:
-                org_short_value = df.loc[idx, org_short_name_col]
-                if pd.isna(org_short_value) or str(org_short_value).strip() == '':
-                    self.add_issue_and_highlight(sheet, excel_row, org_short_name_col,
-                                               f"Organization Short Name cannot be empty",
-                                               sheet_type, org_name)
-            
-            # Check Division Name - cannot be empty
-            if division_name_col:
-                division_value = df.loc[idx, division_name_col]
-                if pd.isna(division_value) or str(division_value).strip() == '':
-                    self.add_issue_and_highlight(sheet, excel_row, division_name_col,
-                                               f"Division Name cannot be empty",
-                                               sheet_type, org_name)
-            
-            # Check Purpose - cannot be empty and must be valid values
-            if purpose_col:
-                purpose_value = df.loc[idx, purpose_col]
-                if pd.isna(purpose_value) or str(purpose_value).strip() == '':
-                    self.add_issue_and_highlight(sheet, excel_row, purpose_col,
-                                               f"Purpose cannot be empty",
-                                               sheet_type, org_name)
-                elif pd.notna(purpose_value):
-                    # Check if it's a comma-separated list or single value
-                    purpose_str = str(purpose_value).strip()
-                    if ',' in purpose_str:
-                        # Multiple purposes - check each one
-                        purposes = [p.strip() for p in purpose_str.split(',')]
-                        invalid_purposes = [p for p in purposes if p not in valid_purposes]
-                        if invalid_purposes:
-                            self.add_issue_and_highlight(sheet, excel_row, purpose_col,
-                                                       f"Invalid purpose values: {', '.join(invalid_purposes)}. Valid values: {', '.join(valid_purposes)}",
-                                                       sheet_type, org_name)
-                    else:
-                        # Single purpose
-                        if purpose_str not in valid_purposes:
-                            self.add_issue_and_highlight(sheet, excel_row, purpose_col,
-                                                       f"Invalid purpose value: '{purpose_str}'. Valid values: {', '.join(valid_purposes)}",
-                                                       sheet_type, org_name)
-            
-            # Check Principle Contact's First Name - cannot be empty
-            if first_name_col:
-                first_name_value = df.loc[idx, first_name_col]
-                if pd.isna(first_name_value) or str(first_name_value).strip() == '':
-                    self.add_issue_and_highlight(sheet, excel_row, first_name_col,
-                                               f"Principle Contact's First Name cannot be empty",
-                                               sheet_type, org_name)
-            
-            # Check Principle Contact's Last Name - cannot be empty
-            if last_name_col:
-                last_name_value = df.loc[idx, last_name_col]
-                if pd.isna(last_name_value) or str(last_name_value).strip() == '':
-                    self.add_issue_and_highlight(sheet, excel_row, last_name_col,
-                                               f"Principle Contact's Last Name cannot be empty",
-                                               sheet_type, org_name)
-    
-    def analyze_human_resources_issues(self, df, sheet, sheet_type):
-        """Analyze Human Resources sheet for issues"""
-        data_start_row = 4
+            # Duplicate checks remember the values of earlier batches through seen_values
+            self.sheet_validators[id(df)] = (df, SheetValidator(df, self.get_end_row_mask(df), seen_values))
+            getattr(self, analyzer_name)(df, sheet_name, sheet_type)
+            
+            issue_cells = self.pending_issue_cells.pop(sheet_name, {})
+            highlighted_cells += len(issue_cells)
+            if output_sheet is not None:
+                self.append_highlighted_rows(output_sheet, cell_rows, header_row + 1 + df.index[0], issue_cells,
+                                             red_styles)
+            
+            # Release the batch
+            self.end_row_masks.pop(id(df), None)
+            self.sheet_validators.pop(id(df), None)
         
-        # Find relevant columns
-        gender_col = None
-        division_col = None
-        nic_col = None
-        email_col = None
+        print(f"Found issues in {highlighted_cells} cells of {sheet_name}")
+    
+    def append_highlighted_rows(self, output_sheet, cell_rows, first_excel_row, issue_cells, red_styles):
+        """Append rows of read-only cells to a write-only sheet: red cells keep their fill and {(row, col): comment}
+        issue cells become red commented cells (red_styles caches the red check per cell style)"""
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import PatternFill
+        from openpyxl.comments import Comment
+        red_fill = PatternFill(start_color="FFFF0000", end_color="FFFF0000", fill_type="solid")
         
-        for col in df.columns:
-            col_lower = col.lower()
-            if 'gender' in col_lower:
-                gender_col = col
-            elif 'division' in col_lower:
-                division_col = col
-            elif 'nic' in col_lower:
-                nic_col = col
-            elif 'email' in col_lower:
-                email_col = col
-        
-        # Track for duplicates
-        seen_nics = set()
-        seen_emails = set()
-        
-        # Check each row for issues
-        for idx in range(len(df)):
-            if self.is_end_row(df, idx):
-                continue
-                
-            excel_row = data_start_row + idx
-            org_name = df.loc[idx, df.columns[0]] if not pd.isna(df.loc[idx, df.columns[0]]) else f'Row {excel_row}'
-            
-            # Check gender issues
-            if gender_col:
-                gender_value = df.loc[idx, gender_col]
-                if pd.notna(gender_value):
-                    gender_str = str(gender_value).strip().lower()
-                    if gender_str not in ['male', 'female']:
-                        self.add_issue_and_highlight(sheet, excel_row, gender_col,
-                                                   f"Gender should be 'Male' or 'Female', found: '{gender_value}'",
-                                                   sheet_type, org_name)
-            
-            # Check division issues
-            if division_col:
-                division_value = df.loc[idx, division_col]
-                if pd.notna(division_value) and str(division_value).strip() != 'Admin':
-                    self.add_issue_and_highlight(sheet, excel_row, division_col,
-                                               f"Division should be 'Admin', found: '{division_value}'",
-                                               sheet_type, org_name)
-            
-            # Check NIC issues
-            if nic_col:
-                nic_value = df.loc[idx, nic_col]
-                if pd.notna(nic_value):
-                    nic_str = str(nic_value).strip()
-                    if nic_str in seen_nics:
-                        self.add_issue_and_highlight(sheet, excel_row, nic_col,
-                                                   f"Duplicate NIC found: '{nic_str}'",
-                                                   sheet_type, org_name)
-                    else:
-                        seen_nics.add(nic_str)
-                else:
-                    self.add_issue_and_highlight(sheet, excel_row, nic_col,
-                                               "Empty NIC field",
-                                               sheet_type, org_name)
-            
-            # Check Email issues
-            if email_col:
-                email_value = df.loc[idx, email_col]
-                if pd.notna(email_value):
-                    email_str = str(email_value).strip()
-                    if email_str in seen_emails:
-                        self.add_issue_and_highlight(sheet, excel_row, email_col,
-                                                   f"Duplicate Email found: '{email_str}'",
-                                                   sheet_type, org_name)
-                    else:
-                        seen_emails.add(email_str)
-                else:
-                    self.add_issue_and_highlight(sheet, excel_row, email_col,
-                                               "Empty Email field",
-                                               sheet_type, org_name)
+        cells_by_row = {}
+        for (excel_row, col_idx), comment_text in issue_cells.items():
+            cells_by_row.setdefault(excel_row, []).append((col_idx, comment_text))
+        
+        for offset, cells in enumerate(cell_rows):
+            row = [cell.value for cell in cells]
+            
+            # {column: (fill, comment)}: the source's red cells (e.g. HR NIC/Email), then the issue cells
+            marked_cells = {}
+            for col_idx, cell in enumerate(cells, 1):
+                # Padding cells of short rows have no style
+                style_id = getattr(cell, '_style_id', 0)
+                if style_id not in red_styles:
+                    red_styles[style_id] = self.is_red_cell(cell)
+                if red_styles[style_id]:
+                    marked_cells[col_idx] = (cell.fill, None)
+            for col_idx, comment_text in cells_by_row.get(first_excel_row + offset, []):
+                marked_cells[col_idx] = (red_fill, comment_text)
+            
+            for col_idx, (fill, comment_text) in marked_cells.items():
+                row += [None] * (col_idx - len(row))
+                cell = WriteOnlyCell(output_sheet, value=row[col_idx - 1])
+                cell.fill = fill
+                if comment_text:
+                    cell.comment = Comment(comment_text, "System")
+                row[col_idx - 1] = cell
+            output_sheet.append(row)
     
-    def analyze_vehicles_issues(self, df, sheet, sheet_type):
-        """Analyze Vehicles sheet for issues"""
-        data_start_row = 4
+    def save_issues_sidecar(self, output_file_path, output_format):
+        """Write the issues found as CSV or JSON (sheet, row, column, issue, organization)"""
+        fields = ['sheet', 'row', 'column', 'issue', 'organization']
+        with open(output_file_path, 'w', encoding='utf-8', newline='') as f:
+            if output_format == 'csv':
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                writer.writerows(self.issues_found)
+            else:
+                json.dump(self.issues_found, f, indent=2, default=str)
+    
+    def get_issue_analyzer(self, sheet_name):
+        """Return (analyzer method name, sheet type) for a sheet, or None if it is not analyzed"""
+        sheet_name_lower = sheet_name.lower()
+        if 'organization' in sheet_name_lower or 'org' in sheet_name_lower:
+            return 'analyze_organization_issues', 'Organization Details'
+        elif 'division' in sheet_name_lower:
+            return 'analyze_divisions_issues', 'Divisions'
+        elif 'human' in sheet_name_lower or 'hr' in sheet_name_lower or 'resource' in sheet_name_lower:
+            return 'analyze_human_resources_issues', 'Human Resources'
+        elif 'vehicle' in sheet_name_lower:
+            return 'analyze_vehicles_issues', 'Vehicles'
+        elif 'location' in sheet_name_lower:
+            return 'analyze_locations_issues', 'Locations'
+        return None
+    
+    def analyze_sheets(self, workbook, dataframes, sheet_jobs):
+        """Run each sheet's analyzer in this process, one sheet after another"""
+        for sheet_name, analyzer_name, sheet_type in sheet_jobs:
+            with self.profiler.stage(analyzer_name, sheet_name, len(dataframes[sheet_name])):
+                self.header_indexes[sheet_name] = read_header_index(workbook[sheet_name])
+                getattr(self, analyzer_name)(dataframes[sheet_name], sheet_name, sheet_type)
+            self.progress.sheet_done()
+    
+    def analyze_sheets_in_parallel(self, workbook, dataframes, sheet_jobs, max_workers=None):
+        """Run each sheet's analyzer in a process pool and queue the returned issues in sheet order"""
+        print(f"Analyzing {len(sheet_jobs)} sheets in parallel...")
+        rows = sum(len(dataframes[sheet_name]) for sheet_name, _, _ in sheet_jobs)
+        try:
+            with self.profiler.stage('analyze_sheets_in_parallel', rows=rows), \
+                    ProcessPoolExecutor(max_workers=max_workers or len(sheet_jobs)) as executor:
+                futures = [
+                    executor.submit(analyze_sheet_issues, analyzer_name, dataframes[sheet_name], sheet_name,
+                                    read_header_index(workbook[sheet_name]), sheet_type)
+                    for sheet_name, analyzer_name, sheet_type in sheet_jobs
+                ]
+                results = [future.result() for future in futures]
+        except (OSError, BrokenProcessPool) as e:
+            print(f"⚠️ Parallel analysis unavailable ({e}), analyzing sheets sequentially")
+            self.analyze_sheets(workbook, dataframes, sheet_jobs)
+            return
         
+        for (sheet_name, _, _), (issues, issue_cells) in zip(sheet_jobs, results):
+            self.progress.sheet_done()
+            self.issues_found.extend(issues)
+            if issue_cells:
+                self.pending_issue_cells[sheet_name] = issue_cells
+    
+    def analyze_organization_issues(self, df, sheet_name, sheet_type):
+        """Analyze Organization Details sheet for issues with enhanced validation"""
         # Find relevant columns
-        division_col = None
-        vehicle_type_col = None
-        load_type_col = None
-        managed_by_col = None
-        
-        for col in df.columns:
-            col_lower = col.lower()
-            if 'division' in col_lower:
-                division_col = col
-            elif 'vehicle' in col_lower and 'type' in col_lower:
-                vehicle_type_col = col
-            elif 'load' in col_lower and 'type' in col_lower:
-                load_type_col = col
-            elif 'managed by' in col_lower:
-                managed_by_col = col
-        
-        # Check each row for issues
-        for idx in range(len(df)):
-            if self.is_end_row(df, idx):
-                continue
-                
-            excel_row = data_start_row + idx
-            org_name = df.loc[idx, df.columns[0]] if not pd.isna(df.loc[idx, df.columns[0]]) else f'Row {excel_row}'
-            
-            # Check division issues
-            if division_col:
-                division_value = df.loc[idx, division_col]
-                if pd.notna(division_value) and str(division_value).strip() != 'Admin':
-                    self.add_issue_and_highlight(sheet, excel_row, division_col,
-                                               f"Division should be 'Admin', found: '{division_value}'",
-                                               sheet_type, org_name)
-            
-            # Check vehicle type issues
-            if vehicle_type_col:
-                vehicle_type_value = df.loc[idx, vehicle_type_col]
-                if pd.notna(vehicle_type_value) and str(vehicle_type_value).strip() != 'TRUCK':
-                    self.add_issue_and_highlight(sheet, excel_row, vehicle_type_col,
-                                               f"Vehicle Type should be 'TRUCK', found: '{vehicle_type_value}'",
-                                               sheet_type, org_name)
-            
-            # Check load type issues
-            if load_type_col:
-                load_type_value = df.loc[idx, load_type_col]
-                if pd.notna(load_type_value) and str(load_type_value).strip() != 'LOADS':
-                    self.add_issue_and_highlight(sheet, excel_row, load_type_col,
-                                               f"Load Type should be 'LOADS', found: '{load_type_value}'",
-                                               sheet_type, org_name)
-            
-            # Check managed by issues
-            if managed_by_col:
-                managed_by_value = df.loc[idx, managed_by_col]
-                if pd.isna(managed_by_value) or str(managed_by_value).strip() == '':
-                    self.add_issue_and_highlight(sheet, excel_row, managed_by_col,
-                                               "Empty 'Managed By' field - needs NIC from HR",
-                                               sheet_type, org_name)
-    
-    def analyze_locations_issues(self, df, sheet, sheet_type):
+        roles = self.get_column_roles(df, 'organization_issues')
+        org_name_col = roles['org_name']
+        org_short_name_col = roles['org_short_name']
+        operations_col = roles['operations']
+        status_col = roles['status']
+        verticals_col = roles['verticals']
+        country_col = roles['country']
+        state_col = roles['state']
+        principle_contact_first_name_col = roles['principle_contact_first_name']
+        principle_contact_last_name_col = roles['principle_contact_last_name']
+        address_line_col = roles['address_line']
+        city_col = roles['city']
+        
+        validator = self.get_sheet_validator(df)
+        flags = []
+        
+        # 1. Organization Name cannot be empty
+        if org_name_col:
+            flags.append((org_name_col, validator.values(org_name_col).blank,
+                          "Organization Name cannot be empty"))
+        
+        # 2. Organization Short Name cannot be duplicated and cannot be empty
+        if org_short_name_col:
+            short_names = validator.values(org_short_name_col)
+            flags.append((org_short_name_col, short_names.blank,
+                          "Organization Short Name cannot be empty"))
+            flags.append((org_short_name_col, short_names.repeated(~short_names.blank & ~validator.end_rows),
+                          lambda idx: f"Duplicate Organization Short Name: '{short_names.stripped.iat[idx]}'"))
+        
+        # 3. Operations column cannot be empty
+        if operations_col:
+            flags.append((operations_col, validator.values(operations_col).blank,
+                          "Operations column cannot be empty"))
+        
+        # 4. Status only can be "NON_BOI" and "BOI"
+        if status_col:
+            statuses = validator.values(status_col)
+            flags.append((status_col, ~statuses.missing & statuses.not_in(VALID_STATUSES),
+                          lambda idx: f"Status must be one of {VALID_STATUSES}, found: '{statuses.stripped.iat[idx]}'"))
+            flags.append((status_col, statuses.missing, "Status cannot be empty"))
+        
+        # 5. Verticals are only from specific list and cannot be empty
+        if verticals_col:
+            verticals = validator.values(verticals_col)
+            vertical_issues = verticals.check_distinct(self.find_verticals_issue)
+            flags.append((verticals_col, ~verticals.missing & (vertical_issues != ''),
+                          lambda idx: vertical_issues[idx]))
+            flags.append((verticals_col, verticals.missing, "Verticals cannot be empty"))
+        
+        # 6. Country must be "Sri Lanka" with proper capitalization
+        if country_col:
+            countries = validator.values(country_col)
+            flags.append((country_col, ~countries.missing & countries.not_in(['Sri Lanka']),
+                          lambda idx: f"Country must be 'Sri Lanka', found: '{countries.stripped.iat[idx]}'"))
+            flags.append((country_col, countries.missing, "Country cannot be empty"))
+        
+        # 7. State must be from valid district list
+        if state_col:
+            states = validator.values(state_col)
+            flags.append((state_col, ~states.missing & ~self.district_resolver.resolve(states).valid,
+                          lambda idx: f"State must be one of the valid districts, found: '{states.stripped.iat[idx]}'"))
+            flags.append((state_col, states.missing, "State cannot be empty"))
+        
+        # 8. Principle Contact's First Name cannot be empty
+        if principle_contact_first_name_col:
+            flags.append((principle_contact_first_name_col, validator.values(principle_contact_first_name_col).blank,
+                          "Principle Contact's First Name cannot be empty"))
+        
+        # 9. Principle Contact's Last Name cannot be empty
+        if principle_contact_last_name_col:
+            flags.append((principle_contact_last_name_col, validator.values(principle_contact_last_name_col).blank,
+                          "Principle Contact's Last Name cannot be empty"))
+        
+        # 10. Address Line cannot be empty
+        if address_line_col:
+            flags.append((address_line_col, validator.values(address_line_col).blank,
+                          "Address Line cannot be empty"))
+        
+        # 11. City cannot be empty
+        if city_col:
+            flags.append((city_col, validator.values(city_col).blank,
+                          "City cannot be empty"))
+        
+        self.add_flagged_issues(sheet_name, df, sheet_type, flags)
+    
+    def find_verticals_issue(self, verticals_str):
+        """Return the issue for one (stripped) Verticals value, or '' if every vertical is valid"""
+        # Case, space and hyphen differences are accepted (e.g. 'vert trn')
+        normalized_valid = [valid_vertical.upper().replace(' ', '').replace('-', '') for valid_vertical in VALID_VERTICALS]
+        
+        # Handle multiple verticals separated by commas
+        if ',' in verticals_str:
+            invalid_verticals_found = []
+            for vertical in [v.strip() for v in verticals_str.split(',')]:
+                if vertical not in VALID_VERTICALS and vertical.upper().replace(' ', '').replace('-', '') not in normalized_valid:
+                    invalid_verticals_found.append(vertical)
+            if invalid_verticals_found:
+                return f"Invalid verticals found: {invalid_verticals_found}. Valid options: {VALID_VERTICALS}"
+        elif verticals_str not in VALID_VERTICALS and verticals_str.upper().replace(' ', '').replace('-', '') not in normalized_valid:
+            return f"Verticals must be one of {VALID_VERTICALS}, found: '{verticals_str}'"
+        
+        return ''
+    
+    def analyze_divisions_issues(self, df, sheet_name, sheet_type):
+        """Analyze Divisions sheet for issues"""
+        # Find relevant columns
+        roles = self.get_column_roles(df, 'divisions')
+        org_short_name_col = roles['org_short_name']
+        division_name_col = roles['division_name']
+        purpose_col = roles['purpose']
+        first_name_col = roles['first_name']
+        last_name_col = roles['last_name']
+        
+        validator = self.get_sheet_validator(df)
+        flags = []
+        
+        # Check Organization Short Name - cannot be empty
+        if org_short_name_col:
+            flags.append((org_short_name_col, validator.values(org_short_name_col).blank,
+                          f"Organization Short Name cannot be empty"))
+        
+        # Check Division Name - cannot be empty
+        if division_name_col:
+            flags.append((division_name_col, validator.values(division_name_col).blank,
+                          f"Division Name cannot be empty"))
+        
+        # Check Purpose - cannot be empty and must be valid values
+        if purpose_col:
+            purposes = validator.values(purpose_col)
+            purpose_issues = purposes.check_distinct(self.find_purpose_issue)
+            flags.append((purpose_col, purposes.blank, f"Purpose cannot be empty"))
+            flags.append((purpose_col, ~purposes.blank & (purpose_issues != ''),
+                          lambda idx: purpose_issues[idx]))
+        
+        # Check Principle Contact's First Name - cannot be empty
+        if first_name_col:
+            flags.append((first_name_col, validator.values(first_name_col).blank,
+                          f"Principle Contact's First Name cannot be empty"))
+        
+        # Check Principle Contact's Last Name - cannot be empty
+        if last_name_col:
+            flags.append((last_name_col, validator.values(last_name_col).blank,
+                          f"Principle Contact's Last Name cannot be empty"))
+        
+        self.add_flagged_issues(sheet_name, df, sheet_type, flags)
+    
+    def find_purpose_issue(self, purpose_str):
+        """Return the issue for one (stripped) Purpose value, or '' if every purpose is valid"""
+        # Check if it's a comma-separated list or single value
+        if ',' in purpose_str:
+            # Multiple purposes - check each one
+            purposes = [p.strip() for p in purpose_str.split(',')]
+            invalid_purposes = [p for p in purposes if p not in VALID_PURPOSES]
+            if invalid_purposes:
+                return f"Invalid purpose values: {', '.join(invalid_purposes)}. Valid values: {', '.join(VALID_PURPOSES)}"
+        elif purpose_str not in VALID_PURPOSES:
+            return f"Invalid purpose value: '{purpose_str}'. Valid values: {', '.join(VALID_PURPOSES)}"
+        
+        return ''
+    
+    def analyze_human_resources_issues(self, df, sheet_name, sheet_type):
+        """Analyze Human Resources sheet for issues"""
+        # Find relevant columns
+        roles = self.get_column_roles(df, 'human_resources_issues')
+        gender_col = roles['gender']
+        division_col = roles['division']
+        nic_col = roles['nic']
+        email_col = roles['email']
+        
+        validator = self.get_sheet_validator(df)
+        flags = []
+        
+        # Check gender issues
+        if gender_col:
+            genders = validator.values(gender_col)
+            flags.append((gender_col, ~genders.missing & genders.not_in(['male', 'female'], lowercase=True),
+                          lambda idx: f"Gender should be 'Male' or 'Female', found: '{genders.value(idx)}'"))
+        
+        # Check division issues
+        if division_col:
+            divisions = validator.values(division_col)
+            flags.append((division_col, ~divisions.missing & divisions.not_in(['Admin']),
+                          lambda idx: f"Division should be 'Admin', found: '{divisions.value(idx)}'"))
+        
+        # Check NIC issues (duplicates of an earlier NIC, or empty)
+        if nic_col:
+            nics = validator.values(nic_col)
+            flags.append((nic_col, nics.repeated(~nics.missing & ~validator.end_rows),
+                          lambda idx: f"Duplicate NIC found: '{nics.stripped.iat[idx]}'"))
+            flags.append((nic_col, nics.missing, "Empty NIC field"))
+        
+        # Check Email issues (duplicates of an earlier email, or empty)
+        if email_col:
+            emails = validator.values(email_col)
+            flags.append((email_col, emails.repeated(~emails.missing & ~validator.end_rows),
+                          lambda idx: f"Duplicate Email found: '{emails.stripped.iat[idx]}'"))
+            flags.append((email_col, emails.missing, "Empty Email field"))
+        
+        self.add_flagged_issues(sheet_name, df, sheet_type, flags)
+    
+    def analyze_vehicles_issues(self, df, sheet_name, sheet_type):
+        """Analyze Vehicles sheet for issues"""
+        # Find relevant columns
+        roles = self.get_column_roles(df, 'vehicles_issues')
+        division_col = roles['division']
+        vehicle_type_col = roles['vehicle_type']
+        load_type_col = roles['load_type']
+        managed_by_col = roles['managed_by']
+        
+        validator = self.get_sheet_validator(df)
+        flags = []
+        
+        # Check division issues
+        if division_col:
+            divisions = validator.values(division_col)
+            flags.append((division_col, ~divisions.missing & divisions.not_in(['Admin']),
+                          lambda idx: f"Division should be 'Admin', found: '{divisions.value(idx)}'"))
+        
+        # Check vehicle type issues
+        if vehicle_type_col:
+            vehicle_types = validator.values(vehicle_type_col)
+            flags.append((vehicle_type_col, ~vehicle_types.missing & vehicle_types.not_in(['TRUCK']),
+                          lambda idx: f"Vehicle Type should be 'TRUCK', found: '{vehicle_types.value(idx)}'"))
+        
+        # Check load type issues
+        if load_type_col:
+            load_types = validator.values(load_type_col)
+            flags.append((load_type_col, ~load_types.missing & load_types.not_in(['LOADS']),
+                          lambda idx: f"Load Type should be 'LOADS', found: '{load_types.value(idx)}'"))
+        
+        # Check managed by issues
+        if managed_by_col:
+            flags.append((managed_by_col, validator.values(managed_by_col).blank,
+                          "Empty 'Managed By' field - needs NIC from HR"))
+        
+        self.add_flagged_issues(sheet_name, df, sheet_type, flags)
+    
+    def analyze_locations_issues(self, df, sheet_name, sheet_type):
         """Analyze Locations sheet for issues"""
-        data_start_row = 4
-        
         # Find relevant columns
-        location_ref_id_col = None
-        location_name_col = None
-        principle_contact_nic_col = None
+        roles = self.get_column_roles(df, 'locations_issues')
+        location_ref_id_col = roles['location_ref_id']
+        location_name_col = roles['location_name']
+        principle_contact_nic_col = roles['principle_contact_nic']
         
-        for col in df.columns:
-            col_lower = col.lower()
-            if 'location reference id' in col_lower:
-                location_ref_id_col = col
-            elif 'location name' in col_lower:
-                location_name_col = col
-            elif 'principle' in col_lower and 'contact' in col_lower and 'nic' in col_lower:
-                principle_contact_nic_col = col
-        
-        # Check each row for issues
-        for idx in range(len(df)):
-            if self.is_end_row(df, idx):
-                continue
-                
-            excel_row = data_start_row + idx
-            org_name = df.loc[idx, df.columns[0]] if not pd.isna(df.loc[idx, df.columns[0]]) else f'Row {excel_row}'
-            
-            # Check location reference ID issues
-            if location_ref_id_col:
-                location_ref_value = df.loc[idx, location_ref_id_col]
-                if pd.isna(location_ref_value) or str(location_ref_value).strip() == '':
-                    self.add_issue_and_highlight(sheet, excel_row, location_ref_id_col,
-                                               "Empty Location Reference ID",
-                                               sheet_type, org_name)
-            
-            # Check location name issues
-            if location_name_col:
-                location_name_value = df.loc[idx, location_name_col]
-                if pd.isna(location_name_value) or str(location_name_value).strip() == '':
-                    self.add_issue_and_highlight(sheet, excel_row, location_name_col,
-                                               "Empty Location Name",
-                                               sheet_type, org_name)
-            
-            # Check principle contact NIC issues
-            if principle_contact_nic_col:
-                principle_contact_value = df.loc[idx, principle_contact_nic_col]
-                if pd.isna(principle_contact_value) or str(principle_contact_value).strip() == '':
-                    self.add_issue_and_highlight(sheet, excel_row, principle_contact_nic_col,
-                                               "Empty 'Principle Contact NIC' field - needs NIC from HR",
-                                               sheet_type, org_name)
-    
-    def add_issue_and_highlight(self, sheet, excel_row, column_name, issue_description, sheet_type, org_name):
+        validator = self.get_sheet_validator(df)
+        flags = []
+        
+        # Check location reference ID issues
+        if location_ref_id_col:
+            flags.append((location_ref_id_col, validator.values(location_ref_id_col).blank,
+                          "Empty Location Reference ID"))
+        
+        # Check location name issues
+        if location_name_col:
+            flags.append((location_name_col, validator.values(location_name_col).blank,
+                          "Empty Location Name"))
+        
+        # Check principle contact NIC issues
+        if principle_contact_nic_col:
+            flags.append((principle_contact_nic_col, validator.values(principle_contact_nic_col).blank,
+                          "Empty 'Principle Contact NIC' field - needs NIC from HR"))
+        
+        self.add_flagged_issues(sheet_name, df, sheet_type, flags)
+    
+    def add_flagged_issues(self, sheet_name, df, sheet_type, flags):
+        """Add (column, row mask, message) flags as issues in row order, checks in the order they were flagged"""
+        end_rows = self.get_end_row_mask(df)
+        
+        entries = []
+        for check_order, (column_name, mask, message) in enumerate(flags):
+            for idx in np.flatnonzero(mask & ~end_rows).tolist():
+                entries.append((idx, check_order, column_name, message))
+        entries.sort(key=lambda entry: entry[:2])
+        
+        data_start_row = 4
+        for idx, _, column_name, message in entries:
+            # The index holds the row's position in the whole sheet (row batches start past 0)
+            excel_row = data_start_row + df.index[idx]
+            org_value = df.iat[idx, 0]
+            org_name = org_value if not pd.isna(org_value) else f'Row {excel_row}'
+            issue_description = message(idx) if callable(message) else message
+            self.add_issue_and_highlight(sheet_name, excel_row, column_name, issue_description, sheet_type, org_name)
+    
+    def add_issue_and_highlight(self, sheet_name, excel_row, column_name, issue_description, sheet_type, org_name):
         """Add issue to tracking and highlight cell in Excel"""
         # Add to issues list
         self.issues_found.append({
@@ -2535,26 +2569,29 @@ class ExcelCorrector:
             'organization': org_name
         })
         
-        # Find the column index for highlighting
-        header_row = 3  # Headers are in row 3
-        col_idx = None
-        
-        for col in range(1, sheet.max_column + 1):
-            header_cell = sheet.cell(row=header_row, column=col)
-            if header_cell.value and str(header_cell.value).strip() == column_name:
-                col_idx = col
-                break
-        
+        # Queue the cell for highlighting; fills and comments are attached in one pass before saving
+        col_idx = self.header_indexes[sheet_name].get(column_name)
         if col_idx:
-            # Highlight the cell with red background
-            cell = sheet.cell(row=excel_row, column=col_idx)
-            from openpyxl.styles import PatternFill
-            red_fill = PatternFill(start_color="FFFF0000", end_color="FFFF0000", fill_type="solid")
-            cell.fill = red_fill
-            
-            # Add comment with issue description
-            from openpyxl.comments import Comment
-            cell.comment = Comment(f"ISSUE: {issue_description}", "System")
+            sheet_cells = self.pending_issue_cells.setdefault(sheet_name, {})
+            sheet_cells[(excel_row, col_idx)] = f"ISSUE: {issue_description}"
+    
+    def apply_issue_highlights(self, workbook):
+        """Attach one shared red fill and an issue comment to every queued cell of the workbook's sheets"""
+        from openpyxl.styles import PatternFill
+        from openpyxl.comments import Comment
+        red_fill = PatternFill(start_color="FFFF0000", end_color="FFFF0000", fill_type="solid")
+        
+        highlighted = 0
+        for sheet_name, sheet_cells in self.pending_issue_cells.items():
+            sheet = workbook[sheet_name]
+            for (excel_row, col_idx), comment_text in sheet_cells.items():
+                cell = sheet.cell(row=excel_row, column=col_idx)
+                cell.fill = red_fill
+                cell.comment = Comment(comment_text, "System")
+                highlighted += 1
+        
+        self.pending_issue_cells = {}
+        return highlighted
     
     def generate_issues_report(self):
         """Generate a detailed report of all issues found"""
@@ -2635,7 +2672,8 @@ Your file is ready for bulk upload as-is!"""
         red_fill = PatternFill(start_color="FFFF0000", end_color="FFFF0000", fill_type="solid")
         
         for sheet_name, sheet_data in sheets_data.items():
-            sheet = workbook[sheet_name]
+            self.progress.update('highlight_unprocessed_errors', sheet_name)
+            sheet = sheet_data['sheet']
             df = sheet_data['df']
             
             # Determine sheet type for processing options
@@ -2664,148 +2702,39 @@ Your file is ready for bulk upload as-is!"""
     
     def highlight_field_errors(self, sheet, df, field_name, red_fill):
         """Highlight errors for a specific field that wasn't processed"""
-        # Map field names to column names and validation rules
-        field_mapping = {
-            # Organization Details
-            'Organization Name': {'column': 'organization', 'rule': 'non_empty'},
-            'Organization Short Name': {'column': 'short', 'rule': 'non_empty_unique'},
-            'Operations': {'column': 'operation', 'rule': 'non_empty'},
-            'Status': {'column': 'status', 'rule': 'allowed_values', 'values': ['NON_BOI', 'BOI']},
-            'Verticals': {'column': 'vertical', 'rule': 'allowed_values', 'values': ['VERT-CUS', 'VERT-SPO', 'VERT-YO', 'VERT-IM-EX', 'VERT-SHIPPING-LINE', 'VERT-TRN']},
-            'Country': {'column': 'country', 'rule': 'format', 'format': 'Sri Lanka'},
-            'State': {'column': 'state', 'rule': 'allowed_values', 'values': ['Colombo District', 'Gampaha District', 'Kalutara District', 'Kandy District', 'Matale District', 'Nuwara Eliya District', 'Galle District', 'Matara District', 'Hambantota District', 'Jaffna District', 'Kilinochchi District', 'Mannar District', 'Vavuniya District', 'Mullaitivu District', 'Batticaloa District', 'Ampara District', 'Trincomalee District', 'Kurunegala District', 'Anuradhapura District', 'Polonnaruwa District', 'Badulla District', 'Monaragala District', 'Ratnapura District', 'Kegalle District']},
-            'Principle Contact First Name': {'column': 'first', 'rule': 'non_empty'},
-            'Principle Contact Last Name': {'column': 'last', 'rule': 'non_empty'},
-            'Address Line': {'column': 'address', 'rule': 'non_empty'},
-            'City': {'column': 'city', 'rule': 'non_empty'},
-            
-
-            
-            # Human Resources
-            'First Name': {'column': 'first_name', 'rule': 'non_empty'},
-            'Last Name': {'column': 'last_name', 'rule': 'non_empty'},
-            'Role': {'column': 'role', 'rule': 'non_empty'},
-            'Division': {'column': 'division', 'rule': 'allowed_values', 'values': ['Admin']},
-            'Designation': {'column': 'designation', 'rule': 'non_empty'},
-            'NIC': {'column': 'nic', 'rule': 'non_empty'},
-            'Email': {'column': 'email', 'rule': 'valid_email'},
-            'Gender': {'column': 'gender', 'rule': 'allowed_values', 'values': ['Male', 'Female']},
-            'Operations': {'column': 'operation', 'rule': 'non_empty'},
-            'Create a User Account': {'column': 'create_user_account', 'rule': 'allowed_values', 'values': ['TRUE', 'FALSE']},
-            'Activity': {'column': 'activity', 'rule': 'non_empty'},
-            
-            # Divisions
-            'Organization Short Name': {'column': 'organization', 'rule': 'non_empty'},
-            'Division Name': {'column': 'division', 'rule': 'non_empty'},
-            'Purpose': {'column': 'purpose', 'rule': 'allowed_values', 'values': ['PPS-STG', 'PPS-EX-PR', 'PPS-SPO-CSPOS', 'PPS-IM-PR', 'PPS-ADMIN', 'PPS-STPOVR', 'PPS-IM-EX', 'PPS-YO-CC', 'PPS-YO-ECS', 'PPS-HRM', 'PPS-FMG']},
-            'Principle Contact First Name': {'column': 'first', 'rule': 'non_empty'},
-            'Principle Contact Last Name': {'column': 'last', 'rule': 'non_empty'},
-            
-            # Vehicles
-            'Vehicle Type': {'column': 'type', 'rule': 'allowed_values', 'values': ['TRUCK']},
-            'Load Type': {'column': 'load', 'rule': 'allowed_values', 'values': ['LOADS']},
-            
-            # Locations
-            'Location Reference ID': {'column': 'reference', 'rule': 'non_empty'},
-            'Location Name': {'column': 'name', 'rule': 'non_empty'},
-            'Status': {'column': 'status', 'rule': 'allowed_values', 'values': ['Create']}
-        }
-        
-        if field_name not in field_mapping:
+        if field_name not in FIELD_RULES:
             return
         
-        field_config = field_mapping[field_name]
-        column_key = field_config['column']
-        rule = field_config['rule']
+        column_key = FIELD_RULES[field_name]['column']
         
         # Find the actual column in the dataframe
-        target_column = None
-        for col in df.columns:
-            col_lower = col.lower()
-            if column_key in col_lower:
-                target_column = col
-                break
+        target_column = find_column_containing(tuple(df.columns), column_key)
         
         if target_column is None:
             return
         
-        # Check each row for errors
-        for idx in range(len(df)):
-            if self.is_end_row(df, idx):
-                continue
-            
-            value = df.loc[idx, target_column]
-            has_error = False
-            error_description = ""
-            
-            # Apply validation rules
-            if rule == 'non_empty':
-                if pd.isna(value) or str(value).strip() == '':
-                    has_error = True
-                    error_description = f"Empty {field_name} field"
-            
-            elif rule == 'non_empty_unique':
-                if pd.isna(value) or str(value).strip() == '':
-                    has_error = True
-                    error_description = f"Empty {field_name} field"
-                # Check for duplicates (simplified)
-                elif df[target_column].value_counts()[value] > 1:
-                    has_error = True
-                    error_description = f"Duplicate {field_name} value"
-            
-            elif rule == 'allowed_values':
-                if pd.isna(value) or str(value).strip() == '':
-                    has_error = True
-                    error_description = f"Empty {field_name} field"
-                elif str(value).strip() not in field_config['values']:
-                    has_error = True
-                    error_description = f"Invalid {field_name} value: {value}"
-            
-            elif rule == 'valid_email':
-                if pd.isna(value) or str(value).strip() == '':
-                    has_error = True
-                    error_description = f"Empty {field_name} field"
-                elif not self.is_valid_email(value):
-                    has_error = True
-                    error_description = f"Invalid email format: {value}"
-            
-            elif rule == 'format':
-                if pd.isna(value) or str(value).strip() == '':
-                    has_error = True
-                    error_description = f"Empty {field_name} field"
-                elif str(value).strip() != field_config['format']:
-                    has_error = True
-                    error_description = f"Invalid {field_name} format: expected '{field_config['format']}', got '{value}'"
-            
-            # Highlight error cells
-            if has_error:
-                # Find the cell in the sheet (accounting for header offset)
-                cell_row = idx + 4  # +4 for header offset
-                cell_col = None
+        # Column index in the sheet (accounting for header offset)
+        cell_col = list(df.columns).index(target_column) + 1
+        
+        # Evaluate the field rule over the whole column and highlight the failing cells
+        for idx, error_description in self.get_sheet_validator(df).field_errors(field_name, target_column):
+            cell_row = idx + 4  # +4 for header offset
+            try:
+                cell = sheet.cell(row=cell_row, column=cell_col)
+                cell.fill = red_fill
                 
-                # Find column index
-                for col_idx, col_name in enumerate(df.columns, 1):
-                    if col_name == target_column:
-                        cell_col = col_idx
-                        break
+                # Add comment explaining the issue
+                if not cell.comment:
+                    cell.comment = Comment(error_description, "System")
+                else:
+                    # Append to existing comment
+                    existing_comment = cell.comment.text
+                    cell.comment = Comment(f"{existing_comment}\n\nUNPROCESSED ISSUE: {error_description}", "System")
                 
-                if cell_col is not None:
-                    try:
-                        cell = sheet.cell(row=cell_row, column=cell_col)
-                        cell.fill = red_fill
-                        
-                        # Add comment explaining the issue
-                        if not cell.comment:
-                            cell.comment = Comment(error_description, "System")
-                        else:
-                            # Append to existing comment
-                            existing_comment = cell.comment.text
-                            cell.comment = Comment(f"{existing_comment}\n\nUNPROCESSED ISSUE: {error_description}", "System")
-                        
-                        print(f"🔴 Highlighted error in {sheet.title}, Row {cell_row}, Column {cell_col}: {error_description}")
-                        
-                    except Exception as e:
-                        print(f"Warning: Could not highlight cell for {field_name}: {e}")
+                self.log_change_line(f"🔴 Highlighted error in {sheet.title}, Row {cell_row}, Column {cell_col}: {error_description}")
+            
+            except Exception as e:
+                print(f"Warning: Could not highlight cell for {field_name}: {e}")
 
     def apply_processed_cell_coloring(self, workbook, sheets_data, processing_options):
         """Apply cell coloring based on processing results: red for unfixed errors only"""
@@ -2818,7 +2747,8 @@ Your file is ready for bulk upload as-is!"""
         red_fill = PatternFill(start_color="FFFF0000", end_color="FFFF0000", fill_type="solid")  # Red for unfixed errors
         
         for sheet_name, sheet_data in sheets_data.items():
-            sheet = workbook[sheet_name]
+            self.progress.update('apply_processed_cell_coloring', sheet_name)
+            sheet = sheet_data['sheet']
             df = sheet_data['df']
             
             print(f"🎯 Processing sheet: {sheet_name}")
@@ -2855,13 +2785,12 @@ Your file is ready for bulk upload as-is!"""
         header_row = 3
         
         # Get column mapping
-        col_mapping = {}
-        for excel_col_idx in range(1, sheet.max_column + 1):
-            header_cell = sheet.cell(row=header_row, column=excel_col_idx)
-            if header_cell.value and str(header_cell.value).strip():
-                header_name = str(header_cell.value).strip()
-                if header_name in df.columns:
-                    col_mapping[header_name] = excel_col_idx
+        header_values = [sheet.cell(row=header_row, column=excel_col_idx).value
+                         for excel_col_idx in range(1, sheet.max_column + 1)]
+        col_mapping = map_header_columns(header_values, df.columns)
+        
+        end_rows = self.get_end_row_mask(df)
+        validator = self.get_sheet_validator(df)
         
         # Process each option for this sheet
         for option_name, option_data in sheet_options.items():
@@ -2883,125 +2812,48 @@ Your file is ready for bulk upload as-is!"""
             if excel_col is None:
                 continue
             
-            # Check each row and apply coloring
-            for idx in range(len(df)):
-                if self.is_end_row(df, idx):
-                    continue
-                
-                excel_row = data_start_row + idx
-                cell = sheet.cell(row=excel_row, column=excel_col)
-                value = df.loc[idx, target_column]
-                
-                # Check if this cell has issues that need red coloring
-                has_issues = self.cell_has_issues(value, option_name, sheet_type)
-                
-                if has_issues:
-                    # Cell has issues - color it red
-                    cell.fill = red_fill
-                    print(f"🔴 Colored error cell red in {sheet.title}, Row {excel_row}, Column {excel_col}: {option_name} (Value: '{value}')")
-                else:
-                    # Cell is valid - leave it uncolored (white)
-                    print(f"⚪ Cell not colored (valid) in {sheet.title}, Row {excel_row}, Column {excel_col}: {option_name} (Value: '{value}')")
+            # Evaluate the option's rule over the whole column and color the cells that still have issues
+            has_issues = validator.option_issues(option_name, target_column) & ~end_rows
+            for idx in np.flatnonzero(has_issues).tolist():
+                sheet.cell(row=data_start_row + idx, column=excel_col).fill = red_fill
+            
+            if self.verbosity >= VERBOSITY_CHANGES:
+                values = validator.values(target_column)
+                for idx in np.flatnonzero(~end_rows).tolist():
+                    excel_row = data_start_row + idx
+                    if has_issues[idx]:
+                        self.log_change_line(f"🔴 Colored error cell red in {sheet.title}, Row {excel_row}, Column {excel_col}: {option_name} (Value: '{values.value(idx)}')")
+                    else:
+                        self.log_change_line(f"⚪ Cell not colored (valid) in {sheet.title}, Row {excel_row}, Column {excel_col}: {option_name} (Value: '{values.value(idx)}')")
     
     def find_column_for_option(self, df, option_name, sheet_type):
         """Find the DataFrame column that corresponds to a processing option"""
-        # Map generic option names to actual column names
-        column_mapping = {
-            'organization': {
-                'Organization Name': ['organization name', 'org name', 'name'],
-                'Organization Short Name': ['organization short name', 'org short name', 'short name'],
-                'Principle Contact First Name': ['principle contact first name', 'contact first name', 'first name'],
-                'Principle Contact Last Name': ['principle contact last name', 'contact last name', 'last name'],
-                'Principle Contact NIC': ['principle contact nic', 'contact nic', 'nic'],
-                'Principle Contact Phone': ['principle contact phone', 'contact phone', 'phone'],
-                'Principle Contact Email': ['principle contact email', 'contact email', 'email'],
-                'Address': ['address', 'location address'],
-                'City': ['city', 'city name'],
-                'Province': ['province', 'state'],
-                'Country': ['country', 'country name'],
-                'Postal Code': ['postal code', 'zip code', 'zip'],
-                'Status': ['status', 'organization status'],
-                'Activity': ['activity', 'organization activity']
-            },
-            'divisions': {
-                'Division': ['division', 'division name'],
-                'Status': ['status', 'division status'],
-                'Activity': ['activity', 'division activity']
-            },
-            'human_resources': {
-                'Role': ['role', 'job role', 'position'],
-                'Designation': ['designation', 'job designation', 'title'],
-                'Operations': ['operations', 'operation', 'operational area'],
-                'Gender': ['gender', 'sex'],
-                'Create a User Account': ['create a user account', 'user account', 'account creation'],
-                'Status': ['status', 'employee status'],
-                'Activity': ['activity', 'employee activity']
-            },
-            'vehicles': {
-                'Division': ['division', 'vehicle division'],
-                'Vehicle Type': ['vehicle type', 'type', 'transport type'],
-                'Load Type': ['load type', 'cargo type'],
-                'Status': ['status', 'vehicle status'],
-                'Activity': ['activity', 'vehicle activity']
-            },
-            'locations': {
-                'Location Reference ID': ['location reference id', 'lrid', 'reference id'],
-                'Location Name': ['location name', 'name'],
-                'Status': ['status', 'location status'],
-                'Activity': ['activity', 'location activity']
-            }
-        }
-        
-        if sheet_type in column_mapping and option_name in column_mapping[sheet_type]:
-            # Look for exact matches first
-            for possible_name in column_mapping[sheet_type][option_name]:
-                for col in df.columns:
-                    if possible_name.lower() == col.lower():
-                        return col
-            
-            # Look for partial matches if no exact match
-            for possible_name in column_mapping[sheet_type][option_name]:
-                for col in df.columns:
-                    if possible_name.lower() in col.lower() or col.lower() in possible_name.lower():
-                        return col
-        
-        # Fallback: try to find by partial name matching
-        for col in df.columns:
-            if option_name.lower() in col.lower() or col.lower() in option_name.lower():
-                return col
-        
-        return None
+        # Memoized per header layout, so every sheet with the same template resolves it once
+        return find_option_column(tuple(df.columns), option_name, sheet_type)
     
     def cell_has_issues(self, value, option_name, sheet_type):
         """Check if a cell has validation issues"""
         if pd.isna(value) or str(value).strip() == '':
             return True
         
-        value_str = str(value).strip()
-        
-        # Check for specific validation rules - only for fields that have strict requirements
-        if option_name == 'Gender' and value_str not in ['Male', 'Female']:
-            return True
-        elif option_name == 'Create a User Account' and value_str not in ['TRUE', 'FALSE']:
-            # Also check for numeric representations that should be converted
-            if value_str in ['1', '0', '1.0', '0.0', 'True', 'False', 'true', 'false']:
-                return True  # These will be converted, so they're not final errors
-            return True
-        elif option_name == 'Division' and value_str != 'Admin':
-            return True
-        elif option_name == 'Status' and value_str not in ['Create', 'Update']:
+        # Fields with strict requirements must hold one of their allowed values; Role, Designation,
+        # Operations, etc. can have any non-empty value (see OPTION_ALLOWED_VALUES)
+        if option_name in OPTION_ALLOWED_VALUES and str(value).strip() not in OPTION_ALLOWED_VALUES[option_name]:
             return True
-        elif option_name == 'Activity' and value_str not in ['Create', 'Update']:
-            return True
-        
-        # For Role, Designation, and Operations - only flag as issue if empty
-        # These fields can have any non-empty value and should not be flagged as errors
-        # Role: Can be "Manager", "Driver", "Transporter", etc. - only empty is an issue
-        # Designation: Can be "Manager", "Transporter", etc. - only empty is an issue  
-        # Operations: Can be "Cisco", "Logicare", "Kenilworth", etc. - only empty is an issue
         
         return False
 
+def analyze_sheet_issues(analyzer_name, df, sheet_name, header_index, sheet_type):
+    """Worker entry point: run one analyzer and return its issues and {(row, col): comment} cells"""
+    corrector = ExcelCorrector()
+    corrector.issues_found = []
+    
+    # The analyzers only need the sheet's header index; the worksheet stays in the main process
+    corrector.header_indexes[sheet_name] = header_index
+    getattr(corrector, analyzer_name)(df, sheet_name, sheet_type)
+    
+    return corrector.issues_found, corrector.pending_issue_cells.get(sheet_name, {})
+
 def main():
     """Main function to run the correction"""
     corrector = ExcelCorrector()
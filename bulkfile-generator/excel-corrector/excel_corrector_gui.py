@@ -1,10 +1,14 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import os
+import queue
 import threading
 from datetime import datetime
 from excel_corrector import ExcelCorrector
 from processing_options_dialog import ProcessingOptionsDialog
+from job_queue_panel import JobQueuePanel
+from progress_events import (PROGRESS_POLL_MS, CorrectionCancelled, ProgressReporter, describe_progress,
+                             latest_progress)
 import sys
 
 class ExcelCorrectorGUI:
@@ -28,6 +32,10 @@ class ExcelCorrectorGUI:
         self.last_corrector = None  # Store last corrector for report access
         self.processing_options = None  # Store processing options
         
+        # Progress events from the worker thread (polled by the Tk loop) and its cancel flag
+        self.progress_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        
         # Create GUI
         self.create_widgets()
         
@@ -105,6 +113,14 @@ class ExcelCorrectorGUI:
         self.check_issues_button = ttk.Button(button_frame, text="Check Issues Only", command=self.check_issues_only, style='Big.TButton')
         self.check_issues_button.pack(side=tk.LEFT, padx=10)
         
+        # Cancel button (enabled while a file is being processed)
+        self.cancel_button = ttk.Button(button_frame, text="Cancel", command=self.cancel_processing, style='Big.TButton', state='disabled')
+        self.cancel_button.pack(side=tk.LEFT, padx=10)
+        
+        # Batch Queue button (many files on a pool of worker processes)
+        self.queue_button = ttk.Button(button_frame, text="Batch Queue...", command=self.open_job_queue, style='Big.TButton')
+        self.queue_button.pack(side=tk.LEFT, padx=10)
+        
         # View Report button
         self.report_button = ttk.Button(button_frame, text="View Full Report", command=self.view_full_report, style='Big.TButton')
         self.report_button.pack(side=tk.LEFT, padx=10)
@@ -274,10 +290,14 @@ Select an Excel file to begin processing..."""
         # Store the options
         self.processing_options = options_dialog.result
         
-        # Start processing in a separate thread
+        # Start processing in a separate thread and poll its progress
+        self.processing = True
+        self.cancel_event.clear()
+        latest_progress(self.progress_queue)
         thread = threading.Thread(target=self.process_file_thread)
         thread.daemon = True
         thread.start()
+        self.root.after(PROGRESS_POLL_MS, self.poll_progress)
     
     def process_file_thread(self):
         """Process file in a separate thread to avoid freezing UI"""
@@ -291,8 +311,8 @@ Select an Excel file to begin processing..."""
             output_filename = self.generate_output_filename(input_file)
             output_path = os.path.join(self.output_directory.get(), output_filename)
             
-            # Process the file with options
-            corrector = ExcelCorrector()
+            # Process the file with options, publishing progress and stopping at checkpoints when cancelled
+            corrector = ExcelCorrector(progress=ProgressReporter(self.progress_queue, self.cancel_event))
             corrector.correct_excel_file(input_file, output_path, self.processing_options)
             
             # Store corrector for report access
@@ -301,6 +321,9 @@ Select an Excel file to begin processing..."""
             # Update UI with success
             self.root.after(0, lambda: self.processing_complete(output_path, output_filename))
             
+        except CorrectionCancelled:
+            self.root.after(0, self.processing_cancelled)
+        
         except Exception as error:
             # Store the error message and update UI with error
             error_message = str(error)
@@ -312,9 +335,11 @@ Select an Excel file to begin processing..."""
     def start_processing_ui(self):
         """Update UI when processing starts"""
         self.progress_var.set("🔄 Processing file... Please wait...")
+        self.progress_bar.config(mode='indeterminate', value=0)
         self.progress_bar.start(10)
         # Keep process button enabled as requested by user
         self.browse_button.config(state='disabled')
+        self.cancel_button.config(state='normal')
         
         # Show selected options in the processing text
         options_text = self.get_processing_options_text()
@@ -392,9 +417,52 @@ Please wait while the file is processed..."""
         
         return text if text else "No specific options selected - using default processing"
     
+    def open_job_queue(self):
+        """Open the batch queue panel (outputs go to the selected output directory; it starts with the last chosen
+        options, shown and changeable in the panel)"""
+        JobQueuePanel(self.root, self.output_directory.get(), self.processing_options)
+    
+    def poll_progress(self):
+        """Show the newest progress event of the running file, then poll again while it runs"""
+        event = latest_progress(self.progress_queue)
+        if not self.processing:
+            return
+        
+        if event:
+            # The first event switches the bar from "busy" to the real percentage
+            if str(self.progress_bar.cget('mode')) != 'determinate':
+                self.progress_bar.stop()
+                self.progress_bar.config(mode='determinate', maximum=100)
+            self.progress_bar.config(value=event['percent'])
+            self.progress_var.set(describe_progress(event))
+        
+        self.root.after(PROGRESS_POLL_MS, self.poll_progress)
+    
+    def cancel_processing(self):
+        """Ask the running file to stop at its next checkpoint"""
+        if self.processing:
+            self.cancel_event.set()
+            self.cancel_button.config(state='disabled')
+            self.progress_var.set("⏹️ Cancelling... (stopping at the next checkpoint)")
+    
+    def processing_cancelled(self):
+        """Update UI when processing was cancelled"""
+        self.processing = False
+        self.progress_bar.stop()
+        self.progress_bar.config(mode='indeterminate', value=0)
+        self.progress_var.set("⏹️ Processing cancelled")
+        self.browse_button.config(state='normal')
+        self.cancel_button.config(state='disabled')
+        
+        self.update_results_text("""⏹️ PROCESSING CANCELLED
+
+The file was not saved. Select a file and click "Process & Fix File" to start again.""")
+
     def processing_complete(self, output_path, output_filename):
         """Update UI when processing completes successfully"""
         self.progress_bar.stop()
+        self.progress_bar.config(mode='determinate', value=100)
+        self.cancel_button.config(state='disabled')
         self.progress_var.set(f"✅ Success! File saved: {output_filename}")
         # Process button is always enabled
         self.browse_button.config(state='normal')
@@ -415,6 +483,10 @@ Please wait while the file is processed..."""
 
 📋 SUMMARY: File processed with your selected options applied."""
         
+        # Where the time went, stage by stage
+        if self.last_corrector:
+            success_text += f"\n\n⏱️ STAGE TIMINGS:\n{self.last_corrector.profiler.format_table()}"
+        
         self.update_results_text(success_text)
         
         # Show success dialog with option to open file location
@@ -439,6 +511,7 @@ Please wait while the file is processed..."""
         
         # Update UI
         self.progress_bar.stop()
+        self.cancel_button.config(state='disabled')
         self.progress_var.set("❌ Error occurred during processing")
         
         error_text = f"""❌ PROCESSING ERROR
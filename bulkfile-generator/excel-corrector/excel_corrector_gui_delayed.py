@@ -6,8 +6,11 @@ Excel Corrector GUI with delayed import to avoid hanging
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import os
+import queue
 import threading
 from datetime import datetime
+from progress_events import (PROGRESS_POLL_MS, CorrectionCancelled, ProgressReporter, describe_progress,
+                             latest_progress)
 
 class ExcelCorrectorGUI:
     def __init__(self, root):
@@ -30,6 +33,10 @@ class ExcelCorrectorGUI:
         self.last_corrector = None  # Store last corrector for report access
         self.processing_options = None  # Store processing options
         
+        # Progress events from the worker thread (polled by the Tk loop) and its cancel flag
+        self.progress_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        
         # Create GUI
         self.create_widgets()
         
@@ -107,6 +114,10 @@ class ExcelCorrectorGUI:
         self.check_issues_button = ttk.Button(button_frame, text="Check Issues Only", command=self.check_issues_only, style='Big.TButton')
         self.check_issues_button.pack(side=tk.LEFT, padx=10)
         
+        # Cancel button (enabled while a file is being processed or checked)
+        self.cancel_button = ttk.Button(button_frame, text="Cancel", command=self.cancel_processing, style='Big.TButton', state='disabled')
+        self.cancel_button.pack(side=tk.LEFT, padx=10)
+        
         # View Report button
         self.report_button = ttk.Button(button_frame, text="View Full Report", command=self.view_full_report, style='Big.TButton')
         self.report_button.pack(side=tk.LEFT, padx=10)
@@ -281,7 +292,7 @@ Select an Excel file to begin processing..."""
         self.processing = True
         self.process_button.config(state='disabled')
         self.check_issues_button.config(state='disabled')
-        self.progress_bar.start()
+        self.start_progress_polling()
         
         # Start processing thread
         process_thread = threading.Thread(target=self.process_file_thread, daemon=True)
@@ -297,17 +308,18 @@ Select an Excel file to begin processing..."""
             output_filename = self.generate_output_filename(input_file)
             output_path = os.path.join(self.output_directory.get(), output_filename)
             
-            # Create corrector instance
-            corrector = ExcelCorrector()
+            # Create corrector instance (progress goes to the queue polled by the GUI)
+            corrector = ExcelCorrector(progress=ProgressReporter(self.progress_queue, self.cancel_event))
             self.last_corrector = corrector
             
             # Process the file
-            self.progress_var.set("Processing file...")
             corrector.correct_excel_file(input_file, output_path, self.processing_options)
             
             # Update GUI on main thread
             self.root.after(0, self.processing_complete, output_path)
             
+        except CorrectionCancelled:
+            self.root.after(0, self.run_cancelled, "Processing")
         except Exception as e:
             # Handle errors on main thread
             self.root.after(0, self.processing_error, str(e))
@@ -315,16 +327,61 @@ Select an Excel file to begin processing..."""
             self.processing = False
             self.root.after(0, self.processing_finished)
     
+    def start_progress_polling(self):
+        """Show a busy bar until the worker's first progress event, and enable Cancel"""
+        self.cancel_event.clear()
+        latest_progress(self.progress_queue)
+        self.progress_var.set("Starting...")
+        self.progress_bar.config(mode='indeterminate', value=0)
+        self.progress_bar.start()
+        self.cancel_button.config(state='normal')
+        self.root.after(PROGRESS_POLL_MS, self.poll_progress)
+    
+    def poll_progress(self):
+        """Show the newest progress event of the running job, then poll again while it runs"""
+        event = latest_progress(self.progress_queue)
+        if not self.processing:
+            return
+        
+        if event:
+            if str(self.progress_bar.cget('mode')) != 'determinate':
+                self.progress_bar.stop()
+                self.progress_bar.config(mode='determinate', maximum=100)
+            self.progress_bar.config(value=event['percent'])
+            self.progress_var.set(describe_progress(event))
+        
+        self.root.after(PROGRESS_POLL_MS, self.poll_progress)
+    
+    def cancel_processing(self):
+        """Ask the running job to stop at its next checkpoint"""
+        if self.processing:
+            self.cancel_event.set()
+            self.cancel_button.config(state='disabled')
+            self.progress_var.set("Cancelling... (stopping at the next checkpoint)")
+    
+    def run_cancelled(self, job_name):
+        """Called when processing or an issues check was cancelled"""
+        self.progress_var.set(f"{job_name} cancelled")
+        self.progress_bar.stop()
+        self.progress_bar.config(mode='indeterminate', value=0)
+        
+        self.update_results_text(f"⏹️ {job_name} cancelled.\n\nNo output file was saved.")
+    
     def processing_complete(self, output_path):
         """Called when processing is complete"""
         self.progress_var.set("Processing complete!")
         self.progress_bar.stop()
+        self.progress_bar.config(mode='determinate', value=100)
         
         # Update results
         result_text = f"✅ File processed successfully!\n\n"
         result_text += f"📁 Output saved to:\n{output_path}\n\n"
         result_text += "🎉 All corrections have been applied according to your selected options!"
         
+        # Where the time went, stage by stage
+        if self.last_corrector:
+            result_text += f"\n\n⏱️ Stage timings:\n{self.last_corrector.profiler.format_table()}"
+        
         self.update_results_text(result_text)
         
         # Show success message
@@ -349,6 +406,7 @@ Select an Excel file to begin processing..."""
         """Called when processing thread finishes"""
         self.process_button.config(state='normal')
         self.check_issues_button.config(state='normal')
+        self.cancel_button.config(state='disabled')
     
     def check_issues_only(self):
         """Check for issues only without processing"""
@@ -370,7 +428,7 @@ Select an Excel file to begin processing..."""
         # Start checking in a separate thread
         self.processing = True
         self.check_issues_button.config(state='disabled')
-        self.progress_bar.start()
+        self.start_progress_polling()
         
         # Start checking thread
         check_thread = threading.Thread(target=self.check_issues_thread, daemon=True)
@@ -386,12 +444,11 @@ Select an Excel file to begin processing..."""
             output_filename = f"issues_{os.path.splitext(os.path.basename(input_file))[0]}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
             output_path = os.path.join(self.output_directory.get(), output_filename)
             
-            # Create corrector instance
-            corrector = ExcelCorrector()
+            # Create corrector instance (progress goes to the queue polled by the GUI)
+            corrector = ExcelCorrector(progress=ProgressReporter(self.progress_queue, self.cancel_event))
             self.last_corrector = corrector
             
             # Check for issues only - use the correct method name and pass directory
-            self.progress_var.set("Checking for issues...")
             result = corrector.check_issues_only(input_file, self.output_directory.get())
             
             # The method returns a tuple (file_path, report), extract the file path
@@ -403,6 +460,8 @@ Select an Excel file to begin processing..."""
             # Update GUI on main thread
             self.root.after(0, self.issues_check_complete, output_path)
             
+        except CorrectionCancelled:
+            self.root.after(0, self.run_cancelled, "Issues check")
         except Exception as e:
             # Handle errors on main thread
             self.root.after(0, self.issues_check_error, str(e))
@@ -414,12 +473,17 @@ Select an Excel file to begin processing..."""
         """Called when issues check is complete"""
         self.progress_var.set("Issues check complete!")
         self.progress_bar.stop()
+        self.progress_bar.config(mode='determinate', value=100)
         
         # Update results
         result_text = f"🔍 Issues check complete!\n\n"
         result_text += f"📁 Issues file saved to:\n{output_path}\n\n"
         result_text += "📊 Use 'View Full Report' to see detailed results."
         
+        # Where the time went, stage by stage
+        if self.last_corrector:
+            result_text += f"\n\n⏱️ Stage timings:\n{self.last_corrector.profiler.format_table()}"
+        
         self.update_results_text(result_text)
         
         # Show success message
@@ -443,6 +507,7 @@ Select an Excel file to begin processing..."""
     def issues_check_finished(self):
         """Called when issues check thread finishes"""
         self.check_issues_button.config(state='normal')
+        self.cancel_button.config(state='disabled')
     
     def view_full_report(self):
         """View the full processing report"""
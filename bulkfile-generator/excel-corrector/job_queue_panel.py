@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Excel File Corrector - Job Queue Panel
+Correct or check many workbooks on a bounded pool of worker processes, showing each file's result as it completes
+"""
+
+import multiprocessing
+import os
+import queue
+import time
+import tkinter as tk
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from tkinter import filedialog, messagebox, ttk
+
+from batch_corrector import collect_input_files, process_master_file, summarize_batch, write_summary
+from change_sinks import VERBOSITY_QUIET
+from processing_options_dialog import ProcessingOptionsDialog
+from progress_events import PROGRESS_POLL_MS
+
+# Job statuses, as shown in the queue
+STATUS_QUEUED = "⏳ Queued"
+STATUS_RUNNING = "🔄 Running"
+STATUS_DONE = "✅ Done"
+STATUS_FAILED = "❌ Failed"
+STATUS_CANCELLED = "⏹️ Cancelled"
+FINISHED_STATUSES = (STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED)
+
+# Default pool size: leave a core for the GUI
+DEFAULT_QUEUE_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+# In each pool worker: the queue its jobs report their start on (set by init_queue_worker)
+worker_started_queue = None
+
+def init_queue_worker(started_queue):
+    """Pool initializer: keep the queue the worker's jobs report their start on"""
+    global worker_started_queue
+    worker_started_queue = started_queue
+
+def run_queue_job(job_id, input_path, output_directory, mode, processing_options):
+    """Report the job as started, then process its file (the pool pre-queues calls, so a future's running()
+    does not mean a worker has picked the file up)"""
+    worker_started_queue.put(job_id)
+    return process_master_file(input_path, output_directory, mode, VERBOSITY_QUIET,
+                               processing_options=processing_options)
+
+def describe_options(processing_options):
+    """One line naming the fields the processing options correct (the options the queued files will use)"""
+    if not processing_options:
+        return "Options: default processing"
+    fields = [f"{option_name} + dummy data" if options['dummy_data'] else option_name
+              for sheet_options in processing_options.values()
+              for option_name, options in sheet_options.items() if options['correct']]
+    return "Options: " + (", ".join(fields) if fields else "no fields selected")
+
+class FileJobQueue:
+    """The files of the queue panel and their jobs on a process pool (no Tk, so it can run headless)"""
+    
+    def __init__(self, output_directory, workers=DEFAULT_QUEUE_WORKERS):
+        self.output_directory = output_directory
+        self.workers = workers
+        self.jobs = []
+        self.executor = None
+        self.started_queue = None
+        self.next_job_id = 1
+        self.started_at = None
+        self.start_time = None
+    
+    def add_files(self, inputs):
+        """Queue the workbooks of files, directories or globs that are not already waiting or running"""
+        active = {job['file'] for job in self.jobs if job['status'] not in FINISHED_STATUSES}
+        added = []
+        for path in collect_input_files(inputs):
+            if path in active:
+                continue
+            job = {'id': self.next_job_id, 'file': path, 'status': STATUS_QUEUED, 'mode': None,
+                   'future': None, 'record': None}
+            self.next_job_id += 1
+            self.jobs.append(job)
+            added.append(job)
+        return added
+    
+    def remove(self, job_ids):
+        """Drop jobs that are not running; returns the ids removed"""
+        removed = [job['id'] for job in self.jobs if job['id'] in job_ids and job['status'] != STATUS_RUNNING
+                   and (job['future'] is None or job['future'].cancel() or job['future'].done())]
+        self.jobs = [job for job in self.jobs if job['id'] not in removed]
+        return removed
+    
+    def clear_finished(self):
+        """Drop finished jobs; returns the ids removed"""
+        return self.remove([job['id'] for job in self.jobs if job['status'] in FINISHED_STATUSES])
+    
+    def start(self, mode='correct', processing_options=None, workers=None):
+        """Submit every queued job to the pool (started on first use, at most `workers` files at a time)"""
+        if not self.is_busy():
+            # A new run: the pool size may change between runs
+            if workers is not None and workers != self.workers and self.executor is not None:
+                self.executor.shutdown(wait=False)
+                self.executor = None
+            self.workers = workers or self.workers
+            self.started_at = datetime.now().isoformat(timespec='seconds')
+            self.start_time = time.perf_counter()
+        if self.executor is None:
+            if self.started_queue is None:
+                self.started_queue = multiprocessing.Queue()
+            self.executor = ProcessPoolExecutor(max_workers=max(self.workers, 1), initializer=init_queue_worker,
+                                                initargs=(self.started_queue,))
+        
+        submitted = []
+        for job in self.jobs:
+            if job['status'] == STATUS_QUEUED and job['future'] is None:
+                job['mode'] = mode
+                job['future'] = self.executor.submit(run_queue_job, job['id'], job['file'], self.output_directory,
+                                                     mode, processing_options)
+                submitted.append(job)
+        return submitted
+    
+    def started_job_ids(self):
+        """Ids of the jobs whose worker reported their start since the last call"""
+        started = set()
+        while self.started_queue is not None:
+            try:
+                started.add(self.started_queue.get_nowait())
+            except queue.Empty:
+                break
+        return started
+    
+    def poll(self):
+        """Move jobs to Running (from the workers' start reports) and to Done / Failed (from their futures);
+        returns the jobs whose status changed"""
+        started = self.started_job_ids()
+        changed = []
+        for job in self.jobs:
+            future = job['future']
+            if future is None or job['status'] in FINISHED_STATUSES:
+                continue
+            
+            if future.done():
+                if future.cancelled():
+                    job['status'] = STATUS_CANCELLED
+                else:
+                    try:
+                        job['record'] = future.result()
+                    except (BrokenProcessPool, OSError) as e:
+                        # The worker itself died (process_master_file catches errors inside the file)
+                        job['record'] = {'file': job['file'], 'mode': job['mode'], 'status': 'error',
+                                         'error': str(e), 'output_file': None, 'seconds': 0.0}
+                    job['status'] = STATUS_DONE if job['record']['status'] == 'ok' else STATUS_FAILED
+                changed.append(job)
+            elif job['id'] in started and job['status'] != STATUS_RUNNING:
+                job['status'] = STATUS_RUNNING
+                changed.append(job)
+        return changed
+    
+    def cancel_pending(self):
+        """Cancel the submitted jobs that have not started yet (running files finish)"""
+        cancelled = []
+        for job in self.jobs:
+            if job['status'] == STATUS_QUEUED and (job['future'] is None or job['future'].cancel()):
+                job['status'] = STATUS_CANCELLED
+                cancelled.append(job)
+        return cancelled
+    
+    def is_busy(self):
+        """Whether any submitted job has not finished"""
+        return any(job['future'] is not None and job['status'] not in FINISHED_STATUSES for job in self.jobs)
+    
+    def counts(self):
+        """Number of jobs per status"""
+        counts = {}
+        for job in self.jobs:
+            counts[job['status']] = counts.get(job['status'], 0) + 1
+        return counts
+    
+    def summary(self):
+        """Batch summary (same JSON layout as batch_corrector) of the finished jobs in the queue"""
+        records = [job['record'] for job in self.jobs if job['record'] is not None]
+        modes = {record['mode'] for record in records}
+        total_seconds = time.perf_counter() - self.start_time if self.start_time else 0.0
+        return summarize_batch(modes.pop() if len(modes) == 1 else 'mixed', self.workers, self.started_at,
+                               records, total_seconds)
+    
+    def shutdown(self):
+        """Cancel what has not started and let the pool exit once running files finish"""
+        self.cancel_pending()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+def job_result_text(job):
+    """Short result column text: change or issue count, or the error"""
+    record = job['record']
+    if record is None:
+        return ""
+    if record['status'] != 'ok':
+        return record.get('error', 'Error')
+    if record['mode'] == 'check':
+        return f"{record['issues']} issues"
+    return f"{record['total_changes']} changes"
+
+def open_path(path):
+    """Open a file or folder with the system's default application"""
+    try:
+        os.startfile(path)
+    except (AttributeError, OSError):
+        # Not Windows, or no application for the file
+        messagebox.showinfo("Output Location", path)
+
+class JobQueuePanel:
+    """Window listing queued workbooks with their status, timings and output, run on a process pool"""
+    
+    def __init__(self, parent, output_directory, processing_options=None):
+        self.parent = parent
+        self.processing_options = processing_options
+        self.job_queue = FileJobQueue(output_directory)
+        self.summary_path = None
+        
+        # Create the panel window (not modal: single files can still be processed meanwhile)
+        self.window = tk.Toplevel(parent)
+        self.window.title("Batch Queue")
+        self.window.geometry("900x500")
+        self.window.resizable(True, True)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        
+        self.mode = tk.StringVar(value='correct')
+        self.workers = tk.IntVar(value=DEFAULT_QUEUE_WORKERS)
+        self.status_var = tk.StringVar(value="Add workbooks to the queue, then click Start Queue.")
+        self.options_var = tk.StringVar(value=describe_options(processing_options))
+        
+        self.create_widgets()
+        self.window.after(PROGRESS_POLL_MS, self.poll_jobs)
+    
+    def create_widgets(self):
+        """Create the panel widgets"""
+        main_frame = ttk.Frame(self.window, padding="15")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Queue editing buttons
+        edit_frame = ttk.Frame(main_frame)
+        edit_frame.pack(fill=tk.X, pady=(0, 10))
+        ttk.Button(edit_frame, text="Add Files...", command=self.add_files).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(edit_frame, text="Add Folder...", command=self.add_folder).pack(side=tk.LEFT, padx=5)
+        ttk.Button(edit_frame, text="Remove Selected", command=self.remove_selected).pack(side=tk.LEFT, padx=5)
+        ttk.Button(edit_frame, text="Clear Finished", command=self.clear_finished).pack(side=tk.LEFT, padx=5)
+        
+        # Run settings
+        ttk.Label(edit_frame, text="Workers:").pack(side=tk.RIGHT, padx=(5, 0))
+        ttk.Spinbox(edit_frame, from_=1, to=max(os.cpu_count() or 1, 1), textvariable=self.workers,
+                    width=4).pack(side=tk.RIGHT)
+        ttk.Radiobutton(edit_frame, text="Check", variable=self.mode, value='check').pack(side=tk.RIGHT, padx=5)
+        ttk.Radiobutton(edit_frame, text="Correct", variable=self.mode, value='correct').pack(side=tk.RIGHT, padx=5)
+        
+        # Processing options the next started files will use
+        options_frame = ttk.Frame(main_frame)
+        options_frame.pack(fill=tk.X, pady=(0, 10))
+        ttk.Button(options_frame, text="Options...", command=self.choose_options).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Label(options_frame, textvariable=self.options_var, wraplength=760).pack(side=tk.LEFT, fill=tk.X)
+        
+        # Job list: file, status, time, result and output
+        tree_frame = ttk.Frame(main_frame)
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(tree_frame, columns=('status', 'seconds', 'result', 'output'), selectmode='extended')
+        for column, heading, width in [('#0', "File", 240), ('status', "Status", 110), ('seconds', "Seconds", 70),
+                                       ('result', "Result", 160), ('output', "Output", 280)]:
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor=tk.W)
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.bind("<Double-1>", lambda event: self.open_selected_output())
+        
+        # Run buttons and status line
+        run_frame = ttk.Frame(main_frame)
+        run_frame.pack(fill=tk.X, pady=(10, 0))
+        ttk.Button(run_frame, text="Start Queue", command=self.start).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(run_frame, text="Cancel Pending", command=self.cancel_pending).pack(side=tk.LEFT, padx=5)
+        ttk.Button(run_frame, text="Open Output", command=self.open_selected_output).pack(side=tk.LEFT, padx=5)
+        ttk.Label(run_frame, textvariable=self.status_var).pack(side=tk.LEFT, padx=(15, 0))
+    
+    def choose_options(self):
+        """Pick the processing options for the files started from now on"""
+        options_dialog = ProcessingOptionsDialog(self.window)
+        if options_dialog.result is not None:
+            self.processing_options = options_dialog.result
+            self.options_var.set(describe_options(self.processing_options))
+    
+    def add_files(self):
+        """Queue workbooks picked in a file dialog"""
+        paths = filedialog.askopenfilenames(
+            parent=self.window, title="Select Excel files",
+            filetypes=[("Excel files", "*.xlsx *.xlsm"), ("All files", "*.*")])
+        self.add_jobs(list(paths))
+    
+    def add_folder(self):
+        """Queue every workbook of a folder"""
+        folder = filedialog.askdirectory(parent=self.window, title="Select a folder of Excel files")
+        if folder:
+            self.add_jobs([folder])
+    
+    def add_jobs(self, inputs):
+        """Queue the inputs and list the new jobs"""
+        if not inputs:
+            return
+        for job in self.job_queue.add_files(inputs):
+            self.tree.insert('', tk.END, iid=str(job['id']), text=os.path.basename(job['file']),
+                             values=(job['status'], "", "", ""))
+        self.update_status()
+    
+    def remove_selected(self):
+        """Remove the selected jobs that are not running"""
+        for job_id in self.job_queue.remove([int(iid) for iid in self.tree.selection()]):
+            self.tree.delete(str(job_id))
+        self.update_status()
+    
+    def clear_finished(self):
+        """Remove done, failed and cancelled jobs from the list"""
+        for job_id in self.job_queue.clear_finished():
+            self.tree.delete(str(job_id))
+        self.update_status()
+    
+    def start(self):
+        """Submit the queued files to the worker pool"""
+        if not self.job_queue.is_busy():
+            self.summary_path = None
+        submitted = self.job_queue.start(self.mode.get(), self.processing_options, max(1, self.workers.get()))
+        if not submitted:
+            messagebox.showinfo("Batch Queue", "There are no queued files to start.", parent=self.window)
+        self.update_status()
+    
+    def cancel_pending(self):
+        """Cancel the files that have not started"""
+        for job in self.job_queue.cancel_pending():
+            self.show_job(job)
+        self.update_status()
+    
+    def open_selected_output(self):
+        """Open the output file of the selected job"""
+        for iid in self.tree.selection():
+            job = next(job for job in self.job_queue.jobs if job['id'] == int(iid))
+            if job['record'] and job['record'].get('output_file'):
+                open_path(job['record']['output_file'])
+                return
+        messagebox.showinfo("Batch Queue", "Select a finished file to open its output.", parent=self.window)
+    
+    def poll_jobs(self):
+        """Show jobs that started or finished since the last poll, then poll again"""
+        if not self.window.winfo_exists():
+            return
+        
+        was_busy = self.job_queue.is_busy()
+        changed = self.job_queue.poll()
+        for job in changed:
+            self.show_job(job)
+        if changed:
+            self.update_status()
+        
+        # Everything submitted has finished: keep a JSON summary next to the outputs
+        if was_busy and not self.job_queue.is_busy() and self.summary_path is None:
+            summary = self.job_queue.summary()
+            self.summary_path = write_summary(summary, output_directory=self.job_queue.output_directory)
+            self.update_status()
+        
+        self.window.after(PROGRESS_POLL_MS, self.poll_jobs)
+    
+    def show_job(self, job):
+        """Refresh one job's row"""
+        record = job['record'] or {}
+        seconds = f"{record['seconds']:.1f}" if record.get('seconds') else ""
+        self.tree.item(str(job['id']), values=(job['status'], seconds, job_result_text(job),
+                                               record.get('output_file') or ""))
+    
+    def update_status(self):
+        """One-line count of jobs per status"""
+        counts = self.job_queue.counts()
+        text = ", ".join(f"{count} {status}" for status, count in counts.items()) or "Queue is empty."
+        if self.summary_path:
+            text += f"  |  Summary: {os.path.basename(self.summary_path)}"
+        self.status_var.set(text)
+    
+    def close(self):
+        """Close the panel; files still running finish in the background, queued ones are cancelled"""
+        if self.job_queue.is_busy() and not messagebox.askyesno(
+                "Batch Queue", "Files are still being processed. Cancel the queued files and close?",
+                parent=self.window):
+            return
+        self.job_queue.shutdown()
+        self.window.destroy()
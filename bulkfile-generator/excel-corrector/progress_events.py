@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Excel File Corrector - Progress Events
+Publish a run's progress (stage, sheet, rows done/total) to a queue and stop the run at checkpoints once it is cancelled
+"""
+
+import queue
+
+# How often the GUIs poll the progress queue, in milliseconds
+PROGRESS_POLL_MS = 100
+
+class CorrectionCancelled(Exception):
+    """Raised at the next checkpoint once the run's cancel event is set"""
+
+class ProgressReporter:
+    """Puts progress events on a queue (queue.Queue or a multiprocessing queue) for the GUI to poll and checks the
+    cancel event (threading.Event or multiprocessing.Event) at every checkpoint; without either it does nothing"""
+    
+    def __init__(self, progress_queue=None, cancel_event=None):
+        self.progress_queue = progress_queue
+        self.cancel_event = cancel_event
+        self.sheets_done = 0
+        self.sheets_total = 0
+        self.percent = 0.0
+    
+    def begin_run(self, sheets_total=0):
+        """Start counting sheets for a new run"""
+        self.sheets_done = 0
+        self.sheets_total = sheets_total
+        self.percent = 0.0
+    
+    def sheet_done(self):
+        """One more sheet is finished"""
+        self.sheets_done += 1
+    
+    def checkpoint(self):
+        """Stop the run here if it was cancelled"""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise CorrectionCancelled("Processing was cancelled")
+    
+    def update(self, stage, sheet=None, rows_done=0, rows_total=0, checkpoint=True):
+        """Publish where the run is; a checkpoint first stops the run if it was cancelled"""
+        if checkpoint:
+            self.checkpoint()
+        if self.progress_queue is None:
+            return
+        
+        # Overall progress: one share per sheet plus one for highlighting and saving, the current share filled by
+        # the rows done. A sheet can go through several stages, so only checkpoints move the percentage, and
+        # never backwards.
+        if checkpoint and self.sheets_total:
+            stage_share = rows_done / rows_total if rows_total else 0.0
+            percent = min(100.0, 100.0 * (self.sheets_done + stage_share) / (self.sheets_total + 1))
+            self.percent = max(self.percent, percent)
+        self.progress_queue.put({
+            'stage': stage,
+            'sheet': sheet,
+            'rows_done': rows_done,
+            'rows_total': rows_total,
+            'sheets_done': self.sheets_done,
+            'sheets_total': self.sheets_total,
+            'percent': round(self.percent, 1)
+        })
+    
+    def stage_event(self, record, finished):
+        """StageProfiler listener: every stage start is a checkpoint, every stage end a progress update"""
+        self.update(record['stage'], record['sheet'], record['rows'] if finished else 0, record['rows'],
+                    checkpoint=not finished)
+
+def latest_progress(progress_queue):
+    """Empty the queue and return its newest event (None if it was empty); the GUI only shows the newest"""
+    event = None
+    while True:
+        try:
+            event = progress_queue.get_nowait()
+        except queue.Empty:
+            return event
+
+def describe_progress(event):
+    """One-line progress text for the GUI's progress label"""
+    text = f"🔄 {event['stage']}"
+    if event['sheet']:
+        text += f" - {event['sheet']}"
+    if event['rows_total']:
+        text += f": {event['rows_done']:,}/{event['rows_total']:,} rows"
+    if event['sheets_done'] < event['sheets_total']:
+        text += f" (sheet {event['sheets_done'] + 1} of {event['sheets_total']})"
+    return text
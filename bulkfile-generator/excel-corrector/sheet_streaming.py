@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Excel File Corrector - Sheet Streaming
+Read a sheet in row batches (openpyxl read-only mode) as DataFrames that match a whole-sheet parse
+"""
+
+import re
+import numpy as np
+import pandas as pd
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+from pandas.io.parsers import TextParser
+
+DEFAULT_BATCH_SIZE = 5000
+
+# What TextParser reads as booleans, and the integer ranges it sorts whole numbers into
+BOOL_STRINGS = {'True', 'TRUE', 'true', 'False', 'FALSE', 'false'}
+INT64_MIN, INT64_MAX, UINT64_MAX = -2 ** 63, 2 ** 63 - 1, 2 ** 64 - 1
+WHOLE_NUMBER_PATTERN = r'\s*[+-]?\d+\s*'
+
+# Value kinds that compare equal across types (True == 1 == 1.0), by type
+NUMBER_KIND_TYPES = {'bool': bool, 'int': int, 'negative int': int, 'uint64 int': int, 'huge int': int,
+                     'whole float': float, 'float': float}
+
+def convert_row(row):
+    """Convert a row of cells the way pandas' openpyxl reader does and trim trailing empty cells"""
+    converted_row = []
+    for cell in row:
+        value = cell.value
+        if value is None:
+            value = ''
+        elif cell.data_type == TYPE_ERROR:
+            value = float('nan')
+        elif cell.data_type == TYPE_NUMERIC:
+            # Whole numbers come back as int, the same as pandas' openpyxl reader
+            int_value = int(value)
+            if int_value == value:
+                value = int_value
+            else:
+                value = float(value)
+        converted_row.append(value)
+    
+    while converted_row and converted_row[-1] == '':
+        converted_row.pop()
+    return converted_row
+
+def iter_data_rows(sheet, header_row=3):
+    """Yield (cells, converted row) for every row after the header, dropping trailing empty rows"""
+    blank_rows = []
+    for row_number, row in enumerate(sheet.iter_rows(min_row=header_row + 1)):
+        converted_row = convert_row(row)
+        if not converted_row:
+            # Empty rows only count once a row with data follows them
+            blank_rows.append((row, converted_row))
+            continue
+        yield from blank_rows
+        blank_rows = []
+        yield row, converted_row
+
+def read_header(sheet, header_row=3):
+    """Return (raw values, converted values) of the header row, or None if the sheet is shorter"""
+    for row in sheet.iter_rows(min_row=header_row, max_row=header_row):
+        return [cell.value for cell in row], convert_row(row)
+    return None
+
+def iter_batches(rows, batch_size):
+    """Group an iterator of rows into lists of at most batch_size rows"""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def parse_batch(header, converted_rows, width, dtype=None):
+    """Parse header + rows (padded to width) with TextParser, as sheet_to_dataframe does for a whole sheet"""
+    data = [row + [''] * (width - len(row)) for row in [header] + converted_rows]
+    return TextParser(data, header=0, skip_blank_lines=False, dtype=dtype).read()
+
+def int_kind(value):
+    """Kind of a whole number by the int64/uint64 ranges TextParser sorts it into"""
+    if value < INT64_MIN or value > UINT64_MAX:
+        return 'huge int'
+    if value < 0:
+        return 'negative int'
+    return 'uint64 int' if value > INT64_MAX else 'int'
+
+def batch_value_kinds(values, parsed_values):
+    """{kind: first position} of one batch column's converted values, where parsed_values are the same
+    values parsed as object (so NaN marks what TextParser reads as missing)"""
+    kinds = {}
+    text_positions = []
+    for position, (value, is_missing) in enumerate(zip(values, pd.isna(parsed_values))):
+        if is_missing:
+            kind = 'nan' if isinstance(value, float) else 'missing text'
+        elif isinstance(value, str):
+            if value not in BOOL_STRINGS:
+                text_positions.append(position)
+                continue
+            kind = 'bool text'
+        elif isinstance(value, bool):
+            kind = 'bool'
+        elif isinstance(value, int):
+            kind = int_kind(value)
+        elif isinstance(value, float):
+            kind = 'whole float' if value.is_integer() and INT64_MIN <= value <= INT64_MAX else 'float'
+        else:
+            kind = type(value)
+        kinds.setdefault(kind, position)
+    
+    if text_positions:
+        # Text that reads as a number counts as that number (whole only without a point or exponent)
+        texts = np.array([values[position] for position in text_positions], dtype=object)
+        numbers = np.asarray(pd.to_numeric(texts, errors='coerce'), dtype=float)
+        for index in np.flatnonzero(np.isnan(numbers))[:1]:
+            kinds.setdefault('text', text_positions[index])
+        for index in np.flatnonzero(~np.isnan(numbers)):
+            if re.fullmatch(WHOLE_NUMBER_PATTERN, texts[index]):
+                kind = int_kind(numbers[index]) + ' text'
+            else:
+                kind = 'float text'
+            kinds.setdefault(kind, text_positions[index])
+    return kinds
+
+def numeric_parse_fails(samples):
+    """Whether TextParser gives up reading a column with these {kind: value} samples as numbers (only then
+    does it swap each value for the first equal one it read)"""
+    values = [np.nan if kind == 'missing text' else value for kind, value in samples.items()]
+    try:
+        pd.to_numeric(pd.Series(values, dtype=object))
+    except (ValueError, TypeError):
+        return True
+    return False
+
+class SheetLayout:
+    """What a whole-sheet parse would decide, collected in one streaming pass: width and, per column, the
+    first value of each kind that TextParser's type inference depends on"""
+    
+    def __init__(self, sheet, header_row=3, batch_size=DEFAULT_BATCH_SIZE):
+        self.header_row = header_row
+        self.batch_size = batch_size
+        self.width = 0
+        self.row_count = 0
+        self.samples = []
+        
+        header = read_header(sheet, header_row)
+        self.raw_header, self.header = header if header is not None else ([], None)
+        if self.header is None:
+            return
+        
+        self.width = len(self.header)
+        for batch in iter_batches(iter_data_rows(sheet, header_row), batch_size):
+            converted_rows = [converted_row for _, converted_row in batch]
+            self.width = max([self.width] + [len(row) for row in converted_rows])
+            self.add_batch(converted_rows)
+            self.row_count += len(batch)
+    
+    def add_batch(self, converted_rows):
+        """Fold one batch's value kinds into the column samples"""
+        # Columns a batch widens the sheet to were padded with '' in every earlier row
+        for _ in range(len(self.samples), self.width):
+            self.samples.append({'missing text': ''} if self.row_count else {})
+        
+        values = np.empty((len(converted_rows), self.width), dtype=object)
+        values[:] = [row + [''] * (self.width - len(row)) for row in converted_rows]
+        parsed = parse_batch(self.header, converted_rows, self.width, dtype=object)
+        for position, samples in enumerate(self.samples):
+            column = values[:, position]
+            for kind, row_idx in batch_value_kinds(column, parsed.iloc[:, position].to_numpy()).items():
+                samples.setdefault(kind, column[row_idx])
+    
+    def header_index(self):
+        """{header text: first column index}, the same map read_header_index builds from a loaded sheet"""
+        header_index = {}
+        for col_idx, value in enumerate(self.raw_header, 1):
+            if value and str(value).strip():
+                header_index.setdefault(str(value).strip(), col_idx)
+        return header_index
+    
+    def sample_rows(self):
+        """The column samples as rows, a short column repeating its first value"""
+        samples = [list(column_samples.values()) for column_samples in self.samples]
+        return [[column[row_idx] if row_idx < len(column) else column[0] for column in samples]
+                for row_idx in range(max(len(column) for column in samples))]
+    
+    def iter_frames(self, sheet):
+        """Yield (rows of cells, DataFrame) per batch; the DataFrame index holds the whole-sheet row positions"""
+        if self.header is None or not self.row_count:
+            return
+        
+        # Inference depends on which kinds of value a column holds (and its first value), so every batch is
+        # parsed after the samples: each column then converts the way the whole-sheet parse converts it
+        header = self.header + [''] * (self.width - len(self.header))
+        sample_rows = self.sample_rows()
+        sample_frame = parse_batch(header, sample_rows, self.width)
+        
+        # A whole-sheet parse also swaps each text column value for the first equal value it read, so
+        # 1 reads as True after a True (and 12345.0 as 12345): text columns mixing bools, whole numbers and
+        # decimals keep the first value of each across batches
+        interned = {}
+        for position, column_samples in enumerate(self.samples):
+            number_types = {NUMBER_KIND_TYPES[kind] for kind in column_samples if kind in NUMBER_KIND_TYPES}
+            if (sample_frame.dtypes.iloc[position] == object and len(number_types) > 1
+                    and numeric_parse_fails(column_samples)):
+                interned[position] = {}
+        
+        start = 0
+        rows = iter_data_rows(sheet, self.header_row)
+        for batch in iter_batches((row for _, row in zip(range(self.row_count), rows)), self.batch_size):
+            converted_rows = [converted_row for _, converted_row in batch]
+            df = parse_batch(header, sample_rows + converted_rows, self.width).iloc[len(sample_rows):]
+            for position, first_values in interned.items():
+                column = df.iloc[:, position].to_numpy(dtype=object, copy=True)
+                for row_idx, converted_row in enumerate(converted_rows):
+                    value = converted_row[position] if position < len(converted_row) else ''
+                    if not isinstance(value, str) and not pd.isna(column[row_idx]):
+                        column[row_idx] = first_values.setdefault(value, value)
+                # An explicit object Series, or a batch holding only dates would turn into datetime64
+                df.isetitem(position, pd.Series(column, index=df.index, dtype=object))
+            df.index = pd.RangeIndex(start, start + len(df))
+            start += len(df)
+            yield [cells for cells, _ in batch], df
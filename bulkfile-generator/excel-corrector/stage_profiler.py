@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Excel File Corrector - Stage Profiler
+Record the wall time, rows processed and peak memory of each stage of a correction or check run
+"""
+
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows has no resource module: memory is only reported when traced
+    resource = None
+
+def max_rss_mb():
+    """The process's peak resident memory so far in MB, or None where it cannot be read"""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+
+class StageProfiler:
+    """Timings of the stages of the last run. Peak memory is the Python heap peak within each stage when
+    track_memory is set (tracemalloc, which slows the run down), otherwise the process's peak RSS so far"""
+    
+    def __init__(self, track_memory=False, listener=None):
+        self.track_memory = track_memory
+        # Called as listener(record, finished) when a stage starts and when it ends without an error
+        self.listener = listener
+        self.stages = []
+        self.run_start = None
+        self.total_seconds = 0.0
+        self.started_tracing = False
+        # Record of the stage running now, for detail()
+        self.current = None
+    
+    @property
+    def memory_source(self):
+        """What the peak_mb figures measure: 'tracemalloc', 'rss' or None"""
+        if self.track_memory:
+            return 'tracemalloc'
+        return 'rss' if resource is not None else None
+    
+    def begin_run(self):
+        """Forget the previous run's stages and start tracing memory if asked to"""
+        self.stages = []
+        self.total_seconds = 0.0
+        self.run_start = time.perf_counter()
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+    
+    def end_run(self):
+        """Record the run's total time and stop tracing if this profiler started it"""
+        if self.run_start is not None:
+            self.total_seconds = time.perf_counter() - self.run_start
+            self.run_start = None
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+    
+    @contextmanager
+    def stage(self, name, sheet=None, rows=0):
+        """Time the enclosed block as one stage (stages do not nest); the yielded record's rows can be set inside"""
+        record = {'stage': name, 'sheet': sheet, 'rows': rows, 'seconds': 0.0, 'peak_mb': None}
+        if self.listener is not None:
+            self.listener(record, False)
+        tracing = self.track_memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        self.current = record
+        try:
+            yield record
+        finally:
+            self.current = None
+            record['seconds'] = time.perf_counter() - start
+            if tracing:
+                record['peak_mb'] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            else:
+                record['peak_mb'] = max_rss_mb()
+            self.stages.append(record)
+        if self.listener is not None:
+            self.listener(record, True)
+    
+    def detail(self, **values):
+        """Add figures (step timings, counts) to the running stage's 'detail'; does nothing outside a stage"""
+        if self.current is not None:
+            self.current.setdefault('detail', {}).update(values)
+    
+    def summary(self):
+        """The last run's stages (rounded), total time and overall peak memory"""
+        stages = []
+        for record in self.stages:
+            stage = dict(record, seconds=round(record['seconds'], 4),
+                         peak_mb=None if record['peak_mb'] is None else round(record['peak_mb'], 2))
+            if 'detail' in record:
+                stage['detail'] = {key: round(value, 4) if isinstance(value, float) else value
+                                   for key, value in record['detail'].items()}
+            stages.append(stage)
+        peaks = [record['peak_mb'] for record in self.stages if record['peak_mb'] is not None]
+        return {
+            'stages': stages,
+            'total_seconds': round(self.total_seconds, 4),
+            'peak_mb': round(max(peaks), 2) if peaks else None,
+            'memory_source': self.memory_source
+        }
+    
+    def format_table(self):
+        """The last run's stages as a plain text table (slowest stage marked)"""
+        if not self.stages:
+            return "No stage timings recorded."
+        
+        slowest = max(self.stages, key=lambda record: record['seconds'])
+        labels = [record['stage'] if not record['sheet'] else f"{record['stage']} [{record['sheet']}]"
+                  for record in self.stages]
+        width = max(len(label) for label in labels)
+        memory_header = {'tracemalloc': 'Peak MB', 'rss': 'Max RSS MB'}.get(self.memory_source, 'Memory')
+        rule = "-" * (width + 42)
+        lines = [f"{'Stage':<{width}} {'Seconds':>9} {'Rows':>8} {'Rows/s':>10} {memory_header:>11}", rule]
+        for label, record in zip(labels, self.stages):
+            rate = f"{record['rows'] / record['seconds']:,.0f}" if record['rows'] and record['seconds'] > 0 else "-"
+            memory = "-" if record['peak_mb'] is None else f"{record['peak_mb']:.1f}"
+            marker = " ◀" if record is slowest else ""
+            lines.append(f"{label:<{width}} {record['seconds']:>9.3f} {record['rows']:>8} {rate:>10} {memory:>11}{marker}")
+        lines.append(rule)
+        total_seconds = self.total_seconds or sum(record['seconds'] for record in self.stages)
+        lines.append(f"{'Total':<{width}} {total_seconds:>9.3f}")
+        
+        # Stage details underneath, e.g. the time of each Divisions fix and the number of organizations
+        for label, record in zip(labels, self.stages):
+            if record.get('detail'):
+                figures = ", ".join(f"{key} {value:.3f}" if isinstance(value, float) else f"{key} {value}"
+                                    for key, value in record['detail'].items())
+                lines.append(f"  {label}: {figures}")
+        return "\n".join(lines)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for the headless batch runner (directory input, worker pool and JSON summary).
+"""
+
+import json
+import sys
+import os
+import tempfile
+import zipfile
+from openpyxl import Workbook
+
+# Add the excel-corrector directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import batch_corrector
+
+def create_sample_workbook(file_path, org_short_name):
+    """Create a small Human Resources master file with one empty NIC"""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Human Resources"
+    for col_idx, header in enumerate(['Organization Short Name', 'First Name', 'NIC', 'Email', 'Activity'], 1):
+        sheet.cell(row=3, column=col_idx, value=header)
+    sheet.cell(row=4, column=1, value=org_short_name)
+    sheet.cell(row=4, column=2, value='Kamal')
+    sheet.cell(row=4, column=4, value='kamal@x.com')
+    sheet.cell(row=5, column=1, value='END')
+    workbook.save(file_path)
+
+def test_batch_corrector():
+    """Every workbook in the directory is processed and reported in the summary"""
+    print("Testing batch corrector...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_dir = os.path.join(temp_dir, "input")
+        output_dir = os.path.join(temp_dir, "output")
+        os.makedirs(input_dir)
+        for org_short_name in ['ORG1', 'ORG2']:
+            create_sample_workbook(os.path.join(input_dir, f"{org_short_name}.xlsx"), org_short_name)
+        # Lock files and non-Excel files are ignored
+        open(os.path.join(input_dir, "~$ORG1.xlsx"), 'w').close()
+        open(os.path.join(input_dir, "notes.txt"), 'w').close()
+        
+        for mode in ['correct', 'check']:
+            summary_path = os.path.join(temp_dir, f"{mode}_summary.json")
+            exit_code = batch_corrector.main([input_dir, "--mode", mode, "--workers", "2",
+                                              "--output-dir", output_dir, "--summary", summary_path])
+            assert exit_code == 0
+            
+            with open(summary_path, encoding='utf-8') as f:
+                summary = json.load(f)
+            print(json.dumps(summary, indent=2))
+            
+            assert summary['total_files'] == 2
+            assert summary['failed_files'] == 0
+            assert [os.path.basename(record['file']) for record in summary['files']] == ['ORG1.xlsx', 'ORG2.xlsx']
+            for record in summary['files']:
+                assert os.path.exists(record['output_file'])
+                if mode == 'correct':
+                    assert record['total_changes'] > 0
+                else:
+                    assert record['issues'] > 0
+    
+    print("Batch corrector OK")
+
+def add_vba_project(file_path):
+    """Turn a saved .xlsx into a macro-enabled package with a (dummy) xl/vbaProject.bin"""
+    with zipfile.ZipFile(file_path) as archive:
+        parts = {name: archive.read(name) for name in archive.namelist()}
+    parts['[Content_Types].xml'] = parts['[Content_Types].xml'].replace(
+        b'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml',
+        b'application/vnd.ms-excel.sheet.macroEnabled.main+xml')
+    parts['xl/vbaProject.bin'] = b'dummy vba project'
+    with zipfile.ZipFile(file_path, 'w') as archive:
+        for name, data in parts.items():
+            archive.writestr(name, data)
+
+def test_same_name_inputs_and_macros():
+    """Same-named masters from two folders get separate outputs, and .xlsm masters keep their macros"""
+    print("Testing same-name inputs and macro-enabled masters...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_dir = os.path.join(temp_dir, "output")
+        for folder in ['client_a', 'client_b']:
+            os.makedirs(os.path.join(temp_dir, folder))
+            create_sample_workbook(os.path.join(temp_dir, folder, "master.xlsx"), folder.upper())
+        macro_path = os.path.join(temp_dir, "client_a", "macros.xlsm")
+        create_sample_workbook(macro_path, 'MACRO')
+        add_vba_project(macro_path)
+        
+        summary_path = os.path.join(temp_dir, "summary.json")
+        exit_code = batch_corrector.main([os.path.join(temp_dir, "client_*", "*.xls*"), "--output-dir", output_dir,
+                                          "--change-sink", "jsonl", "--summary", summary_path])
+        assert exit_code == 0
+        
+        with open(summary_path, encoding='utf-8') as f:
+            summary = json.load(f)
+        assert summary['total_files'] == 3 and summary['failed_files'] == 0
+        output_files = [record['output_file'] for record in summary['files']]
+        assert len(set(output_files)) == 3
+        assert len([name for name in os.listdir(output_dir) if name.endswith('_changes.jsonl')]) == 3
+        
+        macro_output = [path for path in output_files if path.endswith('.xlsm')]
+        assert len(macro_output) == 1
+        with zipfile.ZipFile(macro_output[0]) as archive:
+            assert archive.read('xl/vbaProject.bin') == b'dummy vba project'
+    
+    print("Same-name inputs and macro-enabled masters OK")
+
+if __name__ == "__main__":
+    test_batch_corrector()
+    test_same_name_inputs_and_macros()
+    print("\n\nTesting completed!")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the benchmark master-file generator and the JSON baseline comparison.
+"""
+
+import contextlib
+import io
+import json
+import shutil
+import sys
+import os
+import tempfile
+from openpyxl import load_workbook
+
+# Add the excel-corrector directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_corrector import MASTER_SHEETS, generate_master_file, main as benchmark_main
+
+def test_generated_master_file():
+    """Five sheets with headers in row 3, an END row, red HR cells, empty and duplicate NICs"""
+    print("Testing benchmark master file generator...")
+    
+    work_dir = tempfile.mkdtemp()
+    try:
+        path = generate_master_file(os.path.join(work_dir, "master.xlsx"), 200, seed=3)
+        workbook = load_workbook(path)
+        assert workbook.sheetnames == list(MASTER_SHEETS)
+        for sheet_name, headers in MASTER_SHEETS.items():
+            sheet = workbook[sheet_name]
+            assert [cell.value for cell in sheet[3]][:len(headers)] == headers
+            assert sheet.cell(row=204, column=1).value == 'END'
+        
+        hr_sheet = workbook['Human Resources']
+        nic_cells = [row[3] for row in hr_sheet.iter_rows(min_row=4, max_row=203)]
+        nics = [cell.value for cell in nic_cells if cell.value is not None]
+        assert len(nics) < 200 and len(set(nics)) < len(nics)
+        assert any(cell.fill.fgColor.rgb == 'FFFF0000' for cell in nic_cells)
+    finally:
+        shutil.rmtree(work_dir)
+    
+    print("Benchmark master file generator OK")
+
+def test_baseline_comparison():
+    """The first run writes the baseline, a run against a much faster baseline reports regressions"""
+    print("Testing benchmark baseline comparison...")
+    
+    work_dir = tempfile.mkdtemp()
+    try:
+        baseline_path = os.path.join(work_dir, 'baseline.json')
+        arguments = ['--rows', '20', '--work-dir', work_dir, '--baseline', baseline_path]
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert benchmark_main(arguments) == 0
+        with open(baseline_path, encoding='utf-8') as f:
+            baseline = json.load(f)
+        assert [(result['operation'], result['rows_per_sheet']) for result in baseline['results']] == \
+            [('correct', 20), ('check', 20)]
+        assert all(result['rows_per_second'] > 0 and result['stages'] for result in baseline['results'])
+        
+        # Pretend the baseline was a hundred times faster
+        for result in baseline['results']:
+            result['rows_per_second'] *= 100
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f)
+        console = io.StringIO()
+        with contextlib.redirect_stdout(console):
+            assert benchmark_main(arguments) == 1
+        assert "2 throughput regression(s)" in console.getvalue()
+    finally:
+        shutil.rmtree(work_dir)
+    
+    print("Benchmark baseline comparison OK")
+
+if __name__ == "__main__":
+    test_generated_master_file()
+    test_baseline_comparison()
+    print("\n\nTesting completed!")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the column-block sheet writer keeps values, text booleans and cell formatting.
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+from openpyxl import Workbook
+from openpyxl.styles import PatternFill
+
+# Add the excel-corrector directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_corrector import ExcelCorrector
+
+def test_bulk_sheet_writer():
+    """Mapped columns are rewritten, unmapped ones untouched and fills preserved"""
+    print("Testing column-block sheet writer...")
+    
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Human Resources"
+    headers = ['Organization Short Name', 'NIC', 'Notes', 'Create a User Account']
+    for col_idx, header in enumerate(headers, 1):
+        sheet.cell(row=3, column=col_idx, value=header)
+    red_fill = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")
+    sheet.cell(row=5, column=2, value='old').fill = red_fill
+    sheet.cell(row=4, column=3, value='keep me')
+    
+    df = pd.DataFrame({
+        'Organization Short Name': ['ORG1', 'ORG2', np.nan],
+        'NIC': [12345, 'DUMMY001ORG2', np.nan],
+        'Create a User Account': [1, 'false', np.nan]
+    })
+    
+    corrector = ExcelCorrector()
+    corrector.update_sheet_with_preserved_formatting(sheet, df)
+    
+    assert [sheet.cell(row=r, column=1).value for r in range(4, 7)] == ['ORG1', 'ORG2', None]
+    assert [sheet.cell(row=r, column=2).value for r in range(4, 7)] == [12345, 'DUMMY001ORG2', None]
+    assert [sheet.cell(row=r, column=4).value for r in range(4, 7)] == ['TRUE', 'FALSE', None]
+    assert sheet.cell(row=4, column=3).value == 'keep me'
+    assert sheet.cell(row=5, column=2).fill.start_color.rgb == red_fill.start_color.rgb
+    
+    print("\n\nTesting completed!")
+
+if __name__ == "__main__":
+    test_bulk_sheet_writer()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the change report renders the text layout and streams Markdown/HTML reports to files.
+"""
+
+import io
+import shutil
+import sys
+import os
+import tempfile
+
+# Add the excel-corrector directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_corrector import ExcelCorrector
+from change_report import ENTRY_CHUNK
+
+def make_corrector(changes=3):
+    """A corrector holding a few Vehicles changes and one HR red cell change of each kind"""
+    corrector = ExcelCorrector()
+    for idx in range(changes):
+        corrector.log_detailed_change('Vehicles', 'Division Correction', f'Row {idx + 4}', 'Division',
+                                      'Ops', 'Admin', '<Org & Co>')
+    corrector.log_hr_red_cell_change('Dummy NIC Generated', 0, 'ORG1', 'Empty', 'DUMMY001ORG1')
+    corrector.log_hr_red_cell_change('Both Red - No Change', 1, 'ORG2')
+    corrector.log_hr_red_cell_change('NIC Red - Prefix', 2, 'ORG3', '123V', 'BULK123V')
+    return corrector
+
+def test_text_layout():
+    """The text reports keep the console layout"""
+    print("Testing text report layout...")
+    
+    corrector = make_corrector()
+    hr_report = corrector.generate_hr_red_cell_report()
+    assert hr_report.startswith("\n" + "=" * 80 + "\n            HR RED CELL DETECTION REPORT\n")
+    assert "  Total HR changes: 3\n  Dummy NICs generated: 1\n  Dummy Emails generated: 0\n" in hr_report
+    assert ("DUMMY NICs GENERATED:\n" + "-" * 60 + "\n  Organization: ORG1\n  Row: 4 (Excel row)\n"
+            "  Original: 'Empty'\n  Generated: 'DUMMY001ORG1'\n\n") in hr_report
+    assert "  Action: No changes made\n" in hr_report
+    assert hr_report.endswith("• Confirm red cells indicate existing system records\n\n" + "=" * 80 + "\n")
+    assert ExcelCorrector().generate_hr_red_cell_report() == "No HR red cell changes were made."
+    
+    report = corrector.generate_comprehensive_report()
+    assert "DETAILED CHANGES MADE (3 changes):\n" in report
+    assert ("\n📝 Division Correction (3 changes):\n    " + "-" * 50 + "\n    • <Org & Co> - Row 4\n"
+            "      Field: Division\n      BEFORE: 'Ops'\n      AFTER:  'Admin'\n") in report
+    assert "📍 ORG2 - Row 5\n   Change Type: Both Red - No Change\n   Original: 'None'\n" in report
+    assert report.endswith("✅ RESULT: File ready for bulk upload with all formatting preserved!\n" + "=" * 80 + "\n")
+    
+    stats = corrector.get_detailed_stats()['processing_details']
+    assert (stats['dummy_nics_generated'], stats['both_red_detected'], stats['nic_prefixes_added']) == (1, 1, 1)
+    
+    print("Text report layout OK")
+
+def test_streamed_formats():
+    """Reports streamed to .txt/.md/.html files equal the rendered strings, HTML values are escaped"""
+    print("Testing streamed report formats...")
+    
+    corrector = make_corrector(changes=ENTRY_CHUNK * 2 + 5)
+    work_dir = tempfile.mkdtemp()
+    try:
+        for extension, report_format in [('txt', 'text'), ('md', 'markdown'), ('html', 'html')]:
+            path = corrector.write_change_report(os.path.join(work_dir, f"report.{extension}"))
+            with open(path, encoding='utf-8') as f:
+                assert f.read() == corrector.generate_comprehensive_report(report_format), report_format
+        
+        markdown = corrector.generate_comprehensive_report('markdown')
+        assert "## SHEET: VEHICLES" in markdown and "- **• <Org & Co> - Row 4**\n  Field: Division  \n" in markdown
+        
+        html_report = corrector.generate_comprehensive_report('html')
+        assert html_report.startswith("<!DOCTYPE html>") and html_report.endswith("</html>\n")
+        assert "&lt;Org &amp; Co&gt;" in html_report and "<Org" not in html_report
+        assert html_report.count("<li>") == ENTRY_CHUNK * 2 + 5 + 3
+        
+        # An open stream gets the same chunks
+        stream = corrector.write_change_report(io.StringIO(), 'hr_red_cell')
+        assert stream.getvalue() == corrector.generate_hr_red_cell_report()
+    finally:
+        shutil.rmtree(work_dir)
+    
+    print("Streamed report formats OK")
+
+if __name__ == "__main__":
+    test_text_layout()
+    test_streamed_formats()
+    print("\n\nTesting completed!")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test script for the pluggable change sinks (ring buffer, counters only, JSONL file) and quiet console output.
+"""
+
+import contextlib
+import io
+import json
+import sys
+import os
+import tempfile
+from openpyxl import Workbook
+
+# Add the excel-corrector directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_corrector import create_change_sink
+from change_sinks import (ChangeStore, CounterChangeSink, JsonlChangeSink, MemoryChangeSink, VERBOSITY_QUIET,
+                          change_type_counts)
+from excel_corrector import ExcelCorrector
+
+def create_sample_workbook(file_path, rows=30):
+    """Create an Organization Details sheet where every row needs several fixes"""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Organization Details"
+    for col_idx, header in enumerate(['Organization Name', 'Organization Short Name', 'Status', 'State', 'Country'], 1):
+        sheet.cell(row=3, column=col_idx, value=header)
+    for row_idx in range(4, 4 + rows):
+        sheet.cell(row=row_idx, column=1, value=f"Org {row_idx}")
+        sheet.cell(row=row_idx, column=4, value='gampaha')
+    sheet.cell(row=4 + rows, column=1, value='END')
+    workbook.save(file_path)
+
+def change_counts(corrector):
+    """Count the changes per category as the reports see them"""
+    counts = {sheet_key: len(changes) for sheet_key, changes in corrector.detailed_changes.items()}
+    counts['state_changes'] = len(corrector.state_changes)
+    return counts
+
+def test_ring_buffer_store():
+    """The ring buffer reports every change in len() but keeps only the newest records"""
+    store = ChangeStore('organization', max_records=3)
+    for i in range(10):
+        store.append({'row_info': f"Row {i + 4}", 'change_type': 'Dummy NIC Generated' if i < 7 else 'NIC Red - Prefix'})
+    assert len(store) == 10
+    assert [change['row_info'] for change in store] == ['Row 11', 'Row 12', 'Row 13']
+    assert store[-1]['row_info'] == 'Row 13'
+    
+    # Per-type counts come from the store's counters, not from the three kept records
+    assert change_type_counts(store) == {'Dummy NIC Generated': 7, 'NIC Red - Prefix': 3}
+    assert change_type_counts(list(store)) == {'NIC Red - Prefix': 3}
+
+def test_stats_and_report_records():
+    """Detailed stats match across sinks, and a change report keeps records even with counters or JSONL"""
+    counters = ExcelCorrector(change_sink=CounterChangeSink())
+    for change_type in ['Dummy NIC Generated', 'Dummy NIC Generated', 'Email Red - Prefix']:
+        counters.hr_red_cell_changes.append({'change_type': change_type})
+    details = counters.get_detailed_stats()['processing_details']
+    assert counters.get_detailed_stats()['corrections_by_category']['HR Red Cell Changes'] == 3
+    assert details['dummy_nics_generated'] == 2 and details['email_prefixes_added'] == 1
+    assert list(counters.hr_red_cell_changes) == []
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        assert isinstance(create_change_sink('counters', 'a.xlsx', temp_dir, 1000, keep_records=True), MemoryChangeSink)
+        sink = create_change_sink('jsonl', 'a.xlsx', temp_dir, 1000, keep_records=True)
+        store = sink.new_store('state_changes')
+        for i in range(5):
+            store.append({'row_info': f"Row {i + 4}"})
+        sink.close()
+        assert len(list(store)) == 5
+
+def test_change_sinks():
+    """All sinks count the same changes; only memory keeps them all and the JSONL file gets every record"""
+    print("Testing change sinks...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_file = os.path.join(temp_dir, "sample.xlsx")
+        create_sample_workbook(input_file)
+        
+        memory = ExcelCorrector()
+        memory.correct_excel_file(input_file, os.path.join(temp_dir, "memory.xlsx"))
+        expected_counts = change_counts(memory)
+        assert expected_counts['organization'] > 0 and expected_counts['state_changes'] > 0
+        
+        ring = ExcelCorrector(change_sink=MemoryChangeSink(max_records=5))
+        ring.correct_excel_file(input_file, os.path.join(temp_dir, "ring.xlsx"))
+        assert change_counts(ring) == expected_counts
+        assert list(ring.detailed_changes['organization']) == memory.detailed_changes['organization'][-5:]
+        
+        counters = ExcelCorrector(change_sink=CounterChangeSink())
+        counters.correct_excel_file(input_file, os.path.join(temp_dir, "counters.xlsx"))
+        assert change_counts(counters) == expected_counts
+        assert list(counters.detailed_changes['organization']) == []
+        
+        jsonl_path = os.path.join(temp_dir, "changes.jsonl")
+        sink = JsonlChangeSink(jsonl_path)
+        quiet = ExcelCorrector(change_sink=sink, verbosity=VERBOSITY_QUIET)
+        console = io.StringIO()
+        with contextlib.redirect_stdout(console):
+            quiet.correct_excel_file(input_file, os.path.join(temp_dir, "jsonl.xlsx"))
+        sink.close()
+        
+        # No per-change lines and no summary at the quiet level
+        assert '📝' not in console.getvalue()
+        assert 'CHANGE SUMMARY' not in console.getvalue()
+        
+        with open(jsonl_path, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        assert sum(1 for line in lines if line['category'] == 'organization') == expected_counts['organization']
+        assert sum(1 for line in lines if line['category'] == 'state_changes') == expected_counts['state_changes']
+    
+    print("\n\nTesting completed!")
+
+def test_jsonl_discard():
+    """Discarding a run cuts the JSONL file back to its earlier records (also those of earlier runs on the same
+    sink), or removes the file it created"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        jsonl_path = os.path.join(temp_dir, "changes.jsonl")
+        for run, discard in [(1, False), (2, True)]:
+            sink = JsonlChangeSink(jsonl_path)
+            sink.new_store('state_changes').append({'row_info': f"Row {run + 3}"})
+            if discard:
+                sink.discard()
+            else:
+                sink.close()
+        with open(jsonl_path, encoding='utf-8') as f:
+            assert [json.loads(line)['row_info'] for line in f] == ['Row 4']
+        
+        # Two runs on one sink: cancelling the second keeps the first run's records
+        sink = JsonlChangeSink(jsonl_path)
+        corrector = ExcelCorrector(change_sink=sink)
+        corrector.state_changes.append({'row_info': 'Row 5'})
+        sink.flush()
+        corrector.reset_change_tracking()
+        corrector.state_changes.append({'row_info': 'Row 6'})
+        sink.discard()
+        with open(jsonl_path, encoding='utf-8') as f:
+            assert [json.loads(line)['row_info'] for line in f] == ['Row 4', 'Row 5']
+        
+        os.remove(jsonl_path)
+        sink = JsonlChangeSink(jsonl_path)
+        sink.new_store('state_changes').append({'row_info': 'Row 4'})
+        sink.discard()
+        assert not os.path.exists(jsonl_path)
+
+if __name__ == "__main__":
+    test_ring_buffer_store()
+    test_stats_and_report_records()
+    test_jsonl_discard()
+    test_change_sinks()
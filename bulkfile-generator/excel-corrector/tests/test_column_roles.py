@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the column-role resolver picks the same headers as the old per-method scans.
+"""
+
+import pandas as pd
+import sys
+import os
+
+# Add the excel-corrector directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from column_roles import find_column_containing, find_option_column, resolve_column_roles
+from excel_corrector import ExcelCorrector
+
+ORGANIZATION_HEADERS = ('Organization Name', 'Organization Short Name', 'Operations', 'Status', 'Verticals',
+                        'Country', 'State', "Principle Contact's First Name", 'Principle Contact First Name',
+                        'Principle Contact Last Name', 'Address Line 1', 'Address Line 2', 'City')
+
+def test_elif_chain_and_last_match():
+    """Rules behave like the old if/elif chains: first rule per header, last header per role"""
+    print("Testing organization role chains...")
+    
+    roles = resolve_column_roles('organization_issues', ORGANIZATION_HEADERS)
+    assert roles['org_name'] == 'Organization Name'
+    assert roles['org_short_name'] == 'Organization Short Name'
+    assert roles['principle_contact_first_name'] == 'Principle Contact First Name'
+    # Two 'address line' headers: the last one wins, as in the old loops
+    assert roles['address_line'] == 'Address Line 2'
+    assert roles['city'] == 'City'
+    
+    # The correction chain has no status/verticals roles
+    roles = resolve_column_roles('organization_details', ORGANIZATION_HEADERS)
+    assert 'status' not in roles and roles['operations'] == 'Operations'
+    
+    # 'Organization Short Name' is the org label because it comes first
+    label = resolve_column_roles('organization_label', ('Organization Short Name', 'Organization Name'))
+    assert label['org'] == 'Organization Short Name'
+    
+    # Vehicles: 'organization' without 'short' is the org column
+    roles = resolve_column_roles('vehicles', ('Organization Short Name', 'Organization', 'Managed By'))
+    assert roles == {'org': 'Organization', 'org_short_name': 'Organization Short Name', 'managed_by': 'Managed By'}
+    
+    print("Organization role chains OK")
+
+def test_memoized_by_header_signature():
+    """Sheets with the same headers share one resolution"""
+    print("Testing header signature memoization...")
+    
+    corrector = ExcelCorrector()
+    first = pd.DataFrame(columns=['Gender', 'Division', 'NIC', 'Email'])
+    second = pd.DataFrame({'Gender': ['Male'], 'Division': ['Admin'], 'NIC': ['1V'], 'Email': ['a@b.lk']})
+    
+    roles = corrector.get_column_roles(first, 'human_resources_issues')
+    assert corrector.get_column_roles(second, 'human_resources_issues') is roles
+    assert roles == {'gender': 'Gender', 'division': 'Division', 'nic': 'NIC', 'email': 'Email'}
+    
+    # The shared resolution can't be changed by one caller under the others
+    try:
+        roles['nic'] = 'Email'
+        assert False, "roles should be read-only"
+    except TypeError:
+        pass
+    assert corrector.get_column_roles(second, 'human_resources_issues')['nic'] == 'NIC'
+    
+    print("Header signature memoization OK")
+
+def test_option_column_lookup():
+    """Exact alias matches win over partial ones, then the option name itself is tried"""
+    print("Testing processing option column lookup...")
+    
+    headers = ('Vehicle Load Type', 'Type', 'Vehicle Type', 'Division')
+    assert find_option_column(headers, 'Vehicle Type', 'vehicles') == 'Vehicle Type'
+    assert find_option_column(headers, 'Load Type', 'vehicles') == 'Vehicle Load Type'
+    assert find_option_column(headers, 'Managed By', 'vehicles') is None
+    
+    corrector = ExcelCorrector()
+    df = pd.DataFrame(columns=list(headers))
+    assert corrector.find_column_for_option(df, 'Division', 'vehicles') == 'Division'
+    assert find_column_containing(headers, 'type') == 'Vehicle Load Type'
+    
+    print("Processing option column lookup OK")
+
+if __name__ == "__main__":
+    test_elif_chain_and_last_match()
+    test_memoized_by_header_signature()
+    test_option_column_lookup()
+    print("\n\nTesting completed!")
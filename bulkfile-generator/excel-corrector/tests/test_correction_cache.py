@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test script to verify incremental re-correction with the correction cache matches a full correction run.
+"""
+
+import contextlib
+import datetime
+import io
+import random
+import shutil
+import sys
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+
+# Add the excel-corrector directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_corrector import ExcelCorrector
+from correction_cache import CACHE_VERSION, CorrectionCache
+
+SHEETS = {
+    'Organization Details': ['Organization Name', 'Organization Short Name', 'Status', 'State', 'Country', 'City'],
+    'Divisions': ['Organization Short Name', 'Division Name', 'Purpose', "Principle Contact's First Name", 'Activity'],
+    'Human Resources': ['Organization Short Name', 'First Name', 'NIC', 'Email', 'Designation', 'Activity'],
+    'Vehicles': ['Organization Name', 'Organization Short Name', 'Division', 'Vehicle Categories', 'Managed By', 'Activity'],
+    'Locations': ['Organization Name', 'Organization Short Name', 'Location Reference ID', 'Principle Contact NIC', 'Activity'],
+    'Notes': ['Status', 'Comment']
+}
+
+def make_master_file(path, seed, rows=30):
+    """Write a master file with blanks, duplicates, bad values and empty Managed By / Principle Contact NICs"""
+    rng = random.Random(seed)
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for sheet_name, headers in SHEETS.items():
+        sheet = workbook.create_sheet(sheet_name)
+        for col_idx, header in enumerate(headers, 1):
+            sheet.cell(row=3, column=col_idx, value=header)
+        for row_idx in range(4, rows + 4):
+            for col_idx, header in enumerate(headers, 1):
+                if header == 'Organization Short Name':
+                    value = rng.choice(['ORG1', 'ORG2', 'ORG3', None])
+                elif header in ('NIC', 'Managed By', 'Principle Contact NIC', 'Location Reference ID'):
+                    value = rng.choice([None, f"{rng.randint(1, 20)}V"])
+                elif header == 'Designation':
+                    value = rng.choice(['Supervisor', 'Manager', 'Driver', None])
+                else:
+                    value = rng.choice([f"{header} {rng.randint(1, 3)}", None, 'Western', '20 ft', 'PPS-STG, BAD', 7])
+                sheet.cell(row=row_idx, column=col_idx, value=value)
+    workbook.save(path)
+
+def edit_cells(path, edits):
+    """Overwrite (sheet, row, column) cells of a saved workbook"""
+    workbook = load_workbook(path)
+    for sheet_name, row_idx, col_idx, value in edits:
+        workbook[sheet_name].cell(row=row_idx, column=col_idx, value=value)
+    workbook.save(path)
+
+def run(input_path, output_path, correction_cache=None):
+    """Correct a file quietly and return the corrector"""
+    corrector = ExcelCorrector()
+    with contextlib.redirect_stdout(io.StringIO()):
+        corrector.correct_excel_file(input_path, output_path, correction_cache=correction_cache)
+    return corrector
+
+def snapshot(corrector, output_path):
+    """Every saved cell value plus every change record of a run"""
+    workbook = load_workbook(output_path)
+    cells = {sheet.title: [[cell.value for cell in row] for row in sheet.iter_rows()] for sheet in workbook.worksheets}
+    changes = {sheet_key: list(records) for sheet_key, records in corrector.detailed_changes.items()}
+    for name in ['hr_red_cell_changes', 'state_changes', 'division_corrections', 'principle_contact_changes']:
+        changes[name] = list(getattr(corrector, name))
+    return cells, changes
+
+def test_incremental_run_matches_full_run():
+    """Unchanged, edited and HR-dependent resubmissions give the same output and records as a full run"""
+    print("Testing incremental re-correction...")
+    
+    work_dir = tempfile.mkdtemp()
+    try:
+        for seed in range(3):
+            input_path = os.path.join(work_dir, f"master_{seed}.xlsx")
+            cache_path = os.path.join(work_dir, f"master_{seed}.correction_cache.json")
+            make_master_file(input_path, seed)
+            
+            first = run(input_path, os.path.join(work_dir, 'first.xlsx'), CorrectionCache(cache_path))
+            
+            # Unchanged resubmission: every sheet comes from the cache
+            cache = CorrectionCache(cache_path)
+            again = run(input_path, os.path.join(work_dir, 'again.xlsx'), cache)
+            assert cache.stats['rows_corrected'] == 0, cache.stats
+            assert snapshot(again, os.path.join(work_dir, 'again.xlsx')) == snapshot(first, os.path.join(work_dir, 'first.xlsx'))
+            
+            # Edit a Divisions row, a Vehicles row and the HR NIC rows the Managed By fills read
+            edit_cells(input_path, [('Divisions', 6, 2, None), ('Vehicles', 9, 4, '(40 ft)'),
+                                    ('Human Resources', 4, 3, '999V'), ('Human Resources', 5, 5, 'Supervisor'),
+                                    ('Vehicles', 34, 2, 'ORG1')])
+            full = run(input_path, os.path.join(work_dir, 'full.xlsx'))
+            cache = CorrectionCache(cache_path)
+            incremental = run(input_path, os.path.join(work_dir, 'incremental.xlsx'), cache)
+            
+            assert 0 < cache.stats['rows_reused'] and 0 < cache.stats['rows_corrected'], cache.stats
+            assert (snapshot(incremental, os.path.join(work_dir, 'incremental.xlsx')) ==
+                    snapshot(full, os.path.join(work_dir, 'full.xlsx'))), seed
+    finally:
+        shutil.rmtree(work_dir)
+    
+    print("Incremental re-correction OK")
+
+def test_options_change_invalidates_cache():
+    """A run with other processing options does not reuse rows corrected under the previous options"""
+    print("Testing cache invalidation on option changes...")
+    
+    work_dir = tempfile.mkdtemp()
+    try:
+        input_path = os.path.join(work_dir, "master.xlsx")
+        cache_path = os.path.join(work_dir, "master.correction_cache.json")
+        make_master_file(input_path, 7)
+        run(input_path, os.path.join(work_dir, 'first.xlsx'), CorrectionCache(cache_path))
+        
+        options = {'divisions': {'Division Name': {'correct': True, 'dummy_data': True}}}
+        cache = CorrectionCache(cache_path)
+        corrector = ExcelCorrector()
+        with contextlib.redirect_stdout(io.StringIO()):
+            corrector.correct_excel_file(input_path, os.path.join(work_dir, 'second.xlsx'), options, cache)
+        assert cache.stats['rows_reused'] == 0, cache.stats
+    finally:
+        shutil.rmtree(work_dir)
+    
+    print("Cache invalidation OK")
+
+def test_cache_file_round_trip():
+    """The JSON cache file gives back the same typed rows and records, and a broken file starts empty"""
+    print("Testing cache file round trip...")
+    
+    work_dir = tempfile.mkdtemp()
+    try:
+        cache_path = os.path.join(work_dir, "master.correction_cache.json")
+        entry = {
+            'layout': ('vehicles', ('Date', 'Count'), ('datetime64[ns]', 'object'), ''),
+            'row_hashes': ['a', 'b'],
+            'dtypes': [np.dtype('datetime64[ns]'), np.dtype(object)],
+            'rows': [(pd.Timestamp('2024-01-02 03:04:05'), 7), (pd.NaT, float('nan')),
+                     (datetime.time(8, 30), datetime.date(2024, 5, 6))],
+            'records': {'vehicles': [{'row_info': 'Row 4', 'original_value': datetime.datetime(2024, 1, 2),
+                                      'new_value': np.int64(3), 'change_type': 'Date Fix'}]}
+        }
+        cache = CorrectionCache(cache_path)
+        cache.put('vehicles:Vehicles', entry)
+        cache.save()
+        assert os.listdir(work_dir) == ["master.correction_cache.json"]
+        
+        loaded = CorrectionCache(cache_path).get('vehicles:Vehicles', entry['layout'])
+        assert loaded['dtypes'] == entry['dtypes']
+        assert loaded['rows'][0] == entry['rows'][0] and loaded['rows'][2] == entry['rows'][2]
+        assert loaded['rows'][1][0] is pd.NaT and np.isnan(loaded['rows'][1][1])
+        assert loaded['records'] == entry['records']
+        
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            f.write('{"version": %d, "sheets": ' % CACHE_VERSION)
+        assert CorrectionCache(cache_path).sheets == {}
+    finally:
+        shutil.rmtree(work_dir)
+    
+    print("Cache file round trip OK")
+
+if __name__ == "__main__":
+    test_incremental_run_matches_full_run()
+    test_options_change_invalidates_cache()
+    test_cache_file_round_trip()
+    print("\n\nTesting completed!")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the memoized State/Province district resolution used by correction and issue checking.
+"""
+
+import contextlib
+import io
+import pandas as pd
+import sys
+import os
+
+# Add the excel-corrector directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_corrector import ExcelCorrector
+from validation_rules import VALID_DISTRICTS, ColumnValues, DistrictResolver
+
+STATE_SPELLINGS = ['kandy', ' Kandy ', 'Gampaha District', None, 'western', 'Nowhere', 'kandy district', '', 5]
+
+def test_resolution_per_distinct_value():
+    """Each distinct text is normalized once and broadcast to every row that has it"""
+    print("Testing district resolution...")
+    
+    resolver = DistrictResolver()
+    states = ColumnValues(pd.Series(STATE_SPELLINGS * 100, dtype=object))
+    districts = resolver.resolve(states)
+    
+    assert len(resolver.normalized) == len(STATE_SPELLINGS)
+    assert districts.district[:len(STATE_SPELLINGS)].tolist() == [
+        'Kandy District', 'Kandy District', 'Gampaha District', 'Gampaha District', 'Colombo District',
+        'Gampaha District', 'Gampaha District', 'Gampaha District', 'Gampaha District'
+    ]
+    assert districts.valid.tolist() == [value in VALID_DISTRICTS for value in STATE_SPELLINGS] * 100
+    
+    print("District resolution OK")
+
+def test_state_changes_per_spelling():
+    """State changes are logged once per distinct spelling with its row count; cell changes stay per row"""
+    print("Testing state changes per distinct spelling...")
+    
+    df = pd.DataFrame({
+        'Organization Name': [f'Org {idx}' for idx in range(len(STATE_SPELLINGS) * 3)],
+        'State': STATE_SPELLINGS * 3
+    })
+    corrector = ExcelCorrector()
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = corrector.correct_organization_details(df)
+    
+    assert all(value in VALID_DISTRICTS for value in df['State'])
+    changes = [(change['original_state'], change['corrected_state'], change['rows'], change['organization'])
+               for change in corrector.state_changes]
+    assert changes == [
+        ('kandy', 'Kandy District', 3, 'Org 0'),
+        ('Kandy', 'Kandy District', 3, 'Org 1'),
+        ('western', 'Colombo District', 3, 'Org 4'),
+        ('Nowhere', 'Nowhere District', 3, 'Org 5'),
+        ('5', '5 District', 3, 'Org 8')
+    ]
+    
+    state_records = [record for record in corrector.detailed_changes['organization'] if record['field_name'] == 'State']
+    assert len(state_records) == 8 * 3
+    assert [record['row_info'] for record in state_records[:3]] == ['Row 4', 'Row 5', 'Row 7']
+    
+    print("State changes per distinct spelling OK")
+
+def test_issue_check_uses_resolver():
+    """The district check of analyze_organization_issues flags the same cells as before"""
+    print("Testing district issue check...")
+    
+    corrector = ExcelCorrector()
+    states = ColumnValues(pd.Series(STATE_SPELLINGS, dtype=object))
+    flagged = ~states.missing & ~corrector.district_resolver.resolve(states).valid
+    assert flagged.tolist() == [value is not None and str(value).strip() not in VALID_DISTRICTS
+                                for value in STATE_SPELLINGS]
+    
+    print("District issue check OK")
+
+if __name__ == "__main__":
+    test_resolution_per_distinct_value()
+    test_state_changes_per_spelling()
+    test_issue_check_uses_resolver()
+    print("\n\nTesting completed!")
@@ -85,5 +85,56 @@ def test_divisions_corrections():
     
     print("\n\nTesting completed!")
 
+def test_division_option_plan_and_timings():
+    """Options are resolved once per sheet, fixes are column-wise and each fix's time goes to the profiler"""
+    print("Testing Divisions option plan and timings...")
+    
+    df = pd.DataFrame({
+        'Organization Short Name': ['ORG1', None, ' ORG2 ', 'ORG1'],
+        'Division Name': ['Div', '', None, 'Div'],
+        'Purpose': ['PPS-STG', 'bad, PPS-HRM ', 'bad', None],
+        'Principle Contact First Name': ['John', None, 'Jane', '  '],
+        'Principle Contact Last Name': ['Doe', 'Roe', None, 'Poe']
+    })
+    options = {'divisions': {
+        'Organization Short Name': {'correct': True, 'dummy_data': False},
+        'Purpose': {'correct': True, 'dummy_data': False},
+        'Principle Contact First Name': {'correct': False, 'dummy_data': True},
+        'Principle Contact Last Name': {'correct': False, 'dummy_data': False}
+    }}
+    
+    corrector = ExcelCorrector()
+    roles = corrector.get_column_roles(df, 'divisions')
+    assert corrector.plan_division_options(roles, options) == {
+        'Organization Short Name': 'org_short_name',
+        'Purpose': 'purpose',
+        'Principle Contact First Name': 'first_name'
+    }
+    assert corrector.plan_division_options(roles, None) == {}
+    
+    corrector.profiler.begin_run()
+    with corrector.profiler.stage('correct_divisions', 'Divisions', len(df)):
+        df = corrector.correct_divisions(df, options)
+    corrector.profiler.end_run()
+    
+    # The short name is filled before the names that are concatenated with it
+    assert list(df['Organization Short Name']) == ['ORG1', 'EmptyDummy', ' ORG2 ', 'ORG1']
+    assert list(df['Division Name']) == ['Div', '', None, 'Div']
+    assert list(df['Purpose']) == ['PPS-STG', 'PPS-HRM', 'PPS-STG', 'PPS-STG']
+    assert list(df['Principle Contact First Name']) == ['John ORG1', 'Admin', 'Jane ORG2', 'Admin']
+    assert list(df['Principle Contact Last Name']) == ['Doe', 'Roe', None, 'Poe']
+    assert [record['change_type'] for record in corrector.detailed_changes['divisions']][:4] == [
+        'Organization Short Name Correction', 'Purpose Validation Correction', 'Purpose Validation Correction',
+        'Purpose Correction'
+    ]
+    
+    detail = corrector.profiler.summary()['stages'][0]['detail']
+    assert set(detail) == {'org_short_name_seconds', 'purpose_seconds', 'first_name_seconds', 'organizations'}
+    assert detail['organizations'] == 3
+    assert "organizations 3" in corrector.profiler.format_table()
+    
+    print("Divisions option plan and timings OK")
+
 if __name__ == "__main__":
     test_divisions_corrections()
+    test_division_option_plan_and_timings()
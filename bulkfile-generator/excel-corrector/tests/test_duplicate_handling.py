@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the column-wise NIC/Email duplicate handling matches the row-by-row version.
+"""
+
+import pandas as pd
+import random
+import sys
+import os
+
+# Add the excel-corrector directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_corrector import ExcelCorrector
+
+def make_hr_frame(seed, rows=300):
+    """Build an HR-style DataFrame with empties, placeholders, duplicates and END rows"""
+    rng = random.Random(seed)
+    nic_choices = [None, '', '  ', 12345, 12345.0, '991V', ' 991V ', 'end']
+    email_choices = [None, '', 'a@x.com', 'a@x.com ', 'b@noemail.com', 'c@noemal.com']
+    if seed % 2:
+        # Real values that collide with generated dummy values (sequential fallback)
+        nic_choices.append('DUMMY001ORG1')
+        email_choices.append('DUMMY002@ORG2.com')
+    data = {
+        'Organization Short Name': [rng.choice(['ORG1', 'ORG2']) for _ in range(rows)],
+        'NIC': [rng.choice(nic_choices + [f"{rng.randint(1, 40)}V"]) for _ in range(rows)],
+        'Email': [rng.choice(email_choices + [f"u{rng.randint(1, 40)}@y.lk"]) for _ in range(rows)]
+    }
+    return pd.DataFrame(data)
+
+def run_both(df, column_name, is_email):
+    """Run the column-wise and sequential versions on copies of the same frame"""
+    org_short_names = list(df['Organization Short Name'])
+    
+    vectorized = ExcelCorrector()
+    vectorized_df = vectorized.handle_duplicates_and_empty(df.copy(), column_name, "DUMMY", org_short_names, is_email)
+    
+    sequential = ExcelCorrector()
+    sequential_df = df.copy()
+    sequential_df[column_name] = sequential_df[column_name].astype('object')
+    sequential_df = sequential.handle_duplicates_and_empty_sequential(sequential_df, column_name, org_short_names, is_email)
+    
+    return vectorized, vectorized_df, sequential, sequential_df
+
+def test_duplicate_handling_matches_sequential():
+    """Column-wise output and change records must be identical to the row-by-row engine"""
+    print("Testing column-wise duplicate/empty handling...")
+    
+    for seed in range(20):
+        df = make_hr_frame(seed)
+        for column_name, is_email in [('NIC', False), ('Email', True)]:
+            vectorized, vectorized_df, sequential, sequential_df = run_both(df, column_name, is_email)
+            
+            assert list(vectorized_df[column_name]) == list(sequential_df[column_name]), (seed, column_name)
+            assert vectorized.detailed_changes == sequential.detailed_changes, (seed, column_name)
+            assert vectorized.hr_red_cell_changes == sequential.hr_red_cell_changes, (seed, column_name)
+    
+    print("\n\nTesting completed!")
+
+if __name__ == "__main__":
+    test_duplicate_handling_matches_sequential()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the indexed HR NIC lookup matches the linear Supervisor -> Manager -> first available search.
+"""
+
+import pandas as pd
+import random
+import sys
+import os
+import time
+
+# Add the excel-corrector directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_corrector import ExcelCorrector
+
+def make_hr_frame(seed, rows=400, orgs=30):
+    """Build an HR-style DataFrame with missing NICs, mixed designations and an END row"""
+    rng = random.Random(seed)
+    org_choices = [f'ORG{n}' for n in range(orgs)] + [None]
+    data = {
+        'Organization Short Name': [rng.choice(org_choices) for _ in range(rows)],
+        'First Name': [f'First{n}' for n in range(rows)],
+        'Last Name': [rng.choice(['Silva', None]) for _ in range(rows)],
+        'NIC': [rng.choice([f'{n}V', None, '', '  ', 'nan']) for n in range(rows)],
+        'Designation': [rng.choice(['Supervisor', 'Senior Manager', 'Driver', None, 'Area supervisor']) for _ in range(rows)]
+    }
+    df = pd.DataFrame(data)
+    df.loc[rows - 1, 'Organization Short Name'] = 'END'
+    return df
+
+def test_index_matches_linear_search():
+    """Every organization resolves to the same NIC, name and reason as find_matching_nic_from_hr"""
+    print("Testing indexed HR NIC lookup...")
+    
+    corrector = ExcelCorrector()
+    for seed in range(10):
+        df = make_hr_frame(seed)
+        hr_nic_index = corrector.extract_hr_data_for_matching(df)
+        
+        # The old list of records, rebuilt row by row
+        hr_records = []
+        for idx in range(len(df) - 1):
+            record = {field: ('' if pd.isna(df.loc[idx, col]) else df.loc[idx, col]) for field, col in
+                      [('org_short_name', 'Organization Short Name'), ('nic', 'NIC'), ('first_name', 'First Name'),
+                       ('last_name', 'Last Name'), ('designation', 'Designation')]}
+            if record['org_short_name']:
+                hr_records.append(record)
+        
+        for org in [f'ORG{n}' for n in range(35)]:
+            assert hr_nic_index.get(org) == corrector.find_matching_nic_from_hr(org, hr_records), (seed, org)
+    
+    print("Indexed HR NIC lookup OK")
+
+def test_vehicle_fill_uses_index():
+    """Empty Managed By cells of a large Vehicles sheet are filled from the index"""
+    print("Testing Managed By fill against a large HR sheet...")
+    
+    corrector = ExcelCorrector()
+    hr_df = make_hr_frame(1, rows=30000, orgs=2000)
+    hr_nic_index = corrector.extract_hr_data_for_matching(hr_df)
+    
+    vehicles = pd.DataFrame({
+        'Organization': ['Org Name'] * 20000,
+        'Organization Short Name': [f'ORG{n % 2000}' for n in range(20000)],
+        'Managed By': [None if n % 2 else '11V' for n in range(20000)]
+    })
+    
+    start_time = time.perf_counter()
+    vehicles = corrector.fill_nics_from_hr(vehicles, 'Managed By', 'Organization Short Name', 'Organization',
+                                           hr_nic_index, 'Vehicles', 'Managed By NIC Fill', 'Managed By')
+    elapsed = time.perf_counter() - start_time
+    
+    for idx in range(1, 20000, 2):
+        match_result = hr_nic_index.get(f'ORG{idx % 2000}')
+        managed_by = vehicles.loc[idx, 'Managed By']
+        assert managed_by == match_result['nic'] if match_result else pd.isna(managed_by), idx
+    assert (vehicles['Managed By'].iloc[::2] == '11V').all()
+    print(f"Filled {len(corrector.detailed_changes['vehicles'])} Managed By cells in {elapsed:.3f}s")
+
+if __name__ == "__main__":
+    test_index_matches_linear_search()
+    test_vehicle_fill_uses_index()
+    print("\n\nTesting completed!")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the batch queue runs files on a worker pool and reports each file's result as it completes.
+"""
+
+import json
+import shutil
+import sys
+import os
+import tempfile
+import time
+from openpyxl import Workbook
+
+# Add the excel-corrector directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_corrector import write_summary
+from job_queue_panel import (FileJobQueue, STATUS_CANCELLED, STATUS_DONE, STATUS_FAILED, STATUS_QUEUED,
+                             STATUS_RUNNING, describe_options, job_result_text)
+
+def make_master_file(path, rows=10):
+    """Write a small master file with an HR and a Vehicles sheet"""
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for sheet_name, headers in [('Human Resources', ['Organization Short Name', 'First Name', 'NIC', 'Email']),
+                                ('Vehicles', ['Organization Short Name', 'Division', 'Managed By'])]:
+        sheet = workbook.create_sheet(sheet_name)
+        for col_idx, header in enumerate(headers, 1):
+            sheet.cell(row=3, column=col_idx, value=header)
+        for row_idx in range(4, rows + 4):
+            for col_idx, header in enumerate(headers, 1):
+                sheet.cell(row=row_idx, column=col_idx, value=f"{header} {row_idx % 3}" if row_idx % 4 else None)
+    workbook.save(path)
+
+def wait_for(job_queue, timeout=120):
+    """Poll like the panel does until nothing is running; returns the jobs in the order they finished"""
+    finished = []
+    deadline = time.time() + timeout
+    while job_queue.is_busy() and time.time() < deadline:
+        finished += [job for job in job_queue.poll() if job['record'] is not None]
+        # Files the pool has only pre-queued are not shown as running
+        assert sum(job['status'] == STATUS_RUNNING for job in job_queue.jobs) <= job_queue.workers
+        time.sleep(0.05)
+    finished += [job for job in job_queue.poll() if job['record'] is not None]
+    return finished
+
+def test_job_queue():
+    """Correct and check runs on two workers, a broken file fails alone, duplicates are not queued twice"""
+    print("Testing batch job queue...")
+    
+    work_dir = tempfile.mkdtemp()
+    try:
+        input_dir = os.path.join(work_dir, 'input')
+        os.makedirs(input_dir)
+        for idx in range(3):
+            make_master_file(os.path.join(input_dir, f"master_{idx}.xlsx"))
+        with open(os.path.join(input_dir, 'broken.xlsx'), 'w') as f:
+            f.write("not a workbook")
+        
+        job_queue = FileJobQueue(os.path.join(work_dir, 'output'), workers=2)
+        assert len(job_queue.add_files([input_dir])) == 4
+        assert job_queue.add_files([os.path.join(input_dir, 'master_0.xlsx')]) == []
+        
+        assert len(job_queue.start('correct')) == 4
+        finished = wait_for(job_queue)
+        assert sorted(job['id'] for job in finished) == [1, 2, 3, 4]
+        statuses = {os.path.basename(job['file']): job['status'] for job in job_queue.jobs}
+        assert statuses == {'broken.xlsx': STATUS_FAILED, 'master_0.xlsx': STATUS_DONE,
+                            'master_1.xlsx': STATUS_DONE, 'master_2.xlsx': STATUS_DONE}
+        for job in job_queue.jobs:
+            if job['status'] == STATUS_DONE:
+                assert os.path.exists(job['record']['output_file']) and job['record']['seconds'] > 0
+                assert job_result_text(job).endswith(" changes")
+        
+        # The summary uses the batch_corrector layout
+        summary_path = write_summary(job_queue.summary(), output_directory=work_dir)
+        with open(summary_path, encoding='utf-8') as f:
+            summary = json.load(f)
+        assert (summary['mode'], summary['total_files'], summary['failed_files']) == ('correct', 4, 1)
+        
+        # Finished files can be queued again, here in check mode
+        assert len(job_queue.clear_finished()) == 4 and job_queue.jobs == []
+        job_queue.add_files([os.path.join(input_dir, 'master_1.xlsx')])
+        job_queue.start('check', workers=1)
+        wait_for(job_queue)
+        assert job_queue.jobs[0]['status'] == STATUS_DONE and job_result_text(job_queue.jobs[0]).endswith(" issues")
+        
+        # The panel shows which options the started files use
+        assert describe_options(None) == "Options: default processing"
+        options = {'human_resources': {'NIC': {'correct': True, 'dummy_data': True},
+                                       'Email': {'correct': True, 'dummy_data': False},
+                                       'Gender': {'correct': False, 'dummy_data': False}}}
+        assert describe_options(options) == "Options: NIC + dummy data, Email"
+        
+        # Queued files that were never started are cancelled
+        job_queue.add_files([os.path.join(input_dir, 'master_2.xlsx')])
+        assert job_queue.jobs[-1]['status'] == STATUS_QUEUED
+        assert [job['status'] for job in job_queue.cancel_pending()] == [STATUS_CANCELLED]
+        job_queue.shutdown()
+    finally:
+        shutil.rmtree(work_dir)
+    
+    print("Batch job queue OK")
+
+if __name__ == "__main__":
+    test_job_queue()
+    print("\n\nTesting completed!")
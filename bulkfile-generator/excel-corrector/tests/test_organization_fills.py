@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the column-wise Organization Details fill planner (dummy values, counters and duplicate short names).
+"""
+
+import contextlib
+import io
+import pandas as pd
+import sys
+import os
+
+# Add the excel-corrector directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_corrector import ExcelCorrector
+
+def make_organization_frame():
+    """Empty cells, a duplicate short name, a short name equal to a generated one and an END row"""
+    return pd.DataFrame({
+        'Organization Name': [None, 'Acme', 'Beta', 'END', None],
+        'Organization Short Name': [None, 'ACM', 'ACM ', None, 'ORG002'],
+        'Operations': ['', 'Ops', 'Ops', None, 'Ops'],
+        'Principle Contact First Name': ['A', 'B', 'C', None, 'D'],
+        'Principle Contact Last Name': [None, 'B', 'C', None, 'D'],
+        'Address Line': [None, 'X', 'Y', None, None],
+        'City': ['  ', 'Kandy', 'Galle', None, 'Kandy']
+    })
+
+def correct(df, processing_options=None):
+    """Run correct_organization_details quietly and return the corrector and the corrected frame"""
+    corrector = ExcelCorrector()
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = corrector.correct_organization_details(df, processing_options)
+    return corrector, df
+
+def test_fills_and_counters():
+    """Name fills share one counter in row order and the Address Line takes the counter after them"""
+    print("Testing Organization Details fill planner...")
+    
+    corrector, df = correct(make_organization_frame())
+    
+    assert list(df['Organization Name']) == ['Organization_1', 'Acme', 'Beta', 'END', 'Organization_3']
+    assert list(df['Organization Short Name']) == ['ORG002', 'ACM', 'ACM_DUPLICATE_3', None, 'ORG002_DUPLICATE_4']
+    assert list(df['Operations']) == ['Default', 'Ops', 'Ops', None, 'Ops']
+    assert list(df['Principle Contact Last Name']) == ["Principle Contact's Last Name", 'B', 'C', None, 'D']
+    assert list(df['Address Line']) == ['Address Line 3', 'X', 'Y', None, 'Address Line 4']
+    assert list(df['City']) == ['Colombo', 'Kandy', 'Galle', None, 'Kandy']
+    
+    # Records come row by row, each row's columns left to right, labelled with the name before the fill
+    records = [(record['row_info'], record['change_type'], record['original_value'], record['organization'])
+               for record in corrector.detailed_changes['organization']
+               if record['field_name'] not in ('Status', 'Verticals', 'Country', 'State')]
+    assert records == [
+        ('Row 4', 'Organization Name Fill', 'Empty', 'Row 4'),
+        ('Row 4', 'Organization Short Name Fill', 'Empty', 'Row 4'),
+        ('Row 4', 'Operations Fill', 'Empty', 'Row 4'),
+        ('Row 4', 'Principle Contact Last Name Fill', 'Empty', 'Row 4'),
+        ('Row 4', 'Address Line Fill', 'Empty', 'Row 4'),
+        ('Row 4', 'City Fill', 'Empty', 'Row 4'),
+        ('Row 6', 'Organization Short Name Duplicate Fix', 'ACM', 'Beta'),
+        ('Row 8', 'Organization Name Fill', 'Empty', 'Row 8'),
+        ('Row 8', 'Organization Short Name Duplicate Fix', 'ORG002', 'Row 8'),
+        ('Row 8', 'Address Line Fill', 'Empty', 'Row 8')
+    ]
+    
+    print("Organization Details fill planner OK")
+
+def test_processing_options():
+    """Without dummy data only short names are filled, and the counter only counts those"""
+    print("Testing Organization Details fill options...")
+    
+    options = {'organization': {'Organization Name': {'correct': True, 'dummy_data': False}}}
+    corrector, df = correct(make_organization_frame(), options)
+    assert list(df['Organization Name']) == [None, 'Acme', 'Beta', 'END', None]
+    assert list(df['Organization Short Name']) == ['ORG001', 'ACM', 'ACM_DUPLICATE_3', None, 'ORG002']
+    assert list(df['Address Line']) == [None, 'X', 'Y', None, None]
+    
+    options = {'organization': {'Organization Name': {'correct': False, 'dummy_data': False}}}
+    corrector, df = correct(make_organization_frame(), options)
+    assert list(df['Organization Short Name']) == [None, 'ACM', 'ACM ', None, 'ORG002']
+    assert corrector.detailed_changes['organization'] == []
+    
+    print("Organization Details fill options OK")
+
+if __name__ == "__main__":
+    test_fills_and_counters()
+    test_processing_options()
+    print("\n\nTesting completed!")
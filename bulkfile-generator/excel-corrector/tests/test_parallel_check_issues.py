@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script to verify parallel per-sheet issue analysis gives the same results as the sequential run.
+"""
+
+import sys
+import os
+import tempfile
+from openpyxl import Workbook, load_workbook
+
+# Add the excel-corrector directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_corrector import ExcelCorrector
+
+SHEETS = {
+    'Organization Details': (['Organization Name', 'Organization Short Name', 'Status', 'Verticals', 'State', 'Country'],
+                             [['Org One', 'ORG1', 'BOI', 'VERT-TRN', 'Kandy District', 'Sri Lanka'],
+                              [None, 'ORG1', 'boi', 'vert trn', 'Western', 'LK'],
+                              ['Org Three', None, 'X', 'BAD', 'Nowhere', None]]),
+    'Divisions': (['Organization Short Name', 'Division Name', 'Purpose'],
+                  [['ORG1', 'Admin', 'PPS-STG'], [None, None, 'BAD'], ['ORG2', 'Ops', 'PPS-HRM, BAD']]),
+    'Human Resources': (['Organization Short Name', 'First Name', 'Last Name', 'NIC', 'Email', 'Gender'],
+                        [['ORG1', 'Kamal', None, '123V', 'bad-email', 'x'],
+                         ['ORG1', None, 'Perera', '123V', 'a@x.com', 'Male'],
+                         ['ORG2', 'Nimal', 'Silva', None, None, None]]),
+    'Vehicles': (['Organization Short Name', 'Division', 'Vehicle Type', 'Load Type', 'Managed By'],
+                 [['ORG1', None, 'TRUCK', None, None], ['ORG2', 'Fleet', None, 'LOADS', '99V']]),
+    'Locations': (['Organization Short Name', 'Location Reference ID', 'Location Name', 'Principle Contact NIC'],
+                  [['ORG1', 'L1', None, None], ['ORG2', None, 'Yard', '77V']])
+}
+
+def create_sample_workbook(file_path):
+    """Create a five-sheet master file with a few issues on every sheet"""
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for sheet_name, (headers, rows) in SHEETS.items():
+        sheet = workbook.create_sheet(sheet_name)
+        for col_idx, header in enumerate(headers, 1):
+            sheet.cell(row=3, column=col_idx, value=header)
+        for row_idx, row in enumerate(rows, 4):
+            for col_idx, value in enumerate(row, 1):
+                sheet.cell(row=row_idx, column=col_idx, value=value)
+        sheet.cell(row=4 + len(rows), column=1, value='END')
+    workbook.save(file_path)
+
+def highlighted_cells(file_path):
+    """Collect (sheet, coordinate, fill colour, comment) for every commented cell"""
+    workbook = load_workbook(file_path)
+    cells = []
+    for sheet in workbook.worksheets:
+        for row in sheet.iter_rows():
+            for cell in row:
+                if cell.comment:
+                    cells.append((sheet.title, cell.coordinate, cell.fill.start_color.rgb, cell.comment.text))
+    return cells
+
+def test_parallel_check_issues():
+    """Issues, report and highlighted cells must match between sequential and parallel analysis"""
+    print("Testing parallel issue analysis...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_file = os.path.join(temp_dir, "sample.xlsx")
+        create_sample_workbook(input_file)
+        
+        sequential = ExcelCorrector()
+        sequential_file, sequential_report = sequential.check_issues_only(input_file, os.path.join(temp_dir, "sequential"))
+        
+        parallel = ExcelCorrector()
+        parallel_file, parallel_report = parallel.check_issues_only(input_file, os.path.join(temp_dir, "parallel"),
+                                                                    parallel=True, max_workers=2)
+        
+        assert sequential.issues_found
+        assert parallel.issues_found == sequential.issues_found
+        assert parallel_report == sequential_report
+        assert highlighted_cells(parallel_file) == highlighted_cells(sequential_file)
+    
+    print("\n\nTesting completed!")
+
+if __name__ == "__main__":
+    test_parallel_check_issues()
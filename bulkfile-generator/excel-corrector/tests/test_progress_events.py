@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test script to verify runs publish progress events to a queue and stop at a checkpoint when cancelled.
+"""
+
+import contextlib
+import io
+import queue
+import shutil
+import sys
+import os
+import tempfile
+import threading
+from openpyxl import Workbook
+
+# Add the excel-corrector directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from change_sinks import JsonlChangeSink
+from excel_corrector import ExcelCorrector
+from progress_events import CorrectionCancelled, ProgressReporter, describe_progress, latest_progress
+
+SHEETS = {
+    'Organization Details': ['Organization Name', 'Organization Short Name', 'Status', 'State'],
+    'Human Resources': ['Organization Short Name', 'First Name', 'NIC', 'Email', 'Activity'],
+    'Vehicles': ['Organization Short Name', 'Division', 'Vehicle Categories', 'Managed By', 'Activity']
+}
+
+def make_master_file(path, rows=30):
+    """Write a small three-sheet master file"""
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for sheet_name, headers in SHEETS.items():
+        sheet = workbook.create_sheet(sheet_name)
+        for col_idx, header in enumerate(headers, 1):
+            sheet.cell(row=3, column=col_idx, value=header)
+        for row_idx in range(4, rows + 4):
+            for col_idx, header in enumerate(headers, 1):
+                value = f"{row_idx}V" if header in ('NIC', 'Managed By') and row_idx % 3 else f"{header} {row_idx % 4}"
+                sheet.cell(row=row_idx, column=col_idx, value=value)
+    workbook.save(path)
+
+def drain(progress_queue):
+    """Every event on the queue, oldest first"""
+    events = []
+    while not progress_queue.empty():
+        events.append(progress_queue.get())
+    return events
+
+def test_progress_events():
+    """Correction and check runs publish per-sheet events whose percentage never goes backwards"""
+    print("Testing progress events...")
+    
+    work_dir = tempfile.mkdtemp()
+    try:
+        input_path = os.path.join(work_dir, "master.xlsx")
+        make_master_file(input_path)
+        
+        for mode in ('correct', 'check', 'streaming'):
+            progress_queue = queue.Queue()
+            corrector = ExcelCorrector(progress=ProgressReporter(progress_queue, threading.Event()))
+            with contextlib.redirect_stdout(io.StringIO()):
+                if mode == 'correct':
+                    corrector.correct_excel_file(input_path, os.path.join(work_dir, 'corrected.xlsx'))
+                elif mode == 'check':
+                    corrector.check_issues_only(input_path, work_dir)
+                else:
+                    corrector.check_issues_streaming(input_path, work_dir, batch_size=8)
+            events = drain(progress_queue)
+            
+            percents = [event['percent'] for event in events]
+            assert percents == sorted(percents) and 0 < percents[-1] <= 100, mode
+            assert {event['sheet'] for event in events} >= set(SHEETS), mode
+            assert all(event['sheets_total'] == len(SHEETS) for event in events if event['sheet']), mode
+        
+        # Row progress inside a sheet, and the label the GUI shows
+        progress_queue = queue.Queue()
+        corrector = ExcelCorrector(progress=ProgressReporter(progress_queue))
+        with contextlib.redirect_stdout(io.StringIO()):
+            corrector.correct_excel_file(input_path, os.path.join(work_dir, 'corrected.xlsx'))
+        events = drain(progress_queue)
+        writes = [event for event in events if event['stage'] == 'update_sheet_with_preserved_formatting'
+                  and event['sheet'] == 'Vehicles']
+        assert 0 < writes[2]['rows_done'] < writes[2]['rows_total'] == 30
+        assert describe_progress(writes[2]).endswith(f"Vehicles: {writes[2]['rows_done']}/30 rows (sheet 3 of 3)")
+        
+        for event in events:
+            progress_queue.put(event)
+        assert latest_progress(progress_queue) == events[-1] and progress_queue.empty()
+        assert latest_progress(progress_queue) is None
+    finally:
+        shutil.rmtree(work_dir)
+    
+    print("Progress events OK")
+
+def test_cancellation():
+    """Setting the cancel event stops the run at the next checkpoint, before anything is saved"""
+    print("Testing cancellation checkpoints...")
+    
+    class CancellingQueue(queue.Queue):
+        """Sets the cancel event once the Human Resources sheet is reached"""
+        def put(self, event, *args, **kwargs):
+            super().put(event, *args, **kwargs)
+            if event['sheet'] == 'Human Resources':
+                cancel_event.set()
+    
+    work_dir = tempfile.mkdtemp()
+    try:
+        input_path = os.path.join(work_dir, "master.xlsx")
+        make_master_file(input_path)
+        
+        for mode in ('correct', 'check'):
+            cancel_event = threading.Event()
+            progress_queue = CancellingQueue()
+            output_dir = os.path.join(work_dir, mode)
+            os.makedirs(output_dir)
+            sink = JsonlChangeSink(os.path.join(output_dir, 'changes.jsonl'))
+            corrector = ExcelCorrector(change_sink=sink, progress=ProgressReporter(progress_queue, cancel_event))
+            console = io.StringIO()
+            try:
+                with contextlib.redirect_stdout(console):
+                    if mode == 'correct':
+                        corrector.correct_excel_file(input_path, os.path.join(output_dir, 'corrected.xlsx'))
+                    else:
+                        corrector.check_issues_only(input_path, output_dir)
+                raise AssertionError(f"{mode} run was not cancelled")
+            except CorrectionCancelled:
+                pass
+            
+            # Nothing after the Human Resources sheet ran and no output file (or partial change log) was written
+            assert not any(event['sheet'] == 'Vehicles' for event in drain(progress_queue)), mode
+            assert not any(files for _, _, files in os.walk(output_dir)), mode
+            assert 'Error processing file' not in console.getvalue(), mode
+        
+        # Without a queue or cancel event the reporter does nothing
+        ProgressReporter().update('stage', 'Sheet', 1, 2)
+    finally:
+        shutil.rmtree(work_dir)
+    
+    print("Cancellation checkpoints OK")
+
+if __name__ == "__main__":
+    test_progress_events()
+    test_cancellation()
+    print("\n\nTesting completed!")
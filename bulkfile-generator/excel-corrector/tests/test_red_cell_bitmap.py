@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the cached red-cell bitmap agrees with is_red_cell on every HR NIC/Email cell.
+"""
+
+import random
+import sys
+import os
+from openpyxl import Workbook
+from openpyxl.styles import PatternFill
+
+# Add the excel-corrector directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_corrector import ExcelCorrector
+
+FILLS = [None,
+         PatternFill(start_color="FFFF0000", end_color="FFFF0000", fill_type="solid"),
+         PatternFill(start_color="FFE06060", end_color="FFE06060", fill_type="solid"),
+         PatternFill(start_color="FF0000FF", end_color="FF0000FF", fill_type="solid"),
+         PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")]
+
+def make_hr_sheet(seed, rows=300):
+    """Build an HR sheet (headers in row 3) with a mix of red, pink, blue and unfilled NIC/Email cells"""
+    rng = random.Random(seed)
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = 'Human Resources'
+    for col_idx, header in enumerate(['First Name', 'NIC', 'Email', 'Activity'], 1):
+        sheet.cell(row=3, column=col_idx, value=header)
+    for row_idx in range(4, rows + 4):
+        sheet.cell(row=row_idx, column=1, value=f'Name{row_idx}')
+        for col_idx in (2, 3):
+            cell = sheet.cell(row=row_idx, column=col_idx, value=rng.choice([f'{row_idx}V', None]))
+            fill = rng.choice(FILLS)
+            if fill is not None:
+                cell.fill = fill
+    return sheet
+
+def test_bitmap_matches_is_red_cell():
+    """Every bitmap entry equals the per-cell verdict, and the color check runs once per distinct fill"""
+    print("Testing red-cell bitmap...")
+    
+    for seed in range(5):
+        sheet = make_hr_sheet(seed)
+        corrector = ExcelCorrector()
+        
+        checked = []
+        is_red_cell = corrector.is_red_cell
+        corrector.is_red_cell = lambda cell: checked.append(cell) or is_red_cell(cell)
+        bitmap = corrector.get_red_cell_bitmap(sheet)
+        assert len(checked) <= len(FILLS), len(checked)
+        
+        assert bitmap['nic_col_idx'] == 2 and bitmap['email_col_idx'] == 3
+        for offset in range(sheet.max_row - 3):
+            assert bitmap['nic_red'][offset] == is_red_cell(sheet.cell(row=offset + 4, column=2)), (seed, offset)
+            assert bitmap['email_red'][offset] == is_red_cell(sheet.cell(row=offset + 4, column=3)), (seed, offset)
+        
+        # The second consumer gets the same scan back
+        assert corrector.get_red_cell_bitmap(sheet) is bitmap
+    
+    print("Red-cell bitmap OK")
+
+if __name__ == "__main__":
+    test_bitmap_matches_is_red_cell()
+    print("\n\nTesting completed!")
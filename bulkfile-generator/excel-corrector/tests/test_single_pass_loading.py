@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the single-parse workbook loader builds the same DataFrames as pd.read_excel.
+"""
+
+import pandas as pd
+import sys
+import os
+import tempfile
+import zipfile
+from openpyxl import Workbook, load_workbook
+
+# Add the excel-corrector directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_corrector import ExcelCorrector
+
+def create_sample_workbook(file_path):
+    """Create a small master-file style workbook (title rows, headers in row 3, data from row 4)"""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Human Resources"
+    sheet.cell(row=1, column=1, value="Human Resources")
+    
+    headers = ['Organization Short Name', 'First Name', 'NIC', 'Email', 'Create a User Account', 'Activity']
+    rows = [
+        ['ORG1', 'Kamal', '123V', 'a@x.com', True, 'Create'],
+        ['ORG1', None, 12345, None, 1, None],
+        [None, None, None, None, None, None],
+        ['ORG2', 'Nimal', '123V', 'a@noemail.com', 'FALSE', 'x'],
+        ['END', None, None, None, None, None]
+    ]
+    for col_idx, header in enumerate(headers, 1):
+        sheet.cell(row=3, column=col_idx, value=header)
+    for row_idx, row in enumerate(rows, 4):
+        for col_idx, value in enumerate(row, 1):
+            sheet.cell(row=row_idx, column=col_idx, value=value)
+    
+    vehicles = workbook.create_sheet("Vehicles")
+    for col_idx, header in enumerate(['Organization Short Name', 'Vehicle Categories', 'Managed By'], 1):
+        vehicles.cell(row=3, column=col_idx, value=header)
+    vehicles.cell(row=4, column=1, value='ORG1')
+    vehicles.cell(row=4, column=2, value=20.5)
+    vehicles.cell(row=5, column=2, value=40)
+    vehicles.cell(row=5, column=3, value='=SUM(1,2)')
+    
+    workbook.save(file_path)
+    add_cached_formula_value(file_path, 'xl/worksheets/sheet2.xml', '<f>SUM(1,2)</f><v />', '<f>SUM(1,2)</f><v>3</v>')
+
+def add_cached_formula_value(file_path, member, formula_xml, cached_xml):
+    """openpyxl saves formulas without a cached value: add one, as Excel would have"""
+    with zipfile.ZipFile(file_path) as source:
+        members = {name: source.read(name) for name in source.namelist()}
+    assert formula_xml.encode() in members[member]
+    members[member] = members[member].replace(formula_xml.encode(), cached_xml.encode())
+    with zipfile.ZipFile(file_path, 'w', zipfile.ZIP_DEFLATED) as target:
+        for name, data in members.items():
+            target.writestr(name, data)
+
+def test_single_pass_loading():
+    """The loader should return the workbook plus DataFrames identical to pd.read_excel(header=2)"""
+    print("Testing single-pass workbook loading...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "sample.xlsx")
+        create_sample_workbook(file_path)
+        
+        corrector = ExcelCorrector()
+        workbook, dataframes = corrector.load_workbook_with_dataframes(file_path)
+        
+        assert list(dataframes.keys()) == workbook.sheetnames
+        
+        for sheet_name in workbook.sheetnames:
+            expected = pd.read_excel(file_path, sheet_name=sheet_name, header=2)
+            actual = dataframes[sheet_name]
+            print(f"\n{sheet_name}:")
+            print(actual)
+            
+            assert list(actual.columns) == list(expected.columns)
+            assert list(actual.dtypes) == list(expected.dtypes)
+            assert actual.equals(expected)
+        
+        # Formula cells give their cached value, not the formula text
+        assert dataframes['Vehicles']['Managed By'].tolist()[1] == 3
+    
+    print("\n\nTesting completed!")
+
+def create_formula_workbook(file_path):
+    """HR sheet with a formula title (=1+2) and a CONCAT formula in a data row, both with cached values"""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Human Resources"
+    sheet['A1'] = '=1+2'
+    
+    headers = ['Organization Short Name', 'First Name', 'Last Name', 'NIC', 'Email']
+    rows = [
+        ['ORG1', '=CONCAT("Ka","mal")', 'Perera', '123456789V', 'kamal@x.com'],
+        ['ORG1', 'Nimal', 'Silva', '987654321V', 'nimal@x.com']
+    ]
+    for col_idx, header in enumerate(headers, 1):
+        sheet.cell(row=3, column=col_idx, value=header)
+    for row_idx, row in enumerate(rows, 4):
+        for col_idx, value in enumerate(row, 1):
+            sheet.cell(row=row_idx, column=col_idx, value=value)
+    
+    workbook.save(file_path)
+    add_cached_formula_value(file_path, 'xl/worksheets/sheet1.xml', '<c r="A1"><f>1+2</f><v /></c>',
+                             '<c r="A1"><f>1+2</f><v>3</v></c>')
+    add_cached_formula_value(file_path, 'xl/worksheets/sheet1.xml', '<c r="B4"><f>CONCAT("Ka","mal")</f><v /></c>',
+                             '<c r="B4" t="str"><f>CONCAT("Ka","mal")</f><v>Kamal</v></c>')
+
+def test_formulas_survive_saves():
+    """The corrected file and the error file should keep the formulas; the DataFrame holds their cached values"""
+    print("Testing formulas in saved workbooks...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "formulas.xlsx")
+        create_formula_workbook(file_path)
+        
+        corrector = ExcelCorrector()
+        _, dataframes = corrector.load_workbook_with_dataframes(file_path)
+        assert dataframes['Human Resources']['First Name'].tolist() == ['Kamal', 'Nimal']
+        
+        corrected_path = os.path.join(temp_dir, "corrected.xlsx")
+        corrector.correct_excel_file(file_path, corrected_path)
+        error_path, _ = ExcelCorrector().check_issues_only(file_path, temp_dir)
+        
+        for saved_path in [corrected_path, error_path]:
+            sheet = load_workbook(saved_path)['Human Resources']
+            print(f"{os.path.basename(saved_path)}: A1={sheet['A1'].value!r}, B4={sheet['B4'].value!r}")
+            assert sheet['A1'].value == '=1+2'
+            assert sheet['B4'].value == '=CONCAT("Ka","mal")'
+            assert sheet['B5'].value == 'Nimal'
+    
+    print("Formulas in saved workbooks OK")
+
+if __name__ == "__main__":
+    test_single_pass_loading()
+    test_formulas_survive_saves()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script to verify correction and check runs record per-stage timings, rows and peak memory.
+"""
+
+import contextlib
+import io
+import json
+import shutil
+import sys
+import os
+import tempfile
+from openpyxl import Workbook
+
+# Add the excel-corrector directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_corrector import ExcelCorrector
+from batch_corrector import main as batch_main
+
+SHEETS = {
+    'Organization Details': ['Organization Name', 'Organization Short Name', 'Status', 'State'],
+    'Human Resources': ['Organization Short Name', 'First Name', 'NIC', 'Email', 'Activity'],
+    'Vehicles': ['Organization Short Name', 'Division', 'Vehicle Categories', 'Managed By', 'Activity'],
+    'Notes': ['Status', 'Comment']
+}
+
+def make_master_file(path, rows):
+    """Write a small master file with some blank NICs and Managed By cells"""
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for sheet_name, headers in SHEETS.items():
+        sheet = workbook.create_sheet(sheet_name)
+        for col_idx, header in enumerate(headers, 1):
+            sheet.cell(row=3, column=col_idx, value=header)
+        for row_idx in range(4, rows + 4):
+            for col_idx, header in enumerate(headers, 1):
+                if header == 'Organization Short Name':
+                    value = f"ORG{row_idx % 3}"
+                elif header in ('NIC', 'Managed By'):
+                    value = f"{row_idx}V" if row_idx % 4 else None
+                else:
+                    value = f"{header} {row_idx % 5}"
+                sheet.cell(row=row_idx, column=col_idx, value=value)
+    workbook.save(path)
+
+def test_correction_stages():
+    """Every sheet's correction and write are timed, with memory traced when asked for"""
+    print("Testing correction stage timings...")
+    
+    work_dir = tempfile.mkdtemp()
+    try:
+        input_path = os.path.join(work_dir, "master.xlsx")
+        make_master_file(input_path, 25)
+        
+        corrector = ExcelCorrector(profile_memory=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            corrector.correct_excel_file(input_path, os.path.join(work_dir, 'out', 'corrected.xlsx'))
+        
+        timings = corrector.get_detailed_stats()['stage_timings']
+        stages = [(record['stage'], record['sheet']) for record in timings['stages']]
+        assert stages[0] == ('load_workbook_with_dataframes', None) and stages[-1] == ('workbook.save', None)
+        assert ('correct_human_resources', 'Human Resources') in stages
+        assert ('update_sheet_with_preserved_formatting', 'Vehicles') in stages
+        assert ('correct_status_columns', 'Notes') in stages
+        assert timings['stages'][0]['rows'] == len(SHEETS) * 25
+        assert all(record['seconds'] >= 0 and record['peak_mb'] > 0 for record in timings['stages'])
+        assert timings['memory_source'] == 'tracemalloc' and timings['total_seconds'] > 0
+        assert "correct_human_resources [Human Resources]" in corrector.profiler.format_table()
+        
+        # Each run starts a fresh profile
+        with contextlib.redirect_stdout(io.StringIO()):
+            corrector.check_issues_only(input_path, work_dir)
+        stages = [(record['stage'], record['sheet']) for record in corrector.profiler.stages]
+        assert ('analyze_human_resources_issues', 'Human Resources') in stages and ('workbook.save', None) in stages
+        assert not any(stage == 'correct_human_resources' for stage, _ in stages)
+        
+        assert ExcelCorrector().profiler.format_table() == "No stage timings recorded."
+    finally:
+        shutil.rmtree(work_dir)
+    
+    print("Correction stage timings OK")
+
+def test_batch_profile_flag():
+    """--profile prints the stage table and adds the timings to the summary records"""
+    print("Testing --profile flag...")
+    
+    work_dir = tempfile.mkdtemp()
+    try:
+        make_master_file(os.path.join(work_dir, "master.xlsx"), 10)
+        summary_path = os.path.join(work_dir, 'summary.json')
+        console = io.StringIO()
+        with contextlib.redirect_stdout(console):
+            batch_main([work_dir, '--output-dir', os.path.join(work_dir, 'out'), '--summary', summary_path, '--profile'])
+        assert "correct_vehicles [Vehicles]" in console.getvalue()
+        
+        with open(summary_path, encoding='utf-8') as f:
+            record = json.load(f)['files'][0]
+        assert record['stage_timings']['stages'] and 'stage_table' not in record
+    finally:
+        shutil.rmtree(work_dir)
+    
+    print("--profile flag OK")
+
+if __name__ == "__main__":
+    test_correction_stages()
+    test_batch_profile_flag()
+    print("\n\nTesting completed!")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the streaming (read-only, row batch) check mode finds the same issues as check_issues_only.
+"""
+
+import contextlib
+import csv
+import io
+import random
+import shutil
+import sys
+import os
+import tempfile
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import PatternFill
+
+# Add the excel-corrector directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_corrector import ExcelCorrector
+
+def make_master_file(path, seed, rows=40):
+    """Write a small master file: numeric/text NICs, duplicates, blank rows, an END row and an extra sheet"""
+    rng = random.Random(seed)
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    sheets = {
+        'Organization Details': ['Organization Name', 'Organization Short Name', 'Status', 'Country', 'State'],
+        'Human Resources': ['Organization Short Name', 'First Name', 'NIC', 'Email', 'Gender', 'Division'],
+        'Vehicles': ['Organization Short Name', 'Division', 'Vehicle Type', 'Load Type', 'Managed By'],
+        'Notes': ['Anything']
+    }
+    for sheet_name, headers in sheets.items():
+        sheet = workbook.create_sheet(sheet_name)
+        sheet.cell(row=1, column=1, value=f"{sheet_name} template")
+        for col_idx, header in enumerate(headers, 1):
+            sheet.cell(row=3, column=col_idx, value=header)
+        for row_idx in range(4, rows + 4):
+            if rng.random() < .05:
+                continue  # blank row in the middle of the data
+            for col_idx, header in enumerate(headers, 1):
+                if header == 'NIC':
+                    value = rng.choice([12345, 12345.0, 991, '991V', None, f"{row_idx}V"])
+                elif header == 'Email':
+                    value = rng.choice(['a@x.com', 'bad-email', None, f"u{row_idx}@y.lk"])
+                else:
+                    value = rng.choice([f"{header} {rng.randint(1, 4)}", None, 'Admin', 'Sri Lanka', 7])
+                sheet.cell(row=row_idx, column=col_idx, value=value)
+        sheet.cell(row=rows + 4, column=1, value='END')
+    workbook.save(path)
+
+def test_streaming_matches_full_check():
+    """Issues, report and highlighted cells match for every batch size"""
+    print("Testing streaming check mode...")
+    
+    work_dir = tempfile.mkdtemp()
+    try:
+        for seed in range(3):
+            input_path = os.path.join(work_dir, f"master_{seed}.xlsx")
+            make_master_file(input_path, seed)
+            
+            full = ExcelCorrector()
+            with contextlib.redirect_stdout(io.StringIO()):
+                full_path, full_report = full.check_issues_only(input_path, os.path.join(work_dir, 'full'))
+            full_workbook = load_workbook(full_path)
+            
+            for batch_size in (1, 3, 16, 5000):
+                streaming = ExcelCorrector()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    streamed_path, streamed_report = streaming.check_issues_streaming(
+                        input_path, os.path.join(work_dir, 'streamed'), batch_size=batch_size)
+                
+                assert streaming.issues_found == full.issues_found, (seed, batch_size)
+                assert streamed_report == full_report, (seed, batch_size)
+                
+                # Same values, and the same comments on the same cells
+                streamed_workbook = load_workbook(streamed_path)
+                assert streamed_workbook.sheetnames == full_workbook.sheetnames
+                for full_sheet in full_workbook.worksheets:
+                    streamed_sheet = streamed_workbook[full_sheet.title]
+                    for row in full_sheet.iter_rows():
+                        for cell in row:
+                            streamed_cell = streamed_sheet.cell(row=cell.row, column=cell.column)
+                            assert streamed_cell.value == cell.value, (seed, batch_size, cell.coordinate)
+                            full_comment = cell.comment.text if cell.comment else None
+                            streamed_comment = streamed_cell.comment.text if streamed_cell.comment else None
+                            assert streamed_comment == full_comment, (seed, batch_size, cell.coordinate)
+            
+            # Sidecar only
+            sidecar = ExcelCorrector()
+            with contextlib.redirect_stdout(io.StringIO()):
+                sidecar_path, _ = sidecar.check_issues_streaming(input_path, os.path.join(work_dir, 'sidecar'), 'csv', 8)
+            with open(sidecar_path, encoding='utf-8') as f:
+                assert len(list(csv.DictReader(f))) == len(full.issues_found)
+    finally:
+        shutil.rmtree(work_dir)
+    
+    print("Streaming check mode OK")
+
+def test_streaming_mixed_types_and_red_fills():
+    """A column mixing text, bools and numbers reads the same in every batch, and red source cells stay red"""
+    print("Testing streaming check mode on mixed-type columns...")
+    
+    work_dir = tempfile.mkdtemp()
+    try:
+        input_path = os.path.join(work_dir, "mixed.xlsx")
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.title = 'Organization Details'
+        for col_idx, header in enumerate(['Organization Name', 'Organization Short Name'], 1):
+            sheet.cell(row=3, column=col_idx, value=header)
+        # The whole-sheet parse reads the 1 as the True before it, a duplicate short name
+        for row_idx, short_name in enumerate(['A', 'B', 'C', True, 'D', 'E', 1], 4):
+            sheet.cell(row=row_idx, column=1, value=f"Org {row_idx}")
+            sheet.cell(row=row_idx, column=2, value=short_name)
+        
+        hr_sheet = workbook.create_sheet('Human Resources')
+        for col_idx, header in enumerate(['Organization Short Name', 'First Name', 'NIC', 'Email'], 1):
+            hr_sheet.cell(row=3, column=col_idx, value=header)
+        for row_idx, nic in enumerate(['111V', '222V', '333V'], 4):
+            for col_idx, value in enumerate(['A', f"Name {row_idx}", nic, f"u{row_idx}@x.com"], 1):
+                hr_sheet.cell(row=row_idx, column=col_idx, value=value)
+        hr_sheet['C5'].fill = PatternFill(start_color="FFFF0000", end_color="FFFF0000", fill_type="solid")
+        workbook.save(input_path)
+        
+        full = ExcelCorrector()
+        with contextlib.redirect_stdout(io.StringIO()):
+            full.check_issues_only(input_path, os.path.join(work_dir, 'full'))
+        assert any(issue['issue'] == "Duplicate Organization Short Name: 'True'" for issue in full.issues_found)
+        
+        for batch_size in (1, 3, 5000):
+            streaming = ExcelCorrector()
+            with contextlib.redirect_stdout(io.StringIO()):
+                streamed_path, _ = streaming.check_issues_streaming(
+                    input_path, os.path.join(work_dir, 'streamed'), batch_size=batch_size)
+            assert streaming.issues_found == full.issues_found, batch_size
+            
+            red_cell = load_workbook(streamed_path)['Human Resources']['C5']
+            assert red_cell.value == '222V'
+            assert red_cell.fill.start_color.rgb == "FFFF0000", batch_size
+    finally:
+        shutil.rmtree(work_dir)
+    
+    print("Streaming check mode on mixed-type columns OK")
+
+if __name__ == "__main__":
+    test_streaming_matches_full_check()
+    test_streaming_mixed_types_and_red_fills()
+    print("\n\nTesting completed!")
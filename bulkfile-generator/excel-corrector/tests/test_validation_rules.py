@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test script for the compiled validation rules shared by check-only analysis, error highlighting and coloring.
+"""
+
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add the excel-corrector directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_corrector import ExcelCorrector
+from validation_rules import CONTACT_FORMATS, OPTION_ALLOWED_VALUES, ColumnValues, SheetValidator, is_valid_contact
+
+def make_frame():
+    """Mixed values per column: empty, whitespace, numbers, wrong case and valid values"""
+    return pd.DataFrame({
+        'Organization Short Name': ['ORG1', 'ORG1', None, ' ORG1 ', 'END', 'ORG2'],
+        'Gender': ['Male', 'male', None, '  ', 1, 'Female'],
+        'Division': ['Admin', ' Admin', 'Ops', None, 'Admin', 2.5],
+        'Email': ['a@x.com', ' a@x.com', 'bad', None, 'a@x.com', 'b@y.lk'],
+        'Create a User Account': ['TRUE', 1, 'FALSE', 'false', None, 'TRUE']
+    })
+
+def test_option_issues_match_cell_has_issues():
+    """Column-wise option masks agree with the per-cell cell_has_issues check"""
+    print("Testing option issue masks...")
+    corrector = ExcelCorrector()
+    df = make_frame()
+    validator = SheetValidator(df, np.zeros(len(df), dtype=bool))
+    
+    for option_name in list(OPTION_ALLOWED_VALUES) + ['Email', 'Role']:
+        column_name = option_name if option_name in df.columns else 'Organization Short Name'
+        expected = [corrector.cell_has_issues(value, option_name, 'human_resources') for value in df[column_name]]
+        assert validator.option_issues(option_name, column_name).tolist() == expected, option_name
+
+def test_field_errors():
+    """Field rules report empty and invalid cells in row order and skip END rows"""
+    print("Testing field errors...")
+    df = make_frame()
+    end_rows = np.array([False, False, False, False, True, False])
+    validator = SheetValidator(df, end_rows)
+    
+    assert validator.field_errors('Email', 'Email') == [
+        (1, "Invalid email format:  a@x.com"),
+        (2, "Invalid email format: bad"),
+        (3, "Empty Email field")
+    ]
+    assert validator.field_errors('Division', 'Division') == [
+        (2, "Invalid Division value: Ops"),
+        (3, "Empty Division field"),
+        (5, "Invalid Division value: 2.5")
+    ]
+
+def test_analyzer_issue_order():
+    """Check-only issues come out row by row, with the column checks in their declared order"""
+    print("Testing analyzer issue order...")
+    corrector = ExcelCorrector()
+    corrector.issues_found = []
+    df = pd.DataFrame({
+        'Organization Short Name': ['ORG1', 'ORG1', 'ORG2', 'END'],
+        'Gender': ['x', 'Male', None, None],
+        'NIC': ['1V', ' 1V', None, None],
+        'Email': [None, 'a@x.com', 'a@x.com', None]
+    })
+    header_index = {name: col for col, name in enumerate(df.columns, 1)}
+    corrector.header_indexes['Human Resources'] = header_index
+    corrector.analyze_human_resources_issues(df, 'Human Resources', 'Human Resources')
+    
+    issues = [(issue['row'], issue['column'], issue['issue'], issue['organization']) for issue in corrector.issues_found]
+    print(issues)
+    assert issues == [
+        (4, 'Gender', "Gender should be 'Male' or 'Female', found: 'x'", 'ORG1'),
+        (4, 'Email', "Empty Email field", 'ORG1'),
+        (5, 'NIC', "Duplicate NIC found: '1V'", 'ORG1'),
+        (6, 'NIC', "Empty NIC field", 'ORG2'),
+        (6, 'Email', "Duplicate Email found: 'a@x.com'", 'ORG2')
+    ]
+    
+    print("\n\nTesting completed!")
+
+def test_contact_formats():
+    """One compiled email kernel: column masks agree with the scalar check, and checks report no new issues"""
+    print("Testing contact format kernel...")
+    values = ['a@x.com', 'a@x', 'kamal.perera@mail.co.uk', ' a@x.com', 'a b@x.com', 12345, '', None]
+    column = ColumnValues(pd.Series(values, dtype=object))
+    for kind in CONTACT_FORMATS:
+        expected = [not is_valid_contact(value, kind) for value in values]
+        assert column.invalid_format(kind).tolist() == expected, kind
+        assert column.invalid_format(kind) is column.invalid_format(kind)
+    valid = [is_valid_contact(value, 'email') for value in values]
+    assert valid == [True, False, True, False, False, False, False, False]
+    
+    corrector = ExcelCorrector()
+    corrector.issues_found = []
+    df = pd.DataFrame({
+        'Organization Short Name': ['ORG1', 'ORG1', 'ORG1'],
+        'NIC': ['12V', '12V', '123456789V'],
+        'Email': ['bad-email', 'a@x.com', 'bad-email']
+    })
+    header_index = {name: col for col, name in enumerate(df.columns, 1)}
+    corrector.header_indexes['Human Resources'] = header_index
+    corrector.analyze_human_resources_issues(df, 'Human Resources', 'Human Resources')
+    
+    # Only duplicates and empty cells are check issues; malformed NICs and emails are not reported
+    issues = [(issue['row'], issue['column'], issue['issue']) for issue in corrector.issues_found]
+    assert issues == [
+        (5, 'NIC', "Duplicate NIC found: '12V'"),
+        (6, 'Email', "Duplicate Email found: 'bad-email'")
+    ]
+    
+    # The corrector's own duplicate and dummy emails are not colored as errors when Email was corrected
+    for value in ['a@x.com_DUPLICATE_2', 'DUMMY001@ORG 1.com']:
+        assert not corrector.cell_has_issues(value, 'Email', 'human_resources')
+    
+    print("Contact format kernel OK")
+
+if __name__ == "__main__":
+    test_option_issues_match_cell_has_issues()
+    test_field_errors()
+    test_analyzer_issue_order()
+    test_contact_formats()
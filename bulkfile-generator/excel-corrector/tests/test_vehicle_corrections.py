@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the column-wise Vehicles corrections match the row-by-row rewrites.
+"""
+
+import pandas as pd
+import numpy as np
+import random
+import sys
+import os
+
+# Add the excel-corrector directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_corrector import ExcelCorrector
+
+REWRITES = [('Division', 'Admin', 'Division Correction'), ('Vehicle Type', 'TRUCK', 'Vehicle Type Correction'),
+            ('Load Type', 'LOADS', 'Load Type Correction'), ('Activity', 'Create', 'Status Correction')]
+
+def make_vehicles_frame(seed, rows=200):
+    """Build a Vehicles-style DataFrame with messy categories, numbers and blanks"""
+    rng = random.Random(seed)
+    categories = ['20 FT', '(40 ft)', '20Ft', ' 20Ft ', 'Flatbed', 'Flatbed ', '', '  ', None, np.nan,
+                  20, 40.0, float('inf'), 'Size 2 x 45', '٣ FT']
+    return pd.DataFrame({
+        'Organization': [rng.choice(['Org A', None, 'Org B']) for _ in range(rows)],
+        'Organization Short Name': [rng.choice(['ORGA', 'ORGB']) for _ in range(rows)],
+        'Division': [rng.choice(['Admin', ' Admin', 'Ops', None, 3]) for _ in range(rows)],
+        'Vehicle Type': [rng.choice(['TRUCK', 'Van', '', None]) for _ in range(rows)],
+        'Load Type': [rng.choice(['LOADS', 'loads', None]) for _ in range(rows)],
+        'Vehicle Categories': [rng.choice(categories) for _ in range(rows)],
+        'Activity': [rng.choice(['Create', 'Update', None]) for _ in range(rows)]
+    })
+
+def correct_row_by_row(corrector, df):
+    """The previous per-row Vehicles rewrite, kept here as the reference"""
+    rewrites = {col: (new_value, change_type) for col, new_value, change_type in REWRITES}
+    for col in df.columns:
+        if col in rewrites:
+            new_value, change_type = rewrites[col]
+            for idx in range(len(df)):
+                original_value = df.loc[idx, col]
+                if pd.notna(original_value) and str(original_value).strip() != new_value:
+                    org_name = df.loc[idx, 'Organization'] if not pd.isna(df.loc[idx, 'Organization']) else f'Row {idx + 4}'
+                    corrector.log_detailed_change('Vehicles', change_type, f'Row {idx + 4}', col, original_value, new_value, org_name)
+            df[col] = new_value
+        
+        elif col == 'Vehicle Categories':
+            for idx in range(len(df)):
+                original_value = df.loc[idx, col]
+                if pd.notna(original_value):
+                    formatted_value = corrector.format_vehicle_category(str(original_value))
+                    if str(original_value).strip() != formatted_value:
+                        org_name = df.loc[idx, 'Organization'] if not pd.isna(df.loc[idx, 'Organization']) else f'Row {idx + 4}'
+                        corrector.log_detailed_change('Vehicles', 'Category Formatting', f'Row {idx + 4}', col, original_value, formatted_value, org_name)
+                        df.loc[idx, col] = formatted_value
+    return df
+
+def test_vehicle_corrections_match_row_by_row():
+    """Column-wise rewrites produce the same values and change records as the per-row loops"""
+    print("Testing column-wise Vehicles corrections...")
+    
+    for seed in range(10):
+        df = make_vehicles_frame(seed)
+        
+        vectorized = ExcelCorrector()
+        vectorized_df = vectorized.correct_vehicles(df.copy())
+        
+        sequential = ExcelCorrector()
+        sequential_df = correct_row_by_row(sequential, df.copy().astype({'Vehicle Categories': object}))
+        
+        for col in df.columns:
+            assert [str(value) for value in vectorized_df[col]] == [str(value) for value in sequential_df[col]], (seed, col)
+        assert vectorized.detailed_changes['vehicles'] == sequential.detailed_changes['vehicles'], seed
+    
+    print("Column-wise Vehicles corrections OK")
+
+def test_empty_vehicles_sheet():
+    """An empty sheet is corrected without errors or change records"""
+    print("Testing empty Vehicles sheet...")
+    
+    corrector = ExcelCorrector()
+    df = corrector.correct_vehicles(make_vehicles_frame(0, rows=0))
+    assert len(df) == 0
+    assert len(corrector.detailed_changes['vehicles']) == 0
+    
+    print("Empty Vehicles sheet OK")
+
+if __name__ == "__main__":
+    test_vehicle_corrections_match_row_by_row()
+    test_empty_vehicles_sheet()
+    print("\n\nTesting completed!")
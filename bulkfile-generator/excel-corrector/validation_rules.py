@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Excel File Corrector - Validation Rules
+Declares the field rules once and evaluates them against whole DataFrame columns
+"""
+
+import re
+import numpy as np
+import pandas as pd
+
+# Valid values shared by correction, check-only analysis and cell coloring
+VALID_STATUSES = ['NON_BOI', 'BOI']
+VALID_VERTICALS = ['VERT-CUS', 'VERT-SPO', 'VERT-YO', 'VERT-IM-EX', 'VERT-SHIPPING-LINE', 'VERT-TRN']
+VALID_DISTRICTS = [
+    'Colombo District', 'Gampaha District', 'Kalutara District', 'Kandy District',
+    'Matale District', 'Nuwara Eliya District', 'Galle District', 'Matara District',
+    'Hambantota District', 'Jaffna District', 'Kilinochchi District', 'Mannar District',
+    'Vavuniya District', 'Mullaitivu District', 'Batticaloa District', 'Ampara District',
+    'Trincomalee District', 'Kurunegala District', 'Anuradhapura District',
+    'Polonnaruwa District', 'Badulla District', 'Monaragala District', 'Ratnapura District',
+    'Kegalle District'
+]
+DEFAULT_DISTRICT = 'Gampaha District'
+
+# State/Province spellings (lowercased) and the district each one is corrected to
+STATE_CORRECTIONS = {
+    'western': 'Colombo District',
+    'central': 'Kandy District',
+    'southern': 'Galle District',
+    'northern': 'Jaffna District',
+    'eastern': 'Batticaloa District',
+    'north western': 'Kurunegala District',
+    'north central': 'Anuradhapura District',
+    'uva': 'Badulla District',
+    'sabaragamuwa': 'Ratnapura District',
+    'colombo': 'Colombo District',
+    'gampaha': 'Gampaha District',
+    'kalutara': 'Kalutara District',
+    'kandy': 'Kandy District',
+    'matale': 'Matale District',
+    'nuwara eliya': 'Nuwara Eliya District',
+    'galle': 'Galle District',
+    'matara': 'Matara District',
+    'hambantota': 'Hambantota District',
+    'jaffna': 'Jaffna District',
+    'kilinochchi': 'Kilinochchi District',
+    'mannar': 'Mannar District',
+    'vavuniya': 'Vavuniya District',
+    'mullaitivu': 'Mullaitivu District',
+    'batticaloa': 'Batticaloa District',
+    'ampara': 'Ampara District',
+    'trincomalee': 'Trincomalee District',
+    'kurunegala': 'Kurunegala District',
+    'puttalam': 'Puttalam District',
+    'anuradhapura': 'Anuradhapura District',
+    'polonnaruwa': 'Polonnaruwa District',
+    'badulla': 'Badulla District',
+    'moneragala': 'Monaragala District',
+    'ratnapura': 'Ratnapura District',
+    'kegalle': 'Kegalle District'
+}
+
+VALID_PURPOSES = [
+    'PPS-STG', 'PPS-EX-PR', 'PPS-SPO-CSPOS', 'PPS-IM-PR', 'PPS-ADMIN',
+    'PPS-STPOVR', 'PPS-IM-EX', 'PPS-YO-CC', 'PPS-YO-ECS', 'PPS-HRM', 'PPS-FMG'
+]
+
+EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+EMAIL_REGEX = re.compile(EMAIL_PATTERN)
+
+# Contact formats compiled once and matched against str() of each cell, by the scalar and column-wise checks alike
+CONTACT_FORMATS = {
+    'email': EMAIL_REGEX
+}
+
+# Rules for fields whose correction was deselected (highlight_field_errors). 'column' is a substring
+# of the header; the same option name on different sheets shares one rule.
+FIELD_RULES = {
+    'Organization Name': {'column': 'organization', 'rule': 'non_empty'},
+    'Organization Short Name': {'column': 'organization', 'rule': 'non_empty'},
+    'Operations': {'column': 'operation', 'rule': 'non_empty'},
+    'Status': {'column': 'status', 'rule': 'allowed_values', 'values': ['Create']},
+    'Verticals': {'column': 'vertical', 'rule': 'allowed_values', 'values': VALID_VERTICALS},
+    'Country': {'column': 'country', 'rule': 'format', 'format': 'Sri Lanka'},
+    'State': {'column': 'state', 'rule': 'allowed_values', 'values': VALID_DISTRICTS},
+    'Principle Contact First Name': {'column': 'first', 'rule': 'non_empty'},
+    'Principle Contact Last Name': {'column': 'last', 'rule': 'non_empty'},
+    'Address Line': {'column': 'address', 'rule': 'non_empty'},
+    'City': {'column': 'city', 'rule': 'non_empty'},
+    
+    # Human Resources
+    'First Name': {'column': 'first_name', 'rule': 'non_empty'},
+    'Last Name': {'column': 'last_name', 'rule': 'non_empty'},
+    'Role': {'column': 'role', 'rule': 'non_empty'},
+    'Division': {'column': 'division', 'rule': 'allowed_values', 'values': ['Admin']},
+    'Designation': {'column': 'designation', 'rule': 'non_empty'},
+    'NIC': {'column': 'nic', 'rule': 'non_empty'},
+    'Email': {'column': 'email', 'rule': 'valid_email'},
+    'Gender': {'column': 'gender', 'rule': 'allowed_values', 'values': ['Male', 'Female']},
+    'Create a User Account': {'column': 'create_user_account', 'rule': 'allowed_values', 'values': ['TRUE', 'FALSE']},
+    'Activity': {'column': 'activity', 'rule': 'non_empty'},
+    
+    # Divisions
+    'Division Name': {'column': 'division', 'rule': 'non_empty'},
+    'Purpose': {'column': 'purpose', 'rule': 'allowed_values', 'values': VALID_PURPOSES},
+    
+    # Vehicles
+    'Vehicle Type': {'column': 'type', 'rule': 'allowed_values', 'values': ['TRUCK']},
+    'Load Type': {'column': 'load', 'rule': 'allowed_values', 'values': ['LOADS']},
+    
+    # Locations
+    'Location Reference ID': {'column': 'reference', 'rule': 'non_empty'},
+    'Location Name': {'column': 'name', 'rule': 'non_empty'}
+}
+
+# Values a processed cell may hold (cell_has_issues); empty is always an issue and
+# options not listed here (Role, Designation, Operations, ...) accept any non-empty value
+OPTION_ALLOWED_VALUES = {
+    'Gender': ['Male', 'Female'],
+    'Create a User Account': ['TRUE', 'FALSE'],
+    'Division': ['Admin'],
+    'Status': ['Create', 'Update'],
+    'Activity': ['Create', 'Update']
+}
+
+# Header names that can hold each processing option, by sheet type (find_column_for_option)
+OPTION_COLUMN_ALIASES = {
+    'organization': {
+        'Organization Name': ['organization name', 'org name', 'name'],
+        'Organization Short Name': ['organization short name', 'org short name', 'short name'],
+        'Principle Contact First Name': ['principle contact first name', 'contact first name', 'first name'],
+        'Principle Contact Last Name': ['principle contact last name', 'contact last name', 'last name'],
+        'Principle Contact NIC': ['principle contact nic', 'contact nic', 'nic'],
+        'Principle Contact Phone': ['principle contact phone', 'contact phone', 'phone'],
+        'Principle Contact Email': ['principle contact email', 'contact email', 'email'],
+        'Address': ['address', 'location address'],
+        'City': ['city', 'city name'],
+        'Province': ['province', 'state'],
+        'Country': ['country', 'country name'],
+        'Postal Code': ['postal code', 'zip code', 'zip'],
+        'Status': ['status', 'organization status'],
+        'Activity': ['activity', 'organization activity']
+    },
+    'divisions': {
+        'Division': ['division', 'division name'],
+        'Status': ['status', 'division status'],
+        'Activity': ['activity', 'division activity']
+    },
+    'human_resources': {
+        'Role': ['role', 'job role', 'position'],
+        'Designation': ['designation', 'job designation', 'title'],
+        'Operations': ['operations', 'operation', 'operational area'],
+        'Gender': ['gender', 'sex'],
+        'Create a User Account': ['create a user account', 'user account', 'account creation'],
+        'Status': ['status', 'employee status'],
+        'Activity': ['activity', 'employee activity']
+    },
+    'vehicles': {
+        'Division': ['division', 'vehicle division'],
+        'Vehicle Type': ['vehicle type', 'type', 'transport type'],
+        'Load Type': ['load type', 'cargo type'],
+        'Status': ['status', 'vehicle status'],
+        'Activity': ['activity', 'vehicle activity']
+    },
+    'locations': {
+        'Location Reference ID': ['location reference id', 'lrid', 'reference id'],
+        'Location Name': ['location name', 'name'],
+        'Status': ['status', 'location status'],
+        'Activity': ['activity', 'location activity']
+    }
+}
+
+def is_valid_contact(value, kind):
+    """Whether one value matches a contact format (e.g. 'email'); empty values never do"""
+    if pd.isna(value) or value == '':
+        return False
+    return CONTACT_FORMATS[kind].match(str(value)) is not None
+
+class ColumnValues:
+    """Vectorized views of one column (missing, blank, text, stripped text) shared by every rule on it"""
+    
+    def __init__(self, column, seen=None):
+        self.column = column
+        # Values already seen in earlier row batches of the same column (streaming check mode)
+        self.seen = seen
+        self.missing = column.isna().to_numpy(dtype=bool)
+        # str() of each value, exactly what the per-cell checks used to compare
+        self.text = column.map(str).astype(object)
+        self.stripped = self.text.str.strip()
+        self.blank = self.missing | self.stripped.eq('').to_numpy(dtype=bool)
+        # {contact format: invalid-row mask}, shared by every rule that checks the format
+        self.format_masks = {}
+    
+    def not_in(self, allowed, lowercase=False):
+        """Rows whose stripped (optionally lowercased) text is not one of the allowed values"""
+        stripped = self.stripped.str.lower() if lowercase else self.stripped
+        return ~stripped.isin(allowed).to_numpy(dtype=bool)
+    
+    def invalid_format(self, kind):
+        """Rows whose text does not match a contact format (e.g. 'email'); computed once per column"""
+        if kind not in self.format_masks:
+            self.format_masks[kind] = ~self.text.str.match(CONTACT_FORMATS[kind]).to_numpy(dtype=bool)
+        return self.format_masks[kind]
+    
+    def repeated(self, eligible):
+        """Rows whose stripped value already appeared in an earlier eligible row"""
+        mask = np.zeros(len(self.stripped), dtype=bool)
+        positions = np.flatnonzero(eligible)
+        candidates = self.stripped.iloc[positions]
+        mask[positions] = candidates.duplicated(keep='first').to_numpy(dtype=bool)
+        if self.seen is not None:
+            mask[positions] |= candidates.isin(self.seen).to_numpy(dtype=bool)
+            self.seen.update(candidates.tolist())
+        return mask
+    
+    def check_distinct(self, check):
+        """Run check(stripped value) once per distinct value; returns its result for every row"""
+        codes, distinct = pd.factorize(self.stripped)
+        return np.array([check(value) for value in distinct.tolist()], dtype=object)[codes]
+    
+    def value(self, idx):
+        """Original value at a row position"""
+        return self.column.iat[idx]
+
+class DistrictResolver:
+    """Corrects State/Province spellings to districts once per distinct value, for correction and checking alike"""
+    
+    def __init__(self, state_corrections=None):
+        self.state_corrections = STATE_CORRECTIONS if state_corrections is None else state_corrections
+        # {str() of a value: its district spelling}, kept across columns and sheets
+        self.normalized = {}
+    
+    def normalize(self, state_text):
+        """District spelling of one str() value: '... District' kept, known names mapped, others get ' District'"""
+        if state_text not in self.normalized:
+            state_lower = state_text.strip().lower()
+            if state_text == '':
+                corrected_state = DEFAULT_DISTRICT
+            elif state_lower.endswith('district'):
+                corrected_state = state_text.strip()
+            else:
+                corrected_state = self.state_corrections.get(state_lower, f"{state_text} District")
+            self.normalized[state_text] = corrected_state
+        return self.normalized[state_text]
+    
+    def resolve(self, values):
+        """Resolve a column's ColumnValues once per distinct text and broadcast the result over its rows"""
+        return DistrictColumn(values, self)
+
+class DistrictColumn:
+    """One column's districts: for each row whether it is already valid and the valid district it corrects to"""
+    
+    def __init__(self, values, resolver):
+        # str() of every value (never missing) factorized: rows map to distinct texts through their codes
+        self.codes, texts = pd.factorize(values.text)
+        self.texts = texts.tolist()
+        self.normalized = [resolver.normalize(text) for text in self.texts]
+        valid = [text.strip() in VALID_DISTRICTS for text in self.texts]
+        districts = [district if district in VALID_DISTRICTS else DEFAULT_DISTRICT for district in self.normalized]
+        self.valid = np.array(valid, dtype=bool)[self.codes] & ~values.missing
+        self.district = np.array(districts, dtype=object)[self.codes]
+    
+    def spelling_changes(self, rows):
+        """[(first row position, original, normalized spelling, row count)] of the distinct values in the rows,
+        in order of first appearance; values that are already spelled as a district are left out"""
+        positions = np.flatnonzero(rows)
+        codes, first_index, counts = np.unique(self.codes[positions], return_index=True, return_counts=True)
+        codes, first_index, counts = codes.tolist(), first_index.tolist(), counts.tolist()
+        changes = []
+        for order in sorted(range(len(codes)), key=first_index.__getitem__):
+            code = codes[order]
+            # An empty text falls back to the default district without counting as a spelling change
+            original_state = self.texts[code].strip()
+            if self.texts[code] and original_state != self.normalized[code]:
+                changes.append((int(positions[first_index[order]]), original_state, self.normalized[code], counts[order]))
+        return changes
+
+class SheetValidator:
+    """Rules compiled against one sheet's DataFrame: column views are built once and shared"""
+    
+    def __init__(self, df, end_rows, seen_values=None):
+        self.df = df
+        self.end_rows = end_rows
+        self.column_values = {}
+        # {column: set of values seen in earlier batches}, shared across a sheet's row batches
+        self.seen_values = seen_values
+    
+    def values(self, column_name):
+        """Return the (cached) ColumnValues for a column"""
+        if column_name not in self.column_values:
+            seen = self.seen_values.setdefault(column_name, set()) if self.seen_values is not None else None
+            self.column_values[column_name] = ColumnValues(self.df[column_name], seen)
+        return self.column_values[column_name]
+    
+    def field_errors(self, field_name, column_name):
+        """Return [(row position, description)] for FIELD_RULES[field_name], END rows excluded"""
+        field_config = FIELD_RULES[field_name]
+        rule = field_config['rule']
+        values = self.values(column_name)
+        
+        invalid = np.zeros(len(self.df), dtype=bool)
+        if rule == 'allowed_values':
+            invalid = values.not_in(field_config['values'])
+        elif rule == 'valid_email':
+            invalid = values.invalid_format('email')
+        elif rule == 'format':
+            invalid = values.stripped.ne(field_config['format']).to_numpy(dtype=bool)
+        
+        errors = []
+        for idx in np.flatnonzero((values.blank | invalid) & ~self.end_rows).tolist():
+            if values.blank[idx]:
+                errors.append((idx, f"Empty {field_name} field"))
+            elif rule == 'allowed_values':
+                errors.append((idx, f"Invalid {field_name} value: {values.value(idx)}"))
+            elif rule == 'valid_email':
+                errors.append((idx, f"Invalid email format: {values.value(idx)}"))
+            elif rule == 'format':
+                errors.append((idx, f"Invalid {field_name} format: expected '{field_config['format']}', got '{values.value(idx)}'"))
+        return errors
+    
+    def option_issues(self, option_name, column_name):
+        """Boolean mask of cells that still have issues for a processing option (cell_has_issues)"""
+        values = self.values(column_name)
+        issues = values.blank
+        if option_name in OPTION_ALLOWED_VALUES:
+            issues = issues | values.not_in(OPTION_ALLOWED_VALUES[option_name])
+        return issues